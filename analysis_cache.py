@@ -0,0 +1,185 @@
+"""
+Analysis Cache Module
+Persistent, content-addressed cache for Gemini analysis results
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Default location and limits (overridable through environment variables)
+CACHE_FILE = os.getenv("ANALYSIS_CACHE_PATH", ".cache/analysis_cache.sqlite3")
+DEFAULT_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1000"))
+
+
+def make_cache_key(model_name: str, prompt_text: str, job_desc: str, resume_text: str) -> str:
+    """
+    Build a content-addressed key for one analysis request.
+
+    Args:
+        model_name (str): Gemini model used for the analysis
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+
+    Returns:
+        str: Hex SHA-256 digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (model_name, prompt_text, job_desc, resume_text):
+        data = (part or "").encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    SQLite-backed result cache with:
+    - TTL expiry per entry
+    - Size-bounded LRU eviction
+    - Hit/miss counters for monitoring
+    """
+
+    def __init__(self, path: str = CACHE_FILE, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open (or create) the cache database at the given path."""
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Streamlit serves sessions from several threads; access is serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a cached result, refreshing its LRU position on a hit.
+
+        Args:
+            key (str): Key produced by make_cache_key
+
+        Returns:
+            str | None: Cached analysis text, or None on a miss/expired entry
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a result and evict least-recently-used entries beyond max_entries.
+
+        Args:
+            key (str): Key produced by make_cache_key
+            value (str): Analysis text to cache
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+                )
+            if self.max_entries:
+                self._conn.execute(
+                    """
+                    DELETE FROM analysis_cache WHERE key IN (
+                        SELECT key FROM analysis_cache
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM analysis_cache")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hit/miss counters, hit rate and current entry count
+        """
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+            }
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """
+    Get the process-wide analysis cache, creating it on first use.
+
+    Returns:
+        AnalysisCache: Shared cache instance
+    """
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = AnalysisCache()
+    return _cache_instance
@@ -0,0 +1,456 @@
+"""
+Analysis Jobs Module
+Background job queue so analyses keep running across Streamlit reruns
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis_schema import STRUCTURED_ANALYSES, analysis_to_json
+from gemini_service import analyze_resume_structured, analyze_resume_with_gemini
+
+# Store backend, location and limits (overridable through environment variables)
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite").lower()  # sqlite or memory
+JOBS_DB_PATH = os.getenv("ANALYSIS_JOBS_PATH", ".cache/analysis_jobs.sqlite3")
+DEFAULT_MAX_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(24 * 3600)))
+# Each process refreshes its unfinished jobs on this interval; jobs missing LEASE_HEARTBEATS
+# refreshes belong to a process that is gone
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+LEASE_HEARTBEATS = 3
+POLL_INTERVAL_SECONDS = 2
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+UNFINISHED_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+INTERRUPTED_ERROR = "⚠️ Analysis was interrupted by a server restart. Please run it again."
+
+_JOB_FIELDS = ("id", "owner", "label", "status", "meta", "result", "error", "pid", "lease",
+               "created_at", "started_at", "finished_at", "heartbeat_at")
+# Columns added after the first release of the table
+_ADDED_COLUMNS = {"lease": "TEXT", "heartbeat_at": "REAL"}
+
+
+class InMemoryJobStore:
+    """Job records in a dict; jobs are lost when the process exits."""
+
+    def __init__(self):
+        """Create an empty store."""
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        """Insert a new job record."""
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+
+    def update(self, job_id: str, **fields) -> None:
+        """Set fields on an existing job."""
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> dict | None:
+        """Get a copy of one job record, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_for_owner(self, owner: str, limit: int = 20) -> list[dict]:
+        """Get an owner's most recent jobs, newest first."""
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values() if job['owner'] == owner]
+        jobs.sort(key=lambda job: job['created_at'], reverse=True)
+        return jobs[:limit]
+
+    def heartbeat(self, lease: str) -> None:
+        """Nothing to refresh: in-memory jobs cannot outlive their process."""
+
+    def fail_unfinished(self, error: str, stale_before: float) -> int:
+        """Mark jobs whose process stopped heartbeating as failed (none: jobs die with this process)."""
+        return 0
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs created before the given timestamp."""
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['created_at'] < older_than and job['status'] not in UNFINISHED_STATUSES
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class SqliteJobStore:
+    """
+    Job records in SQLite, so finished reports survive page reloads and
+    server restarts and can be found again by owner.
+    """
+
+    def __init__(self, path: str = JOBS_DB_PATH):
+        """Open (or create) the job database at the given path."""
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    owner TEXT,
+                    label TEXT,
+                    status TEXT NOT NULL,
+                    meta TEXT,
+                    result TEXT,
+                    error TEXT,
+                    pid INTEGER,
+                    lease TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, column_type in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_owner ON jobs (owner, created_at)")
+            self._conn.commit()
+
+    @staticmethod
+    def _encode(fields: dict) -> dict:
+        encoded = dict(fields)
+        for name in ("meta", "result"):
+            if name in encoded:
+                encoded[name] = json.dumps(encoded[name])
+        return encoded
+
+    @staticmethod
+    def _decode(row) -> dict:
+        job = dict(zip(_JOB_FIELDS, row))
+        for name in ("meta", "result"):
+            job[name] = json.loads(job[name]) if job[name] is not None else None
+        return job
+
+    def create(self, job: dict) -> None:
+        """Insert a new job record."""
+        encoded = self._encode(job)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(_JOB_FIELDS)}) VALUES ({', '.join('?' for _ in _JOB_FIELDS)})",
+                tuple(encoded.get(name) for name in _JOB_FIELDS),
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields) -> None:
+        """Set fields on an existing job."""
+        encoded = self._encode(fields)
+        assignments = ", ".join(f"{name} = ?" for name in encoded if name in _JOB_FIELDS)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                tuple(value for name, value in encoded.items() if name in _JOB_FIELDS) + (job_id,),
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> dict | None:
+        """Get one job record, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._decode(row) if row is not None else None
+
+    def list_for_owner(self, owner: str, limit: int = 20) -> list[dict]:
+        """Get an owner's most recent jobs, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE owner = ? ORDER BY created_at DESC LIMIT ?",
+                (owner, limit),
+            ).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def heartbeat(self, lease: str) -> None:
+        """Mark the unfinished jobs of one process (its lease) as still alive."""
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? "
+                f"WHERE lease = ? AND status IN ({', '.join('?' for _ in UNFINISHED_STATUSES)})",
+                (time.time(), lease, *UNFINISHED_STATUSES),
+            )
+            self._conn.commit()
+
+    def fail_unfinished(self, error: str, stale_before: float) -> int:
+        """
+        Mark unfinished jobs with no heartbeat since stale_before as failed.
+
+        Several server processes can share one job database; each keeps its
+        own jobs' heartbeats fresh, so only jobs of a process that exited
+        (whose workers can no longer complete them) go stale.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                f"WHERE status IN ({', '.join('?' for _ in UNFINISHED_STATUSES)}) "
+                f"AND COALESCE(heartbeat_at, created_at) < ?",
+                (STATUS_FAILED, error, time.time(), *UNFINISHED_STATUSES, stale_before),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs created before the given timestamp."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE created_at < ? "
+                f"AND status NOT IN ({', '.join('?' for _ in UNFINISHED_STATUSES)})",
+                (older_than, *UNFINISHED_STATUSES),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+
+class JobQueue:
+    """
+    Runs submitted work on a shared worker pool and records its progress.
+
+    Work functions follow the (value, error message) convention; the value
+    must be JSON-serializable so it can be stored.
+
+    Jobs carry this queue's lease id, refreshed by a heartbeat thread; the
+    same thread fails other processes' jobs whose heartbeat has lapsed.
+    """
+
+    def __init__(self, store, max_workers: int = DEFAULT_MAX_WORKERS,
+                 retention_seconds: int = JOB_RETENTION_SECONDS,
+                 heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS):
+        """
+        Args:
+            store: InMemoryJobStore or SqliteJobStore
+            max_workers (int): Jobs running at once
+            retention_seconds (int): How long finished jobs are kept
+            heartbeat_seconds (float): Interval between lease refreshes
+        """
+        self.store = store
+        self.retention_seconds = retention_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.lease = uuid.uuid4().hex
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="analysis-job")
+        self._fail_stale()
+        self.store.purge(time.time() - retention_seconds)
+        self._stopped = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="analysis-job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def _fail_stale(self) -> int:
+        return self.store.fail_unfinished(
+            INTERRUPTED_ERROR, stale_before=time.time() - LEASE_HEARTBEATS * self.heartbeat_seconds
+        )
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                self.store.heartbeat(self.lease)
+                self._fail_stale()
+            except Exception as e:
+                # A locked or briefly unavailable database must not stop the heartbeat
+                print(f"⚠️ Job heartbeat failed: {e}")
+
+    def _run(self, job_id: str, func, args: tuple) -> None:
+        self.store.update(job_id, status=STATUS_RUNNING, started_at=time.time(), heartbeat_at=time.time())
+        try:
+            value, error = func(*args)
+        except Exception as e:
+            value, error = None, f"⚠️ Analysis failed: {str(e)[:200]}"
+        self.store.update(
+            job_id,
+            status=STATUS_FAILED if error else STATUS_DONE,
+            result=value,
+            error=error,
+            finished_at=time.time(),
+        )
+
+    def submit(self, func, *args, owner: str | None = None, label: str = "", meta: dict | None = None) -> str:
+        """
+        Queue a function call and return immediately.
+
+        Args:
+            func: Callable returning (value, error message)
+            *args: Arguments for func
+            owner (str | None): User the job belongs to
+            label (str): Display name
+            meta (dict | None): JSON-serializable details needed to render the result
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create({
+            'id': job_id,
+            'owner': owner,
+            'label': label,
+            'status': STATUS_QUEUED,
+            'meta': meta or {},
+            'pid': os.getpid(),
+            'lease': self.lease,
+            'created_at': time.time(),
+            'heartbeat_at': time.time(),
+        })
+        self._pool.submit(self._run, job_id, func, args)
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        Get a job's current record.
+
+        Args:
+            job_id (str): Id returned by submit()
+
+        Returns:
+            dict | None: Job with status, result and error, or None if unknown/expired
+        """
+        return self.store.get(job_id)
+
+    def list_jobs(self, owner: str, limit: int = 20) -> list[dict]:
+        """Get an owner's most recent jobs, newest first."""
+        return self.store.list_for_owner(owner, limit)
+
+    def get_owned(self, job_ids: list[str], owner: str) -> list[dict]:
+        """
+        Get the jobs among job_ids that belong to owner, in the given order.
+
+        Args:
+            job_ids (list[str]): Ids returned by submit()
+            owner (str): User the jobs must have been submitted by
+
+        Returns:
+            list[dict]: Known jobs of that owner; other users' and expired jobs are skipped
+        """
+        jobs = (self.store.get(job_id) for job_id in job_ids)
+        return [job for job in jobs if job is not None and job['owner'] == owner]
+
+    def shutdown(self) -> None:
+        """Stop the worker pool after running jobs finish, then the heartbeat."""
+        self._pool.shutdown(wait=True)
+        self._stopped.set()
+        self._heartbeat_thread.join()
+
+
+def run_analysis_job(job_desc: str, resume_text: str, prompt_text: str, kind: str | None = None):
+    """
+    Job body for one HR/ATS analysis.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        prompt_text (str): Instruction prompt (a structured prompt when kind is set)
+        kind (str | None): Structured analysis kind, or None for free-form markdown
+
+    Returns:
+        tuple: (markdown text or structured result dict, None) or (None, error message)
+    """
+    if kind is None:
+        return analyze_resume_with_gemini(job_desc, resume_text, prompt_text)
+    result, error = analyze_resume_structured(job_desc, resume_text, prompt_text, kind)
+    return (json.loads(analysis_to_json(result)) if result is not None else None), error
+
+
+_queue_instance = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue, creating it on first use.
+
+    Returns:
+        JobQueue: Shared queue backed by the store selected with JOB_STORE_BACKEND
+    """
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                store = InMemoryJobStore() if JOB_STORE_BACKEND == "memory" else SqliteJobStore()
+                _queue_instance = JobQueue(store)
+    return _queue_instance
+
+
+def _render_job(job: dict) -> None:
+    import streamlit as st
+
+    meta = job.get('meta') or {}
+    st.markdown(f"### {job['label']}")
+    if job['status'] in UNFINISHED_STATUSES:
+        waited = time.time() - job['created_at']
+        st.info(f"🤖 {'Analyzing' if job['status'] == STATUS_RUNNING else 'Queued'}... ({waited:.0f}s)")
+        return
+    if job['status'] == STATUS_FAILED:
+        st.error(job['error'])
+        return
+
+    kind = meta.get('kind')
+    file_stem = f"resume_analysis_{job['label'].replace(' ', '_').lower()}"
+    if kind is None:
+        output = job['result']
+    else:
+        _, result_type = STRUCTURED_ANALYSES[kind]
+        structured_result = result_type.from_dict(job['result'])
+        output = structured_result.to_markdown()
+    st.markdown(output)
+
+    columns = st.columns(2 if kind else 1)
+    with columns[0]:
+        st.download_button(
+            label="⬇️ Download Report", data=output, file_name=f"{file_stem}.txt",
+            mime="text/plain", use_container_width=True, key=f"download_{job['id']}",
+        )
+    if kind:
+        with columns[1]:
+            st.download_button(
+                label="⬇️ Download JSON", data=analysis_to_json(structured_result), file_name=f"{file_stem}.json",
+                mime="application/json", use_container_width=True, key=f"download_json_{job['id']}",
+            )
+
+
+def render_background_jobs(job_ids: list[str], owner: str) -> None:
+    """
+    Render the session's background reports, polling while any is unfinished.
+
+    Only this panel reruns on the poll interval, so the rest of the page
+    stays editable while reports are computed.
+
+    Args:
+        job_ids (list[str]): Job ids kept in session state, newest first
+        owner (str): Logged-in user; jobs submitted by anyone else are not shown
+    """
+    import streamlit as st
+
+    queue = get_job_queue()
+
+    def panel():
+        jobs = queue.get_owned(job_ids, owner)
+        for job in jobs:
+            with st.container(border=True):
+                _render_job(job)
+        if not any(job['status'] in UNFINISHED_STATUSES for job in jobs):
+            # Everything finished: one full rerun stops the polling fragment
+            if st.session_state.get('analysis_jobs_polling'):
+                st.session_state['analysis_jobs_polling'] = False
+                st.rerun()
+
+    pending = any(job['status'] in UNFINISHED_STATUSES for job in queue.get_owned(job_ids, owner))
+    st.session_state['analysis_jobs_polling'] = pending
+    st.fragment(panel, run_every=POLL_INTERVAL_SECONDS if pending else None)()
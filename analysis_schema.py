@@ -0,0 +1,259 @@
+"""
+Analysis Schema Module
+JSON schemas, typed results and markdown rendering for structured Gemini analyses
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+
+PRIORITIES = ("high", "medium", "low")
+RECOMMENDATIONS = ("Yes", "No", "Maybe")
+FORMATTING_RATINGS = ("Good", "Fair", "Poor")
+
+_STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+
+# Schemas in the OpenAPI subset accepted by Gemini's response_schema
+ATS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'score': {'type': 'integer', 'description': 'ATS match score from 0 to 100'},
+        'matched_keywords': _STRING_LIST,
+        'missing_keywords': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'keyword': {'type': 'string'},
+                    'priority': {'type': 'string', 'enum': list(PRIORITIES)},
+                },
+                'required': ['keyword', 'priority'],
+            },
+        },
+        'formatting_rating': {'type': 'string', 'enum': list(FORMATTING_RATINGS)},
+        'formatting_issues': _STRING_LIST,
+        'suggestions': _STRING_LIST,
+        'recommendation': {'type': 'string', 'enum': list(RECOMMENDATIONS)},
+        'summary': {'type': 'string'},
+    },
+    'required': ['score', 'matched_keywords', 'missing_keywords', 'formatting_rating',
+                 'formatting_issues', 'suggestions', 'recommendation', 'summary'],
+}
+
+HR_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'fit_score': {'type': 'integer', 'description': 'Overall fit for the role from 0 to 100'},
+        'strengths': _STRING_LIST,
+        'weaknesses': _STRING_LIST,
+        'observations': _STRING_LIST,
+        'recommendation': {'type': 'string', 'enum': list(RECOMMENDATIONS)},
+        'reasoning': {'type': 'string'},
+    },
+    'required': ['fit_score', 'strengths', 'weaknesses', 'observations', 'recommendation', 'reasoning'],
+}
+
+SCREENING_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'score': {'type': 'integer', 'description': 'ATS match score from 0 to 100'},
+        'recommendation': {'type': 'string', 'enum': list(RECOMMENDATIONS)},
+        'reasoning': {'type': 'string', 'description': 'One sentence'},
+    },
+    'required': ['score', 'recommendation', 'reasoning'],
+}
+
+
+class SchemaError(ValueError):
+    """Raised when a structured response does not match its schema."""
+
+
+def _get_score(data: dict, name: str) -> int:
+    value = data.get(name)
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value.strip())
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise SchemaError(f"'{name}' must be an integer")
+    return max(0, min(value, 100))
+
+
+def _get_string(data: dict, name: str) -> str:
+    value = data.get(name)
+    if not isinstance(value, str):
+        raise SchemaError(f"'{name}' must be a string")
+    return value.strip()
+
+
+def _get_choice(data: dict, name: str, choices: tuple[str, ...]) -> str:
+    value = _get_string(data, name)
+    # Accept case variations ("yes", "MAYBE"); store the canonical spelling
+    for choice in choices:
+        if value.lower() == choice.lower():
+            return choice
+    raise SchemaError(f"'{name}' must be one of {', '.join(choices)}")
+
+
+def _get_string_list(data: dict, name: str) -> list[str]:
+    value = data.get(name)
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise SchemaError(f"'{name}' must be a list of strings")
+    return [item.strip() for item in value if item.strip()]
+
+
+def _bullets(items: list[str]) -> list[str]:
+    return [f"- {item}" for item in items] or ["- None"]
+
+
+@dataclass
+class KeywordGap:
+    """A job-description keyword missing from the resume."""
+
+    keyword: str
+    priority: str
+
+
+@dataclass
+class AtsAnalysis:
+    """Structured ATS match analysis."""
+
+    score: int
+    matched_keywords: list[str] = field(default_factory=list)
+    missing_keywords: list[KeywordGap] = field(default_factory=list)
+    formatting_rating: str = "Fair"
+    formatting_issues: list[str] = field(default_factory=list)
+    suggestions: list[str] = field(default_factory=list)
+    recommendation: str = "Maybe"
+    summary: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AtsAnalysis":
+        """Validate a decoded ATS_SCHEMA response and build the result."""
+        missing = data.get('missing_keywords')
+        if not isinstance(missing, list) or not all(isinstance(item, dict) for item in missing):
+            raise SchemaError("'missing_keywords' must be a list of objects")
+        return cls(
+            score=_get_score(data, 'score'),
+            matched_keywords=_get_string_list(data, 'matched_keywords'),
+            missing_keywords=[
+                KeywordGap(_get_string(item, 'keyword'), _get_choice(item, 'priority', PRIORITIES))
+                for item in missing
+            ],
+            formatting_rating=_get_choice(data, 'formatting_rating', FORMATTING_RATINGS),
+            formatting_issues=_get_string_list(data, 'formatting_issues'),
+            suggestions=_get_string_list(data, 'suggestions'),
+            recommendation=_get_choice(data, 'recommendation', RECOMMENDATIONS),
+            summary=_get_string(data, 'summary'),
+        )
+
+    def to_markdown(self) -> str:
+        """Render with the same headings as the free-form ATS report."""
+        lines = [f"## ATS Score: {self.score}/100", "", "## Keyword Analysis", "### Matching Keywords:"]
+        lines += _bullets(self.matched_keywords)
+        lines += ["", "### Missing Keywords:"]
+        lines += _bullets([f"{gap.keyword} ({gap.priority})" for gap in self.missing_keywords])
+        lines += ["", "## Formatting Assessment", f"- Formatting quality: {self.formatting_rating}"]
+        lines += [f"- {issue}" for issue in self.formatting_issues]
+        lines += ["", "## Optimization Suggestions"]
+        lines += [f"{number}. {suggestion}" for number, suggestion in enumerate(self.suggestions, 1)] or ["- None"]
+        lines += ["", "## Summary", f"- Recommendation: {self.recommendation}", f"- {self.summary}"]
+        return "\n".join(lines)
+
+
+@dataclass
+class HrAnalysis:
+    """Structured HR review."""
+
+    fit_score: int
+    strengths: list[str] = field(default_factory=list)
+    weaknesses: list[str] = field(default_factory=list)
+    observations: list[str] = field(default_factory=list)
+    recommendation: str = "Maybe"
+    reasoning: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HrAnalysis":
+        """Validate a decoded HR_SCHEMA response and build the result."""
+        return cls(
+            fit_score=_get_score(data, 'fit_score'),
+            strengths=_get_string_list(data, 'strengths'),
+            weaknesses=_get_string_list(data, 'weaknesses'),
+            observations=_get_string_list(data, 'observations'),
+            recommendation=_get_choice(data, 'recommendation', RECOMMENDATIONS),
+            reasoning=_get_string(data, 'reasoning'),
+        )
+
+    def to_markdown(self) -> str:
+        """Render with the same headings as the free-form HR review."""
+        lines = ["## Strengths"] + _bullets(self.strengths)
+        lines += ["", "## Weaknesses/Gaps"] + _bullets(self.weaknesses)
+        lines += ["", "## Key Observations", f"- Overall fit: {self.fit_score}/100"] + [f"- {item}" for item in self.observations]
+        lines += ["", "## Recommendation", f"- **{self.recommendation}** - {self.reasoning}"]
+        return "\n".join(lines)
+
+
+@dataclass
+class ScreeningResult:
+    """Structured batch screening verdict."""
+
+    score: int
+    recommendation: str
+    reasoning: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScreeningResult":
+        """Validate a decoded SCREENING_SCHEMA response and build the result."""
+        return cls(
+            score=_get_score(data, 'score'),
+            recommendation=_get_choice(data, 'recommendation', RECOMMENDATIONS),
+            reasoning=_get_string(data, 'reasoning'),
+        )
+
+    def to_markdown(self) -> str:
+        """Render as the two-line screening summary."""
+        return f"ATS Score: {self.score}/100\nRecommendation: {self.recommendation} - {self.reasoning}"
+
+
+# Analysis kind -> (response schema, result type)
+STRUCTURED_ANALYSES = {
+    'ats': (ATS_SCHEMA, AtsAnalysis),
+    'hr': (HR_SCHEMA, HrAnalysis),
+    'screening': (SCREENING_SCHEMA, ScreeningResult),
+}
+
+
+def parse_analysis(kind: str, output: str):
+    """
+    Decode and validate a structured response.
+
+    Args:
+        kind (str): Key of STRUCTURED_ANALYSES
+        output (str): Raw JSON text returned by Gemini
+
+    Returns:
+        tuple: (AtsAnalysis | HrAnalysis | ScreeningResult, None) or (None, error message)
+    """
+    _, result_type = STRUCTURED_ANALYSES[kind]
+    # Tolerate a ```json fence in case the model wraps the object anyway
+    text = re.sub(r"^\s*```(?:json)?\s*|\s*```\s*$", "", output or "")
+    try:
+        data = json.loads(text)
+        if not isinstance(data, dict):
+            raise SchemaError("expected a JSON object")
+        return result_type.from_dict(data), None
+    except ValueError as e:
+        return None, f"⚠️ Gemini returned an invalid structured response: {str(e)[:200]}"
+
+
+def analysis_to_json(result) -> str:
+    """
+    Serialize a structured result for download or storage.
+
+    Args:
+        result: AtsAnalysis, HrAnalysis or ScreeningResult
+
+    Returns:
+        str: Indented JSON
+    """
+    return json.dumps(asdict(result), indent=2)
@@ -3,11 +3,29 @@ load_dotenv()
 
 import streamlit as st
 import os
-import pdfplumber
-import re
-import google.generativeai as genai
 from auth_handler import AuthManager, initialize_auth_session
+from analysis_cache import get_analysis_cache
+from rate_limiter import get_gemini_limiter
+from gemini_service import configure_gemini, get_prefix_cache, get_inflight_analyses, analyze_resume_with_gemini, analyze_many_with_gemini, stream_resume_with_gemini, analyze_resume_structured, analyze_many_structured
+from prompts import HR_PROMPT, ATS_PROMPT, HR_JSON_PROMPT, ATS_JSON_PROMPT
+from analysis_schema import analysis_to_json
+from llm_backend import get_llm_backend
+from model_router import get_model_router
+from pdf_extractor import extract_text_from_pdf
+from batch_screening import render_batch_screening
+from analysis_jobs import get_job_queue, run_analysis_job, render_background_jobs
+from ats_scorer import score_resume, format_score_report
+from resume_compactor import compact_resume, get_compaction_stats
+from metrics import observe_stage, stage_summary, start_metrics_server
+from password_hasher import get_password_hasher
+from session_store import current_session_id, get_session_store, process_rss_bytes
 from datetime import datetime
+import time
+
+# Time the whole script run: every widget interaction reruns it
+rerun_started = time.perf_counter()
+# Prometheus /metrics endpoint (only when METRICS_PORT is set; started once per process)
+start_metrics_server()
 
 # ===== AUTHENTICATION SETUP =====
 # Initialize session state for authentication
@@ -26,134 +44,6 @@ st.set_page_config(
     }
 )
 
-# ===== GEMINI API SETUP =====
-# Set up the Gemini API
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    st.error("⚠️ GOOGLE_API_KEY not found in environment variables. Please check your .env file.")
-    st.stop()
-
-genai.configure(api_key=api_key)
-
-# Function to send inputs to Gemini and get the response
-def analyze_resume_with_gemini(job_desc, resume_text, prompt_text):
-    try:
-        model = genai.GenerativeModel("models/gemini-2.5-flash")
-        
-        # Combine all inputs into a single prompt
-        full_prompt = f"""{prompt_text}
-
-=== JOB DESCRIPTION ===
-{job_desc}
-
-=== RESUME TEXT ===
-{resume_text}
-"""
-        
-        response = model.generate_content(full_prompt)
-        return response.text, None
-    except Exception as error:
-        error_msg = str(error)
-        if "429" in error_msg:
-            return None, "⚠️ API quota exceeded. Please try again later or add billing to your Google Cloud project."
-        elif "400" in error_msg or "INVALID" in error_msg:
-            return None, "⚠️ Invalid API key. Please check your .env file and ensure the key is valid."
-        elif "404" in error_msg:
-            return None, "⚠️ Model not found. The gemini-1.5-flash model may not be available."
-        else:
-            return None, f"⚠️ API Error: {error_msg[:200]}"
-
-# Extract text from PDF using pdfplumber
-def extract_text_from_pdf(uploaded_pdf):
-    try:
-        text_content = []
-        
-        with pdfplumber.open(uploaded_pdf) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
-        
-        # Combine all pages
-        full_text = "\n\n".join(text_content)
-        
-        # Clean the text
-        full_text = full_text.strip()
-        
-        # Remove excessive blank lines
-        full_text = re.sub(r'\n{3,}', '\n\n', full_text)
-        
-        # Check if text was extracted
-        if not full_text or len(full_text) < 100:
-            return None, "⚠️ Could not extract text from PDF. This may be a scanned/image-based resume. Please upload a text-based PDF."
-        
-        # Truncate if too long (Gemini context limit consideration)
-        max_length = 30000  # Conservative limit
-        if len(full_text) > max_length:
-            full_text = full_text[:max_length] + "\n\n[Resume truncated due to length]"
-        
-        return full_text, None
-        
-    except Exception as e:
-        return None, f"⚠️ Error reading PDF: {str(e)}"
-
-# Prompts for HR and ATS perspective
-HR_PROMPT = """
-You are an experienced HR specialist with strong technical awareness.
-Analyze the resume against the job description provided below.
-
-**Provide a detailed evaluation with:**
-
-## Strengths
-- List 3-5 key strengths where the candidate excels
-- Highlight relevant experience and skills that match well
-
-## Weaknesses/Gaps
-- Identify areas where the candidate falls short
-- Note missing qualifications or experience
-
-## Key Observations
-- Overall fit for the role
-- Cultural and technical alignment
-- Career progression and growth potential
-
-## Recommendation
-- Should we proceed with this candidate? (Yes/No/Maybe)
-- Brief reasoning for your recommendation
-"""
-
-ATS_PROMPT = """
-You are an ATS (Applicant Tracking System) analyzer.
-Evaluate the resume against the job description for ATS compatibility.
-
-**Provide a structured analysis:**
-
-## ATS Score: [X/100]
-Provide a numerical score based on keyword matching and formatting.
-
-## Keyword Analysis
-### Matching Keywords:
-- List keywords from job description found in resume
-
-### Missing Keywords:
-- List critical keywords from job description NOT found in resume
-- Prioritize by importance (high/medium/low)
-
-## Formatting Assessment
-- Rate formatting quality (Good/Fair/Poor)
-- Identify any ATS compatibility issues
-- Note any parsing problems
-
-## Optimization Suggestions
-1. Add these specific keywords: [list]
-2. Improve these sections: [list]
-3. Formatting fixes: [list]
-
-## Summary
-- Overall likelihood of passing ATS screening
-- Top 3 actionable improvements
-"""
-
 # ===== AUTHENTICATION CHECK =====
 # Render login + sign up portal if not authenticated
 if st.session_state['authentication_status'] != True:
@@ -166,6 +56,21 @@ if st.session_state['authentication_status'] != True:
 
 # ===== MAIN APP STARTS HERE (AUTHENTICATED ONLY) =====
 
+# ===== GEMINI API SETUP =====
+# Set up the Gemini API (after login, so the login page never pays the SDK import cost)
+api_key = os.getenv("GOOGLE_API_KEY")
+if not api_key and get_llm_backend().requires_api_key:
+    st.error("⚠️ GOOGLE_API_KEY not found in environment variables. Please check your .env file.")
+    st.stop()
+
+configure_gemini(api_key)
+
+# ===== SESSION PAYLOADS =====
+# Resume text and reports are stored once in a shared, size-bounded store; session state keeps digests
+session_store = get_session_store()
+session_id = current_session_id()
+session_store.touch(session_id)
+
 # Modern premium styling
 st.markdown(
     """
@@ -440,6 +345,13 @@ with st.sidebar:
             st.session_state['authentication_status'] = False
             st.session_state['username'] = None
             st.session_state['name'] = None
+            session_store.release(session_id)
+            st.session_state.pop('resume_ref', None)
+            st.session_state.pop('report_ref', None)
+            st.session_state.pop('batch_results', None)
+            # Background reports belong to the user who queued them
+            for key in ('analysis_jobs', 'analysis_jobs_owner', 'analysis_jobs_polling'):
+                st.session_state.pop(key, None)
             st.success("✅ Logged out!")
             st.rerun()
     
@@ -453,7 +365,7 @@ with st.sidebar:
     
     2️⃣ **Upload Resume** - Upload your **text-based** PDF resume
     
-    3️⃣ **Run Analysis** - Choose HR Review or ATS Match
+    3️⃣ **Run Analysis** - Choose HR Review, ATS Match or the Full Report
     
     4️⃣ **Get Results** - View detailed feedback and download report
     """)
@@ -470,6 +382,50 @@ with st.sidebar:
     
     st.divider()
     
+    st.subheader("📦 Result Cache")
+    cache_stats = get_analysis_cache().stats()
+    st.caption(f"• Cached reports: {cache_stats['entries']}\n• Hits: {cache_stats['hits']} / Misses: {cache_stats['misses']}")
+    limiter_stats = get_gemini_limiter().stats()
+    st.caption(f"• API queue: {limiter_stats['queue_depth']} waiting (avg wait {limiter_stats['avg_wait_seconds']:.1f}s)\n• Throttled: {limiter_stats['throttled']} / Retries: {limiter_stats['retries']}")
+    hasher_stats = get_password_hasher().stats()
+    st.caption(f"• Password hashing: {hasher_stats['queue_depth']} queued (avg wait {hasher_stats['avg_wait_seconds'] * 1000:.0f}ms)")
+    prefix_cache = get_prefix_cache()
+    if prefix_cache is not None:
+        prefix_stats = prefix_cache.stats()
+        st.caption(f"• Prompt prefix reused: {prefix_stats['hits']} times (~{prefix_stats['tokens_reused']:,} tokens)")
+    inflight_stats = get_inflight_analyses().stats()
+    st.caption(f"• Duplicate requests coalesced: {inflight_stats['coalesced']} ({inflight_stats['in_flight']} in flight)")
+    compaction_stats = get_compaction_stats().stats()
+    st.caption(f"• Resume tokens saved: {compaction_stats['tokens_saved']:,} ({compaction_stats['saved_ratio']:.0%} of {compaction_stats['original_tokens']:,})")
+    route_stats = get_model_router().stats()
+    st.caption(f"• Backend: {get_llm_backend().name}\n• Routed: " + " / ".join(f"{tier} {count}" for tier, count in route_stats.items()))
+    
+    with st.expander("🧠 Memory", expanded=False):
+        mine = session_store.session_stats(session_id)
+        store_stats = session_store.stats()
+        rss = process_rss_bytes()
+        st.caption(
+            f"• This session: {mine['owned_bytes'] / 1024:,.0f} KB in {mine['slots']} payload(s)\n"
+            f"• Shared store: {store_stats['bytes'] / 1024 ** 2:,.1f} of {store_stats['max_bytes'] / 1024 ** 2:,.0f} MB, "
+            f"{store_stats['sessions']} session(s), avg {store_stats['avg_session_bytes'] / 1024:,.0f} KB\n"
+            f"• Duplicates avoided: {store_stats['deduplicated']} / Evicted: {store_stats['evicted_idle']} idle, {store_stats['evicted_budget']} over budget"
+            + (f"\n• Process RSS: {rss / 1024 ** 2:,.0f} MB" if rss else "")
+        )
+
+    with st.expander("⏱️ Stage Latency", expanded=False):
+        latency = stage_summary()
+        if latency:
+            st.dataframe(
+                [{'Stage': stage, 'Runs': values['count'], 'p50 (s)': round(values['p50'], 3),
+                  'p95 (s)': round(values['p95'], 3), 'p99 (s)': round(values['p99'], 3)}
+                 for stage, values in latency.items()],
+                hide_index=True, use_container_width=True,
+            )
+        else:
+            st.caption("No timings recorded yet")
+    
+    st.divider()
+    
     st.subheader("🔧 About")
     st.caption("Built with Streamlit + Gemini AI to help you optimize your resume matching")
 
@@ -477,6 +433,9 @@ with st.sidebar:
 # Main content area
 st.markdown("---")
 
+screening_mode = st.radio("Mode", ["Single Resume", "Batch Screening"], horizontal=True, help="Batch Screening scores many resumes against one job description")
+batch_mode = screening_mode == "Batch Screening"
+
 col_job, col_upload = st.columns([1.2, 1], gap="large")
 
 with col_job:
@@ -484,64 +443,214 @@ with col_job:
     job_description = st.text_area("Paste the job description below:", height=250, placeholder="Paste the complete job posting here...")
 
 with col_upload:
-    st.subheader("📄 Your Resume")
-    uploaded_resume = st.file_uploader("Upload PDF Resume", type=["pdf"], help="Select your resume in PDF format")
-
-resume_ready = False
-resume_text = None
-
-if uploaded_resume:
-    with st.spinner("📄 Extracting text from PDF..."):
-        resume_text, error = extract_text_from_pdf(uploaded_resume)
+    if batch_mode:
+        st.subheader("📚 Resumes")
+        uploaded_batch = st.file_uploader("Upload PDF Resumes or a ZIP", type=["pdf", "zip"], accept_multiple_files=True, help="Select many PDF resumes, or one ZIP archive of PDFs")
+    else:
+        st.subheader("📄 Your Resume")
+        uploaded_resume = st.file_uploader("Upload PDF Resume", type=["pdf"], help="Select your resume in PDF format")
+
+if batch_mode:
+    render_batch_screening(job_description, uploaded_batch)
+else:
+    resume_ready = False
+    resume_text = None
+
+    if uploaded_resume:
+        # Reruns with the same upload reuse the stored text instead of re-reading the file
+        resume_ref = st.session_state.get('resume_ref')
+        if resume_ref and resume_ref[0] == uploaded_resume.file_id:
+            resume_text, error = session_store.get(resume_ref[1]), None
+
+        with st.spinner("📄 Extracting text from PDF..."):
+            if resume_text is None:
+                resume_text, error = extract_text_from_pdf(uploaded_resume)
+                if resume_text:
+                    st.session_state['resume_ref'] = (
+                        uploaded_resume.file_id, session_store.put(session_id, "resume", resume_text)
+                    )
         
-        if error:
-            st.error(error)
-            resume_ready = False
-        elif resume_text:
-            st.success(f"✓ Resume uploaded successfully! ({len(resume_text)} characters extracted)")
-            resume_ready = True
+            if error:
+                st.error(error)
+                resume_ready = False
+            elif resume_text:
+                st.success(f"✓ Resume uploaded successfully! ({len(resume_text)} characters extracted)")
+                resume_ready = True
             
-            # Show preview of extracted text
-            with st.expander("👁️ Preview Extracted Text", expanded=False):
-                preview_text = resume_text[:500] + "..." if len(resume_text) > 500 else resume_text
-                st.text_area("First 500 characters:", preview_text, height=200, disabled=True)
+                # Show preview of extracted text
+                with st.expander("👁️ Preview Extracted Text", expanded=False):
+                    preview_text = resume_text[:500] + "..." if len(resume_text) > 500 else resume_text
+                    st.text_area("First 500 characters:", preview_text, height=200, disabled=True)
+
+                # What will actually be sent: relevant sections within the token budget
+                compaction = compact_resume(resume_text, job_description)
+                dropped = compaction['trimmed_sections'] + compaction['dropped_sections']
+                st.caption(
+                    f"🪶 ~{compaction['tokens']:,} of {compaction['original_tokens']:,} resume tokens sent to Gemini "
+                    f"({compaction['tokens_saved']:,} saved)" + (f" — trimmed/dropped: {', '.join(dropped)}" if dropped else "")
+                )
+    elif st.session_state.pop('resume_ref', None):
+        # Upload removed: let the shared copy go once no other session uses it
+        session_store.release(session_id, "resume")
 
-st.markdown("---")
+    st.markdown("---")
 
-# Analysis buttons
-st.subheader("🚀 Run Analysis")
-col_hr, col_ats = st.columns(2, gap="medium")
+    # Analysis buttons
+    st.subheader("🚀 Run Analysis")
+    col_hr, col_ats, col_full, col_local = st.columns(4, gap="medium")
+
+    with col_hr:
+        do_hr_eval = st.button("🔍 HR Review", use_container_width=True, help="Get feedback from an HR specialist perspective")
+
+    with col_ats:
+        do_ats_eval = st.button("📊 ATS Match Score", use_container_width=True, help="See how well your resume matches the ATS system")
+
+    with col_full:
+        do_full_report = st.button("📑 Full Report", use_container_width=True, help="Run the HR Review and ATS Match together")
+
+    with col_local:
+        do_local_score = st.button("⚡ Instant Score", use_container_width=True, help="Offline keyword-match score, no AI call")
+
+    stream_output = st.toggle("⚡ Stream results as they are generated", value=True, help="Show the report progressively instead of waiting for the full response")
+    structured_output = st.toggle("🧩 Structured results", value=False, help="Request schema-validated JSON (score, keywords, recommendation) and render the report from it")
+    run_in_background = st.toggle("🕒 Run in background", value=False, help="Queue the analysis and keep working; the report appears below when ready")
+
+    username = st.session_state.get('username')
+    if 'analysis_jobs' not in st.session_state or st.session_state.get('analysis_jobs_owner') != username:
+        # Reports queued before a page reload (or on another tab) are picked up again;
+        # the list is rebuilt when a different user logs in on the same browser session
+        st.session_state['analysis_jobs'] = [job['id'] for job in get_job_queue().list_jobs(username)]
+        st.session_state['analysis_jobs_owner'] = username
+
+    # Perform analysis if triggered
+    if (do_hr_eval or do_ats_eval or do_full_report or do_local_score):
+        if not job_description or not job_description.strip():
+            st.error("⚠️ Please enter a job description before analyzing.")
+        elif not resume_ready or not resume_text:
+            st.error("⚠️ Please upload a valid resume PDF to proceed.")
+        elif do_local_score:
+            st.markdown("---")
+            st.subheader("✨ Instant ATS Score")
+
+            # Deterministic keyword match computed locally, no API quota used
+            local_result = score_resume(job_description, resume_text)
+            st.metric("Keyword Match", f"{local_result['score']}/100")
+            local_report = format_score_report(local_result)
+            st.markdown(local_report)
+            st.download_button(
+                label="⬇️ Download Report",
+                data=local_report,
+                file_name="resume_analysis_instant_ats_score.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+        elif run_in_background:
+            # Work runs on the shared job pool; the result is stored with the job and survives reruns
+            analyses = {"HR Review Results": (HR_PROMPT, HR_JSON_PROMPT, "hr"), "ATS Match Analysis": (ATS_PROMPT, ATS_JSON_PROMPT, "ats")}
+            if not do_full_report:
+                selected = "HR Review Results" if do_hr_eval else "ATS Match Analysis"
+                analyses = {selected: analyses[selected]}
+
+            job_queue = get_job_queue()
+            for label, (prompt_text, json_prompt, kind) in analyses.items():
+                if structured_output:
+                    job_args, meta = (json_prompt, kind), {'kind': kind}
+                else:
+                    job_args, meta = (prompt_text,), {}
+                job_id = job_queue.submit(
+                    run_analysis_job, job_description, resume_text, *job_args,
+                    owner=username, label=label, meta=meta,
+                )
+                st.session_state['analysis_jobs'].insert(0, job_id)
+            st.toast(f"🕒 Queued {len(analyses)} analysis job(s)")
+        elif do_full_report:
+            st.markdown("---")
+            st.subheader("✨ Full Report")
+
+            # Both analyses run concurrently; each section renders as soon as it finishes
+            sections = {"HR Review Results": HR_PROMPT, "ATS Match Analysis": ATS_PROMPT}
+            placeholders = {name: st.container() for name in sections}
+            for name, placeholder in placeholders.items():
+                with placeholder:
+                    st.markdown(f"### {name}")
+                    placeholders[name] = st.empty()
+                    placeholders[name].info("🤖 Analyzing... This may take a moment")
+
+            if structured_output:
+                analyses = {"HR Review Results": (HR_JSON_PROMPT, "hr"), "ATS Match Analysis": (ATS_JSON_PROMPT, "ats")}
+                results = (
+                    (name, result.to_markdown() if result else None, error)
+                    for name, result, error in analyze_many_structured(job_description, resume_text, analyses)
+                )
+            else:
+                results = analyze_many_with_gemini(job_description, resume_text, sections)
+
+            outputs = {}
+            for name, output, error in results:
+                with placeholders[name].container():
+                    if error:
+                        st.error(error)
+                    else:
+                        st.markdown(output)
+                        outputs[name] = output
+
+            if outputs:
+                full_report = "\n\n".join(f"# {name}\n\n{outputs[name]}" for name in sections if name in outputs)
+                st.session_state['report_ref'] = ("Full Report", session_store.put(session_id, "report", full_report))
+                st.download_button(
+                    label="⬇️ Download Full Report",
+                    data=full_report,
+                    file_name="resume_analysis_full_report.txt",
+                    mime="text/plain",
+                    use_container_width=True
+                )
+        else:
+            selected_prompt = HR_PROMPT if do_hr_eval else ATS_PROMPT
+            analysis_type = "HR Review Results" if do_hr_eval else "ATS Match Analysis"
+
+            structured_result = None
+
+            if structured_output:
+                structured_prompt, kind = (HR_JSON_PROMPT, "hr") if do_hr_eval else (ATS_JSON_PROMPT, "ats")
+                with st.spinner("🤖 Analyzing your resume... This may take a moment"):
+                    structured_result, error = analyze_resume_structured(job_description, resume_text, structured_prompt, kind)
+                output = structured_result.to_markdown() if structured_result else None
+
+                if structured_result:
+                    st.markdown("---")
+                    st.subheader(f"✨ {analysis_type}")
+                    if kind == "ats":
+                        st.metric("ATS Score", f"{structured_result.score}/100")
+                    else:
+                        st.metric("Overall Fit", f"{structured_result.fit_score}/100", help=f"Recommendation: {structured_result.recommendation}")
+                    # Markdown is rendered from the validated result, not from model prose
+                    st.markdown(output)
+            elif stream_output:
+                st.markdown("---")
+                st.subheader(f"✨ {analysis_type}")
 
-with col_hr:
-    do_hr_eval = st.button("🔍 HR Review", use_container_width=True, help="Get feedback from an HR specialist perspective")
+                # Render chunks as Gemini emits them; the stream keeps the assembled text
+                stream = stream_resume_with_gemini(job_description, resume_text, selected_prompt)
+                st.write_stream(stream)
+                output, error = stream.text, stream.error
+            else:
+                with st.spinner("🤖 Analyzing your resume... This may take a moment"):
+                    output, error = analyze_resume_with_gemini(job_description, resume_text, selected_prompt)
 
-with col_ats:
-    do_ats_eval = st.button("📊 ATS Match Score", use_container_width=True, help="See how well your resume matches the ATS system")
+                if output:
+                    st.markdown("---")
+                    st.subheader(f"✨ {analysis_type}")
 
-# Perform analysis if triggered
-if (do_hr_eval or do_ats_eval):
-    if not job_description or not job_description.strip():
-        st.error("⚠️ Please enter a job description before analyzing.")
-    elif not resume_ready or not resume_text:
-        st.error("⚠️ Please upload a valid resume PDF to proceed.")
-    else:
-        with st.spinner("🤖 Analyzing your resume... This may take a moment"):
-            selected_prompt = HR_PROMPT if do_hr_eval else ATS_PROMPT
-            output, error = analyze_resume_with_gemini(job_description, resume_text, selected_prompt)
+                    # Display result using markdown for better formatting
+                    st.markdown(output)
 
             if error:
                 st.error(error)
             elif output:
-                st.markdown("---")
-                
-                analysis_type = "HR Review Results" if do_hr_eval else "ATS Match Analysis"
-                st.subheader(f"✨ {analysis_type}")
-                
-                # Display result using markdown for better formatting
-                st.markdown(output)
-
-                col_download, col_new = st.columns(2)
-                
+                st.session_state['report_ref'] = (analysis_type, session_store.put(session_id, "report", output))
+                columns = st.columns(3 if structured_result else 2)
+                col_download, col_new = columns[0], columns[-1]
+            
                 with col_download:
                     st.download_button(
                         label="⬇️ Download Report",
@@ -550,11 +659,46 @@ if (do_hr_eval or do_ats_eval):
                         mime="text/plain",
                         use_container_width=True
                     )
-                
+            
+                if structured_result:
+                    with columns[1]:
+                        st.download_button(
+                            label="⬇️ Download JSON",
+                            data=analysis_to_json(structured_result),
+                            file_name=f"resume_analysis_{analysis_type.replace(' ', '_').lower()}.json",
+                            mime="application/json",
+                            use_container_width=True
+                        )
+            
                 with col_new:
                     if st.button("🔄 Run Another Analysis", use_container_width=True):
                         st.rerun()
 
+    elif 'report_ref' in st.session_state:
+        # The latest report survives reruns (e.g. a download click) until the session goes idle
+        report_title, report_digest = st.session_state['report_ref']
+        report_text = session_store.get(report_digest)
+        if report_text:
+            st.markdown("---")
+            with st.expander(f"📄 Last Report: {report_title}", expanded=False):
+                st.markdown(report_text)
+                st.download_button(
+                    label="⬇️ Download Report",
+                    data=report_text,
+                    file_name=f"resume_analysis_{report_title.replace(' ', '_').lower()}.txt",
+                    mime="text/plain",
+                    use_container_width=True,
+                    key="last_report_download",
+                )
+        else:
+            # Evicted from the store (idle session or memory budget)
+            del st.session_state['report_ref']
+
+    if st.session_state['analysis_jobs']:
+        st.markdown("---")
+        st.subheader("🕒 Background Reports")
+        render_background_jobs(st.session_state['analysis_jobs'], username)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -563,3 +707,5 @@ st.markdown("""
     <p style="font-size: 11px; margin-top: 15px; color: var(--border);">© 2025 • GDG Project</p>
 </div>
 """, unsafe_allow_html=True)
+
+observe_stage("app_rerun", time.perf_counter() - rerun_started)
@@ -0,0 +1,182 @@
+"""
+ATS Scorer Module
+Deterministic, offline keyword-match scoring of a resume against a job description
+"""
+
+import math
+import re
+from collections import Counter
+
+MAX_KEYWORDS = 40
+BIGRAM_WEIGHT = 1.5
+SKILL_WEIGHT = 2.0
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./]*[a-z0-9+#]|[a-z0-9]")
+_SEGMENT_PATTERN = re.compile(r"[\n.;:,()\[\]|•·]+")
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just may me might more
+most must my no nor not of off on once only or other our ours out over own per same shall she should so
+some such than that the their theirs them then there these they this those through to too under until
+up upon us very via was we were what when where which while who whom why will with within without would
+you your yours
+ability able across activities additional apply based benefits best candidate candidates company
+competitive demonstrated desired duties environment equal excellent experience experienced familiarity
+good great help ideal including job join knowledge looking new opportunity plus position preferred
+proficiency proficient related required requirements responsibilities responsible role seeking skills
+strong team understanding using work working year years
+""".split())
+
+KNOWN_SKILLS = frozenset("""
+agile airflow android angular ansible api apis aws azure bash bigquery c c# c++ cassandra ci/cd cloud
+css dart databricks deep django docker dynamodb elasticsearch etl excel express fastapi figma firebase
+flask flutter gcp git github gitlab go golang graphql hadoop html ios java javascript jenkins jira
+kafka keras kotlin kubernetes linux looker machine matlab microservices mongodb mysql nlp node node.js
+nosql numpy oracle pandas php postgresql power powerbi python pytorch r react redis rest ruby rust
+sas scala scikit-learn scrum selenium snowflake spark spring sql swift tableau tensorflow terraform
+typescript unix vue
+""".split())
+
+KNOWN_SKILL_PHRASES = frozenset({
+    "machine learning", "deep learning", "data analysis", "data science", "data engineering",
+    "computer vision", "natural language", "project management", "product management",
+    "power bi", "unit testing", "system design", "rest api", "spring boot",
+    "google cloud", "version control", "stakeholder management",
+})
+
+
+def normalize_token(token: str) -> str:
+    """
+    Normalize a token so simple plural forms match (e.g. developers -> developer).
+
+    Args:
+        token (str): Lowercase token
+
+    Returns:
+        str: Normalized token
+    """
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss") and token.isalpha():
+        return token[:-1]
+    return token
+
+
+def extract_terms(text: str) -> tuple[Counter, dict]:
+    """
+    Tokenize text into unigram and bigram counts.
+
+    Bigrams never span punctuation, line breaks or stopwords.
+
+    Args:
+        text (str): Raw job description or resume text
+
+    Returns:
+        tuple: (Counter of normalized terms, normalized term -> first surface form)
+    """
+    counts = Counter()
+    surface = {}
+    for segment in _SEGMENT_PATTERN.split((text or "").lower()):
+        previous = None
+        for raw in _TOKEN_PATTERN.findall(segment):
+            raw = raw.rstrip(".")
+            if not raw or raw in STOPWORDS or not any(char.isalpha() for char in raw):
+                previous = None
+                continue
+            term = normalize_token(raw)
+            counts[term] += 1
+            surface.setdefault(term, raw)
+            if previous is not None:
+                bigram = f"{previous[0]} {term}"
+                counts[bigram] += 1
+                surface.setdefault(bigram, f"{previous[1]} {raw}")
+            previous = (term, raw)
+    return counts, surface
+
+
+def _term_weight(term: str, count: int) -> float:
+    weight = 1.0 + math.log(count)
+    is_bigram = " " in term
+    if term in KNOWN_SKILLS or term in KNOWN_SKILL_PHRASES:
+        weight *= SKILL_WEIGHT
+    if is_bigram:
+        weight *= BIGRAM_WEIGHT
+    return weight
+
+
+def extract_job_keywords(job_desc: str, max_keywords: int = MAX_KEYWORDS) -> list[tuple[str, float]]:
+    """
+    Pick the weighted keywords an ATS would look for in the job description.
+
+    Bigrams are kept only if they repeat or are known skill phrases, so
+    incidental word pairs do not dilute the score.
+
+    Args:
+        job_desc (str): Job description text
+        max_keywords (int): Maximum number of keywords to keep
+
+    Returns:
+        list[tuple[str, float]]: (normalized keyword, weight), heaviest first
+    """
+    counts, _ = extract_terms(job_desc)
+    candidates = []
+    for term, count in counts.items():
+        if " " in term and count < 2 and term not in KNOWN_SKILL_PHRASES:
+            continue
+        if " " not in term and len(term) < 2 and term not in KNOWN_SKILLS:
+            continue
+        candidates.append((term, _term_weight(term, count)))
+    # Sort by weight, then alphabetically so ties are reproducible
+    candidates.sort(key=lambda item: (-item[1], item[0]))
+    return candidates[:max_keywords]
+
+
+def score_resume(job_desc: str, resume_text: str, max_keywords: int = MAX_KEYWORDS) -> dict:
+    """
+    Compute a weighted keyword-match score without any LLM call.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        max_keywords (int): Maximum number of job keywords considered
+
+    Returns:
+        dict: score (0-100), matched_keywords (list[str]) and
+            missing_keywords (list of {'keyword', 'priority'}), heaviest first
+    """
+    keywords = extract_job_keywords(job_desc, max_keywords)
+    _, job_surface = extract_terms(job_desc)
+    resume_counts, _ = extract_terms(resume_text)
+
+    total_weight = sum(weight for _, weight in keywords)
+    matched_weight = 0.0
+    matched, missing = [], []
+    for rank, (term, weight) in enumerate(keywords):
+        label = job_surface.get(term, term)
+        if term in resume_counts:
+            matched_weight += weight
+            matched.append(label)
+        else:
+            # Top third of the keyword list is high priority, next third medium
+            priority = "high" if rank < len(keywords) / 3 else "medium" if rank < 2 * len(keywords) / 3 else "low"
+            missing.append({'keyword': label, 'priority': priority})
+
+    score = round(100 * matched_weight / total_weight) if total_weight else 0
+    return {'score': score, 'matched_keywords': matched, 'missing_keywords': missing}
+
+
+def format_score_report(result: dict) -> str:
+    """
+    Render a local score result as markdown (same headings as the ATS report).
+
+    Args:
+        result (dict): Output of score_resume
+
+    Returns:
+        str: Markdown report
+    """
+    lines = [f"## ATS Score: {result['score']}/100", "", "## Keyword Analysis", "### Matching Keywords:"]
+    lines += [f"- {keyword}" for keyword in result['matched_keywords']] or ["- None"]
+    lines += ["", "### Missing Keywords:"]
+    lines += [f"- {item['keyword']} ({item['priority']})" for item in result['missing_keywords']] or ["- None"]
+    return "\n".join(lines)
@@ -3,14 +3,23 @@ Authentication Configuration Module
 Handles user credentials and password hashing with bcrypt
 """
 
-import bcrypt
-import yaml
 import os
+import threading
 from pathlib import Path
 
+from credential_store import SqliteCredentialStore, YamlCredentialStore
+from metrics import span
+from password_hasher import get_password_hasher
+
 # Path to credentials file
 CREDENTIALS_FILE = "config.yaml"
 
+# Credential backend: "yaml" (default) or "sqlite" for indexed lookups and single-row inserts.
+# Each backend is the single source of truth for users; with "sqlite", config.yaml only
+# seeds an empty database and keeps the cookie settings.
+CREDENTIAL_BACKEND = os.getenv("CREDENTIAL_BACKEND", "yaml").lower()
+CREDENTIALS_DB_FILE = os.getenv("CREDENTIALS_DB_PATH", ".cache/credentials.sqlite3")
+
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt for secure storage.
@@ -21,7 +30,45 @@ def hash_password(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    # Runs on the shared bcrypt pool at the configured BCRYPT_ROUNDS cost
+    return get_password_hasher().hash(password)
+
+def verify_password(password: str, hashed: str) -> bool:
+    """
+    Check a password against a stored bcrypt hash.
+
+    Args:
+        password (str): Plain text password
+        hashed (str): Stored bcrypt hash
+
+    Returns:
+        bool: True if the password matches
+    """
+    return get_password_hasher().verify(password, hashed)
+
+def rehash_password_if_needed(username: str, password: str, hashed: str) -> bool:
+    """
+    Re-hash a verified password when its cost factor differs from BCRYPT_ROUNDS.
+
+    Call only after verify_password succeeded, while the plain password is at hand.
+
+    Args:
+        username (str): Stored username
+        password (str): Verified plain text password
+        hashed (str): Current stored hash
+
+    Returns:
+        bool: True if the stored hash was upgraded
+    """
+    hasher = get_password_hasher()
+    if not hasher.needs_rehash(hashed):
+        return False
+    try:
+        return get_credential_store().update_password(username, hasher.hash(password))
+    except Exception as e:
+        # Login must not fail because the upgrade could not be saved
+        print(f"⚠️ Could not rehash password for {username}: {e}")
+        return False
 
 def user_exists(username: str) -> bool:
     """
@@ -33,9 +80,20 @@ def user_exists(username: str) -> bool:
     Returns:
         bool: True if user exists, False otherwise
     """
-    cfg = load_or_create_config()
-    usernames = cfg.get('credentials', {}).get('usernames', {})
-    return username.lower() in {u.lower(): v for u, v in usernames.items()}
+    return get_credential_store().user_exists(username)
+
+def get_user(username: str) -> tuple[str, dict] | None:
+    """
+    Look up a user by username (case-insensitive).
+
+    Args:
+        username (str): Username to look up
+
+    Returns:
+        tuple[str, dict] | None: (stored username, user record) or None if not found
+    """
+    with span("credential_lookup", backend=CREDENTIAL_BACKEND):
+        return get_credential_store().get_user(username)
 
 def add_user(username: str, name: str, email: str, password: str) -> tuple[bool, str]:
     """
@@ -65,25 +123,68 @@ def add_user(username: str, name: str, email: str, password: str) -> tuple[bool,
     if user_exists(username):
         return False, "Username already exists. Please choose another."
 
-    cfg = load_or_create_config()
-    cfg.setdefault('credentials', {}).setdefault('usernames', {})
-    cfg['credentials']['usernames'][username] = {
+    record = {
         'name': name,
         'password': hash_password(password),
         'email': email
     }
 
-    # Automatically add user to preauthorized list
-    cfg.setdefault('preauthorized', {}).setdefault('emails', [])
-    if email not in cfg['preauthorized']['emails']:
-        cfg['preauthorized']['emails'].append(email)
-
     try:
-        save_config(cfg)
+        # The store re-checks under its lock, so a concurrent sign-up cannot take the name twice;
+        # it also adds the email to the preauthorized list
+        if not get_credential_store().add_user(username, record):
+            return False, "Username already exists. Please choose another."
         return True, "Account created successfully. You can now log in."
     except Exception as e:
         return False, f"Failed to save user: {e}"
 
+def set_password(username: str, password: str) -> tuple[bool, str]:
+    """
+    Replace a user's password with a new bcrypt hash.
+
+    Args:
+        username (str): Username (case-insensitive)
+        password (str): New plain text password
+
+    Returns:
+        tuple[bool, str]: (success flag, message)
+    """
+    password = (password or "").strip()
+    if len(password) < 8:
+        return False, "Password must be at least 8 characters."
+    found = get_user(username)
+    if found is None:
+        return False, "User not found."
+    if not get_credential_store().update_password(found[0], hash_password(password)):
+        return False, "User not found."
+    return True, "Password updated successfully."
+
+def remove_user(username: str) -> bool:
+    """
+    Delete a user from the active credential store.
+
+    Args:
+        username (str): Username (case-insensitive)
+
+    Returns:
+        bool: True if the user existed and was removed
+    """
+    return get_credential_store().remove_user(username)
+
+def list_users() -> dict:
+    """
+    Get every user in the active credential store.
+
+    Returns:
+        dict: Stored username -> user record
+    """
+    return get_credential_store().list_users()
+
+def reset_to_default_users() -> None:
+    """Replace all users and preauthorized emails with the default demo accounts."""
+    defaults = create_default_config()
+    get_credential_store().replace_users(defaults['credentials']['usernames'], defaults['preauthorized']['emails'])
+
 def create_default_config() -> dict:
     """
     Create default configuration with sample users.
@@ -92,22 +193,26 @@ def create_default_config() -> dict:
     Returns:
         dict: Configuration dictionary
     """
+    # Hash the sample passwords in parallel rather than paying bcrypt cost three times in a row
+    admin_hash, demo_hash, john_hash = get_password_hasher().hash_many(
+        ['admin123', 'demo123', 'password123']  # Change in production
+    )
     return {
         'credentials': {
             'usernames': {
                 'admin': {
                     'name': 'Admin User',
-                    'password': hash_password('admin123'),  # Change in production
+                    'password': admin_hash,
                     'email': 'admin@example.com'
                 },
                 'demo': {
                     'name': 'Demo User',
-                    'password': hash_password('demo123'),  # Change in production
+                    'password': demo_hash,
                     'email': 'demo@example.com'
                 },
                 'john_doe': {
                     'name': 'John Doe',
-                    'password': hash_password('password123'),  # Change in production
+                    'password': john_hash,
                     'email': 'john@example.com'
                 }
             }
@@ -129,46 +234,129 @@ def create_default_config() -> dict:
 def load_or_create_config() -> dict:
     """
     Load credentials from YAML file or create default config if not exists.
+
+    The parsed file is cached and only re-read when it changes on disk;
+    each call returns a private copy that is safe to modify.
     
     Returns:
         dict: Configuration dictionary
     """
-    if os.path.exists(CREDENTIALS_FILE):
-        try:
-            with open(CREDENTIALS_FILE, 'r') as f:
-                config = yaml.safe_load(f)
-                if config:
-                    return config
-        except Exception as e:
-            print(f"⚠️ Error loading config: {e}. Creating new config.")
-    
-    # Create and save default config if file doesn't exist
-    config = create_default_config()
-    save_config(config)
-    return config
+    with span("config_load"):
+        return get_yaml_store().load()
 
 def save_config(config: dict) -> None:
     """
     Save configuration to YAML file.
+
+    The write holds a file lock and swaps in a temp file with os.replace,
+    so concurrent readers never see a partially written file. The config is
+    written as given, so users it leaves out are deleted; use
+    config_transaction() to keep concurrent sign-ups. With the SQLite
+    backend, users and preauthorized emails are written to the database instead
+    and only the remaining settings go to the YAML file.
     
     Args:
         config (dict): Configuration dictionary to save
     """
     try:
-        with open(CREDENTIALS_FILE, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+        with span("config_save"):
+            yaml_store = get_yaml_store()
+            store = get_credential_store()
+            if store is yaml_store:
+                yaml_store.save(config)
+                return
+            store.replace_users(
+                config.get('credentials', {}).get('usernames', {}) or {},
+                (config.get('preauthorized') or {}).get('emails') or [],
+            )
+            with yaml_store.transaction() as stored:
+                stored.update({key: value for key, value in config.items() if key not in ('credentials', 'preauthorized')})
     except Exception as e:
         raise Exception(f"Error saving configuration: {e}")
 
+def config_transaction():
+    """
+    Read-modify-write the YAML config under a cross-process lock.
+
+    Usage:
+        with config_transaction() as cfg:
+            cfg['credentials']['usernames'][name]['password'] = new_hash
+
+    Returns:
+        ContextManager[dict]: Freshly loaded config, saved atomically on exit
+    """
+    return get_yaml_store().transaction()
+
+_yaml_store = None
+_credential_store = None
+_store_lock = threading.Lock()
+
+def get_yaml_store() -> YamlCredentialStore:
+    """
+    Get the shared cached view of the YAML credentials file.
+
+    Returns:
+        YamlCredentialStore: Shared store instance
+    """
+    global _yaml_store
+    if _yaml_store is None:
+        with _store_lock:
+            if _yaml_store is None:
+                _yaml_store = YamlCredentialStore(CREDENTIALS_FILE, create_default_config)
+    return _yaml_store
+
+def get_credential_store():
+    """
+    Get the store used for user lookups and sign-ups (per CREDENTIAL_BACKEND).
+
+    Returns:
+        YamlCredentialStore | SqliteCredentialStore: Shared store instance
+    """
+    global _credential_store
+    if _credential_store is None:
+        yaml_store = get_yaml_store()
+        with _store_lock:
+            if _credential_store is None:
+                if CREDENTIAL_BACKEND == "sqlite":
+                    # First run imports the existing YAML users
+                    _credential_store = SqliteCredentialStore(CREDENTIALS_DB_FILE, seed_loader=yaml_store.load)
+                else:
+                    _credential_store = yaml_store
+    return _credential_store
+
 def get_config() -> dict:
     """
     Get or create authentication configuration.
+
+    Users and preauthorized emails come from the active credential store, so
+    with the SQLite backend they reflect the database rather than config.yaml.
     
     Returns:
         dict: Authentication configuration
     """
-    return load_or_create_config()
+    config = load_or_create_config()
+    store = get_credential_store()
+    if store is get_yaml_store():
+        return config
+    config['credentials'] = {'usernames': store.list_users()}
+    config['preauthorized'] = {'emails': store.preauthorized_emails()}
+    return config
 
-# Initialize config on module load
-if not os.path.exists(CREDENTIALS_FILE):
-    get_config()
+_config_initialized = False
+_init_lock = threading.Lock()
+
+def ensure_config_initialized() -> None:
+    """
+    One-time bootstrap: create the config file with default users if it is missing.
+
+    Importing this module has no side effects; call this (or any lookup, which
+    bootstraps lazily) when credentials are first needed. Later calls are no-ops.
+    """
+    global _config_initialized
+    if _config_initialized:
+        return
+    with _init_lock:
+        if not _config_initialized:
+            get_credential_store()
+            load_or_create_config()
+            _config_initialized = True
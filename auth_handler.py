@@ -4,9 +4,7 @@ Manages user authentication, session state, and access control
 """
 
 import streamlit as st
-import streamlit_authenticator as stauth
-from auth_config import get_config, add_user
-import bcrypt
+from auth_config import get_config, get_user, add_user, verify_password, rehash_password_if_needed, ensure_config_initialized
 from datetime import datetime
 
 class AuthManager:
@@ -19,10 +17,14 @@ class AuthManager:
     """
     
     def __init__(self):
-        """Initialize authentication manager with config."""
-        self.config = get_config()
+        """Initialize authentication manager; credentials are loaded lazily on first use."""
         # Note: streamlit_authenticator is not used for login UI anymore
         self.authenticator = None
+
+    @property
+    def config(self) -> dict:
+        """Authentication config (cached; re-read only when the file changes)."""
+        return get_config()
     
     def render_login_page(self) -> bool:
         """
@@ -31,8 +33,8 @@ class AuthManager:
         Returns:
             bool: True if user is authenticated, False otherwise
         """
-        # Reload config so newly signed-up users are recognized
-        self.config = get_config()
+        # First login page render bootstraps the default config if it is missing
+        ensure_config_initialized()
         # Create centered container
         col1, col2, col3 = st.columns([1, 2, 1])
 
@@ -64,14 +66,17 @@ class AuthManager:
                     submitted = st.form_submit_button("Login")
 
                 if submitted:
-                    users = self.config.get('credentials', {}).get('usernames', {})
-                    user_cfg = users.get(username_input)
-                    if user_cfg:
-                        stored_pw = user_cfg.get('password', '').encode('utf-8')
-                        if bcrypt.checkpw(password_input.encode('utf-8'), stored_pw):
+                    # Indexed, case-insensitive lookup instead of scanning all users
+                    found = get_user(username_input)
+                    if found:
+                        stored_username, user_cfg = found
+                        stored_pw = user_cfg.get('password', '')
+                        if verify_password(password_input, stored_pw):
+                            # Transparently upgrade hashes made with an older cost factor
+                            rehash_password_if_needed(stored_username, password_input, stored_pw)
                             st.session_state['authentication_status'] = True
-                            st.session_state['username'] = username_input
-                            st.session_state['name'] = user_cfg.get('name', username_input)
+                            st.session_state['username'] = stored_username
+                            st.session_state['name'] = user_cfg.get('name', stored_username)
                         else:
                             st.session_state['authentication_status'] = False
                             st.error("Incorrect password.")
@@ -103,12 +108,9 @@ class AuthManager:
                         else:
                             ok, msg = add_user(new_username, new_name, new_email, new_password)
                             if ok:
+                                # Lookups read the credential store directly, so no rerun is needed
                                 st.success("✅ Account created! You can now log in.")
                                 st.info(f"Username: **{new_username}** is ready. Switch to the Login tab.")
-                                # Trigger rerun so new user is loaded into authenticator on next cycle
-                                import time
-                                time.sleep(1)
-                                st.rerun()
                             else:
                                 st.error(f"❌ {msg}")
 
@@ -0,0 +1,287 @@
+"""
+Batch Screening Module
+Screens many resumes against one job description with bounded concurrency
+"""
+
+import csv
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ats_scorer import score_resume
+from gemini_service import analyze_resume_structured
+from pdf_extractor import extract_texts_from_pdfs
+from prompts import BATCH_SCREENING_PROMPT
+from session_store import hash_payload
+
+# Scheduler limits (overridable through environment variables)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+MAX_BATCH_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+# Decompression limits for ZIP uploads (a zip bomb must not exhaust memory)
+MAX_FILE_BYTES = int(float(os.getenv("BATCH_MAX_FILE_MB", "10")) * 1024 * 1024)
+MAX_TOTAL_BYTES = int(float(os.getenv("BATCH_MAX_TOTAL_MB", "200")) * 1024 * 1024)
+DEFAULT_MIN_LOCAL_SCORE = int(os.getenv("BATCH_MIN_LOCAL_SCORE", "0"))
+DEFAULT_SHORTLIST_SIZE = int(os.getenv("BATCH_SHORTLIST_SIZE", "0"))
+
+RESULT_COLUMNS = ["Resume", "Local Score", "ATS Score", "Recommendation", "Status"]
+
+
+def _read_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> bytes:
+    # Reading stops at the declared size, which the caller has already checked
+    with archive.open(info) as member:
+        return member.read(info.file_size)
+
+
+def _pdf_members(uploaded_files, warnings: list[str]):
+    """Yield (file name, uncompressed size, reader) for each uploaded PDF and each PDF inside a ZIP."""
+    for uploaded in uploaded_files or []:
+        data = uploaded.getvalue()
+        if not uploaded.name.lower().endswith(".zip"):
+            yield uploaded.name, len(data), lambda data=data: data
+            continue
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    if info.is_dir() or not name.lower().endswith(".pdf") or name.startswith("__MACOSX/"):
+                        continue
+                    yield os.path.basename(name), info.file_size, lambda info=info: _read_member(archive, info)
+        except zipfile.BadZipFile as e:
+            warnings.append(f"⚠️ Could not read {uploaded.name}: {str(e)}")
+
+
+def _accepted_members(uploaded_files, warnings: list[str]):
+    """Yield (file name, reader) for the PDFs within the batch limits, judged by their declared sizes."""
+    count, total_bytes = 0, 0
+    for name, size, read in _pdf_members(uploaded_files, warnings):
+        if count >= MAX_BATCH_FILES:
+            warnings.append(f"⚠️ Only the first {MAX_BATCH_FILES} resumes are screened")
+            break
+        if size > MAX_FILE_BYTES:
+            warnings.append(f"⚠️ Skipped {name}: larger than {MAX_FILE_BYTES / (1024 * 1024):g} MB")
+            continue
+        if total_bytes + size > MAX_TOTAL_BYTES:
+            warnings.append(f"⚠️ Stopped at {MAX_TOTAL_BYTES / (1024 * 1024):g} MB of resumes; the rest are not screened")
+            break
+        count += 1
+        total_bytes += size
+        yield name, read
+
+
+def count_batch_files(uploaded_files) -> tuple[int, list[str]]:
+    """
+    Count the resumes collect_batch_files would return, without decompressing anything.
+
+    ZIP members are counted from the archive's central directory, so this is
+    cheap enough to run on every Streamlit rerun.
+
+    Args:
+        uploaded_files: Streamlit UploadedFile objects (PDF or ZIP)
+
+    Returns:
+        tuple: (number of PDF documents within the limits, warnings about skipped files)
+    """
+    warnings = []
+    count = sum(1 for _ in _accepted_members(uploaded_files, warnings))
+    return count, warnings
+
+
+def collect_batch_files(uploaded_files) -> tuple[list[tuple[str, bytes]], list[str]]:
+    """
+    Flatten uploaded PDFs and ZIP archives into (file name, PDF bytes) pairs.
+
+    Collection stops at MAX_BATCH_FILES documents or MAX_TOTAL_BYTES of PDF data;
+    files over MAX_FILE_BYTES are skipped without being decompressed.
+
+    Args:
+        uploaded_files: Streamlit UploadedFile objects (PDF or ZIP)
+
+    Returns:
+        tuple: (at most MAX_BATCH_FILES PDF documents, warnings about skipped files)
+    """
+    documents, warnings = [], []
+    for name, read in _accepted_members(uploaded_files, warnings):
+        try:
+            documents.append((name, read()))
+        except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+            # Corrupt, encrypted or unsupported-compression members
+            warnings.append(f"⚠️ Skipped {name}: {str(e)}")
+    return documents, warnings
+
+
+def _result_row(name: str, local_score: int | None, result, error: str | None) -> dict:
+    row = {"Resume": name, "Local Score": local_score, "ATS Score": None, "Recommendation": "", "Status": error}
+    if not error:
+        # Structured ScreeningResult: no parsing of free-form text needed
+        row["ATS Score"] = result.score
+        row["Recommendation"] = f"{result.recommendation} - {result.reasoning}"
+        row["Status"] = "Done"
+    return row
+
+
+def screen_resumes(job_desc: str, documents: list[tuple[str, bytes]],
+                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                   min_local_score: int = DEFAULT_MIN_LOCAL_SCORE,
+                   shortlist_size: int = DEFAULT_SHORTLIST_SIZE):
+    """
+    Extract and screen many resumes, yielding one result row per resume as it completes.
+
+    PDFs are extracted in parallel; each extracted resume is handed straight to a
+    bounded pool of Gemini calls, paced by the shared Gemini rate limiter.
+    Resumes whose local keyword score is below min_local_score are reported
+    without spending a Gemini call. When shortlist_size is set, all resumes are
+    first ranked with BM25 and only the top shortlist_size go to Gemini.
+
+    Args:
+        job_desc (str): Job description text
+        documents (list[tuple[str, bytes]]): (file name, PDF bytes) pairs
+        max_concurrency (int): Maximum Gemini calls in flight
+        min_local_score (int): Local score (0-100) required before calling Gemini
+        shortlist_size (int): Number of top-ranked resumes sent to Gemini (0 = all)
+
+    Yields:
+        dict: Row with the RESULT_COLUMNS keys
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="batch-screen")
+    try:
+        pending = {}
+        extracted = []
+        for index, (text, error) in extract_texts_from_pdfs([data for _, data in documents]):
+            name = documents[index][0]
+            if error:
+                yield _result_row(name, None, None, error)
+                continue
+
+            local_score = score_resume(job_desc, text)['score']
+            if local_score < min_local_score:
+                yield _result_row(name, local_score, None, f"Skipped (local score below {min_local_score})")
+            elif shortlist_size:
+                # Ranking needs every resume, so Gemini calls wait for extraction to finish
+                extracted.append((name, local_score, text))
+            else:
+                future = pool.submit(analyze_resume_structured, job_desc, text, BATCH_SCREENING_PROMPT, "screening")
+                pending[future] = (name, local_score)
+
+            # Report finished screenings while extraction is still running
+            for future in [f for f in pending if f.done()]:
+                yield _result_row(*pending.pop(future), *future.result())
+
+        if extracted:
+            # NumPy/SciPy are only imported when a shortlist is requested
+            from resume_ranker import rank_resumes
+
+            ranking = rank_resumes(job_desc, [text for _, _, text in extracted])
+            for rank, (position, _) in enumerate(ranking, start=1):
+                name, local_score, text = extracted[position]
+                if rank <= shortlist_size:
+                    future = pool.submit(analyze_resume_structured, job_desc, text, BATCH_SCREENING_PROMPT, "screening")
+                    pending[future] = (name, local_score)
+                else:
+                    yield _result_row(name, local_score, None, f"Not shortlisted (rank {rank})")
+
+        for future in as_completed(pending):
+            yield _result_row(*pending[future], *future.result())
+    finally:
+        # A rerun or stop closes this generator; queued Gemini calls must not keep spending quota
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def results_to_csv(rows: list[dict]) -> str:
+    """
+    Serialize screening rows as CSV.
+
+    Args:
+        rows (list[dict]): Rows produced by screen_resumes
+
+    Returns:
+        str: CSV text with a header row
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=RESULT_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+def batch_results_key(job_desc: str, uploaded_files) -> str:
+    """
+    Identify a batch by its job description and uploaded files.
+
+    Args:
+        job_desc (str): Job description text
+        uploaded_files: Streamlit UploadedFile objects (PDF or ZIP)
+
+    Returns:
+        str: Hex digest that changes when the job description or any upload changes
+    """
+    file_ids = [getattr(uploaded, 'file_id', uploaded.name) for uploaded in uploaded_files or []]
+    return hash_payload("\n".join([job_desc or "", *file_ids]))
+
+
+def render_batch_screening(job_desc: str, uploaded_files) -> None:
+    """
+    Render the batch screening controls and live results table.
+
+    Args:
+        job_desc (str): Job description text
+        uploaded_files: Streamlit UploadedFile objects (PDF or ZIP)
+    """
+    import streamlit as st
+
+    # Every widget interaction reruns this; ZIP members are only decompressed once screening starts
+    ready, warnings = count_batch_files(uploaded_files)
+    for warning in warnings:
+        st.warning(warning)
+    if ready:
+        st.success(f"✓ {ready} resume(s) ready for screening")
+
+    st.markdown("---")
+    st.subheader("🚀 Run Batch Screening")
+    do_batch = st.button("📚 Screen All Resumes", use_container_width=True, help="Score every resume against the job description")
+
+    # Results survive reruns (e.g. the CSV download click) while the inputs are unchanged
+    results_key = batch_results_key(job_desc, uploaded_files)
+    stored = st.session_state.get('batch_results')
+    rows = stored['rows'] if stored and stored['key'] == results_key else None
+
+    if do_batch:
+        if not job_desc or not job_desc.strip():
+            st.error("⚠️ Please enter a job description before analyzing.")
+            return
+        if not ready:
+            st.error("⚠️ Please upload PDF resumes or a ZIP of PDFs to proceed.")
+            return
+
+        documents, read_warnings = collect_batch_files(uploaded_files)
+        for warning in read_warnings:
+            # Limit warnings were already shown above; only unreadable members are new
+            if warning not in warnings:
+                st.warning(warning)
+        if not documents:
+            return
+
+        progress = st.progress(0.0, text="Screening resumes...")
+        table = st.empty()
+        rows = []
+        for row in screen_resumes(job_desc, documents):
+            rows.append(row)
+            progress.progress(len(rows) / len(documents), text=f"Screened {len(rows)} of {len(documents)} resumes")
+            table.dataframe(rows, use_container_width=True)
+
+        # Final table sorted best-first; unscored resumes go last, ordered by local score
+        rows.sort(key=lambda row: (row["ATS Score"] if row["ATS Score"] is not None else -1, row["Local Score"] or 0), reverse=True)
+        st.session_state.batch_results = {'key': results_key, 'rows': rows}
+        table.dataframe(rows, use_container_width=True)
+    elif rows:
+        st.dataframe(rows, use_container_width=True)
+    else:
+        return
+
+    st.download_button(
+        label="⬇️ Download Results (CSV)",
+        data=results_to_csv(rows),
+        file_name="batch_screening_results.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
@@ -0,0 +1,386 @@
+"""
+Pipeline Benchmark
+==================
+
+Reproducible throughput/latency benchmark for the extraction -> prompt ->
+analysis pipeline and the auth path, with JSON output for comparing commits.
+
+- Extraction: extract_text_from_pdf over a synthetic corpus (see synthetic_pdf.py), pages/sec
+- Analysis: extraction + compaction + analyze_resume_with_gemini against the local
+  LLM backend with configurable latency, end-to-end p50/p95/p99
+- Auth: get_config (cold/warm), user lookup, bcrypt verify and sign-up at 10, 1k and 10k users
+- Memory: process RSS high-water mark after each phase
+
+No network access or API key is needed; caches and credentials live in a temp directory.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py                           # full run, JSON to stdout
+    python benchmarks/pipeline_benchmark.py --quick --output run.json
+    python benchmarks/pipeline_benchmark.py --compare baseline.json   # exit 1 on >20% regression
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = tempfile.mkdtemp(prefix="careerlens-bench-")
+
+# Isolate every cache/store from the developer's real ones and take the network out of the loop.
+# Set before the app modules are imported, since they read configuration at import time.
+os.environ.update({
+    "ANALYSIS_CACHE_PATH": os.path.join(WORK_DIR, "analysis_cache.sqlite3"),
+    "ANALYSIS_JOBS_PATH": os.path.join(WORK_DIR, "analysis_jobs.sqlite3"),
+    "CREDENTIALS_DB_PATH": os.path.join(WORK_DIR, "credentials.sqlite3"),
+    "LLM_BACKEND": "local",
+    "PROMPT_CACHE_BACKEND": "off",
+    "GEMINI_REQUESTS_PER_MINUTE": "1000000",
+    "GEMINI_BURST": "1000",
+})
+os.environ.pop("EXTRACTION_CACHE_DIR", None)
+os.environ.pop("METRICS_JSON_LOG", None)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from synthetic_pdf import LAYOUTS, make_job_description, make_resume_pdf
+
+DEFAULT_PAGE_COUNTS = (1, 2, 5, 10)
+DEFAULT_USER_COUNTS = (10, 1000, 10000)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def latency_summary(samples: list[float]) -> dict:
+    """p50/p95/p99/mean/max of latency samples, in seconds."""
+    return {
+        'count': len(samples),
+        'p50_seconds': round(percentile(samples, 0.50), 6),
+        'p95_seconds': round(percentile(samples, 0.95), 6),
+        'p99_seconds': round(percentile(samples, 0.99), 6),
+        'mean_seconds': round(statistics.fmean(samples), 6),
+        'max_seconds': round(max(samples), 6),
+    }
+
+
+def rss_high_water_mb() -> dict:
+    """Peak resident set size of this process and of its (reaped) worker processes."""
+    if resource is None:
+        return {'self_mb': None, 'children_mb': None}
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        'self_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
+
+
+def build_corpus(page_counts, layouts, copies: int) -> list[dict]:
+    """Generate `copies` distinct documents for every (page count, layout) pair."""
+    corpus = []
+    for pages in page_counts:
+        for layout in layouts:
+            for copy in range(copies):
+                corpus.append({
+                    'pages': pages,
+                    'layout': layout,
+                    # A distinct doc_id per copy defeats the content-addressed extraction cache
+                    'pdf': make_resume_pdf(pages, layout, seed=copy, doc_id=f"{pages}-{layout}-{copy}"),
+                })
+    return corpus
+
+
+def bench_extraction(corpus: list[dict]) -> dict:
+    """Time extract_text_from_pdf on each document (cache misses only)."""
+    from pdf_extractor import extract_text_from_pdf, get_extraction_engine
+
+    # Start the worker pool outside the timed region
+    extract_text_from_pdf(make_resume_pdf(12, "single", seed=999, doc_id="warmup"))
+
+    by_group = {}
+    total_pages, total_seconds, failures = 0, 0.0, 0
+    for doc in corpus:
+        started = time.perf_counter()
+        text, error = extract_text_from_pdf(doc['pdf'])
+        elapsed = time.perf_counter() - started
+        if error:
+            failures += 1
+        total_pages += doc['pages']
+        total_seconds += elapsed
+        by_group.setdefault(f"{doc['layout']}/{doc['pages']}p", []).append(elapsed)
+
+    groups = {}
+    for key, samples in sorted(by_group.items()):
+        pages = int(key.split("/")[1][:-1])
+        groups[key] = {
+            **latency_summary(samples),
+            'pages_per_second': round(pages * len(samples) / sum(samples), 2),
+        }
+    return {
+        'documents': len(corpus),
+        'failures': failures,
+        'pages': total_pages,
+        'pages_per_second': round(total_pages / total_seconds, 2) if total_seconds else None,
+        'workers': get_extraction_engine().max_workers,
+        'by_layout_and_pages': groups,
+        'memory': rss_high_water_mb(),
+    }
+
+
+def bench_analysis(requests: int, concurrency: int, latency: float, jitter: float, pages: int) -> dict:
+    """End-to-end extraction + compaction + model call per request against the local backend."""
+    import gemini_service
+    import llm_backend
+    from analysis_cache import get_analysis_cache
+    from model_router import get_model_router
+    from pdf_extractor import extract_text_from_pdf
+    from prompts import ATS_PROMPT
+
+    backend = llm_backend.LocalBackend(latency_seconds=latency, jitter_seconds=jitter, error_rate=0, replay_path="")
+    llm_backend._backend = backend
+    get_analysis_cache().clear()
+    job_desc = make_job_description()
+    documents = [
+        make_resume_pdf(pages, LAYOUTS[i % len(LAYOUTS)], seed=i, doc_id=f"e2e-{i}") for i in range(requests)
+    ]
+
+    def run(index: int) -> tuple[float, float, str | None]:
+        started = time.perf_counter()
+        text, error = extract_text_from_pdf(documents[index])
+        extracted = time.perf_counter()
+        if not error:
+            # The requisition line makes every request a result-cache miss
+            _, error = gemini_service.analyze_resume_with_gemini(
+                f"{job_desc}\nRequisition #{index}", text, ATS_PROMPT
+            )
+        return extracted - started, time.perf_counter() - started, error
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(run, range(requests)))
+    wall = time.perf_counter() - started
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'simulated_latency_seconds': latency,
+        'simulated_jitter_seconds': jitter,
+        'pages_per_resume': pages,
+        'errors': sum(1 for _, _, error in results if error),
+        'model_calls': backend.calls,
+        'avg_prompt_chars': round(backend.prompt_chars / backend.calls) if backend.calls else 0,
+        'routed': get_model_router().stats(),
+        'throughput_per_second': round(requests / wall, 2),
+        'extraction': latency_summary([extract for extract, _, _ in results]),
+        'end_to_end': latency_summary([total for _, total, _ in results]),
+        'memory': rss_high_water_mb(),
+    }
+
+
+def _write_credentials(path: str, user_count: int, probe_hash: str, filler_hash: str) -> None:
+    import yaml
+
+    usernames = {
+        f"user{i:05d}": {'name': f"User {i}", 'email': f"user{i:05d}@example.com", 'password': filler_hash}
+        for i in range(user_count)
+    }
+    usernames['probe'] = {'name': "Probe User", 'email': "probe@example.com", 'password': probe_hash}
+    config = {
+        'credentials': {'usernames': usernames},
+        'cookie': {'expiry_days': 30, 'key': 'benchmark', 'name': 'benchmark_auth'},
+        'preauthorized': {'emails': [record['email'] for record in usernames.values()]},
+    }
+    with open(path, 'w') as f:
+        yaml.dump(config, f, default_flow_style=False)
+
+
+def _time(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_auth(user_counts, repeat: int) -> dict:
+    """Config load, lookup, bcrypt verify and sign-up cost as the user table grows."""
+    import auth_config
+    from password_hasher import get_password_hasher
+
+    hasher = get_password_hasher()
+    probe_hash = hasher.hash("probe-password")
+    # Filler accounts are never verified, so a cheap hash keeps set-up fast
+    filler_hash = probe_hash
+
+    results = {'bcrypt_rounds': hasher.rounds, 'users': {}}
+    for user_count in user_counts:
+        path = os.path.join(WORK_DIR, f"config_{user_count}.yaml")
+        _write_credentials(path, user_count, probe_hash, filler_hash)
+
+        def fresh_store():
+            # Point the module at this file and drop the cached parse
+            auth_config.CREDENTIALS_FILE = path
+            auth_config._yaml_store = None
+            auth_config._credential_store = None
+            for suffix in (".journal", ".lock"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+        cold = []
+        for _ in range(max(1, repeat // 5)):
+            fresh_store()
+            cold += _time(auth_config.get_config, 1)
+        fresh_store()
+        auth_config.get_config()
+        warm = _time(auth_config.get_config, repeat * 10)
+        lookup = _time(lambda: auth_config.get_user("PROBE"), repeat * 10)
+        verify = _time(lambda: auth_config.verify_password("probe-password", probe_hash), repeat)
+        counter = itertools.count()
+
+        def sign_up():
+            number = next(counter)
+            auth_config.add_user(f"newuser{number}", "New User", f"new{number}@example.com", "Passw0rd!")
+
+        signup = _time(sign_up, max(1, repeat // 2))
+        results['users'][str(user_count)] = {
+            'config_bytes': os.path.getsize(path),
+            'get_config_cold': latency_summary(cold),
+            'get_config_warm': latency_summary(warm),
+            'user_lookup': latency_summary(lookup),
+            'bcrypt_verify': latency_summary(verify),
+            'sign_up': latency_summary(signup),
+        }
+    results['memory'] = rss_high_water_mb()
+    return results
+
+
+def git_commit() -> str | None:
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def flatten_metrics(report: dict, prefix: str = "") -> dict:
+    """Flatten the report to {dotted.path: value} for the comparable (timing/throughput/memory) leaves."""
+    flat = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and (
+            key.endswith("_seconds") or key.endswith("_per_second") or key.endswith("_mb")
+        ) and not key.startswith("simulated_"):
+            flat[path] = value
+    return flat
+
+
+def compare_reports(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """
+    List metrics that regressed by more than `tolerance` relative to the baseline.
+
+    Throughput (*_per_second) regresses when it drops; everything else when it grows.
+    """
+    regressions = []
+    old, new = flatten_metrics(baseline), flatten_metrics(current)
+    for path in sorted(old.keys() & new.keys()):
+        before, after = old[path], new[path]
+        if not before:
+            continue
+        change = (after - before) / before
+        worse = -change if path.endswith("_per_second") else change
+        if worse > tolerance:
+            regressions.append(f"{path}: {before:g} -> {after:g} ({change:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the extraction -> prompt -> analysis pipeline")
+    parser.add_argument("--quick", action="store_true", help="Smaller corpus and fewer repetitions")
+    parser.add_argument("--phases", default="extraction,analysis,auth", help="Comma-separated phases to run")
+    parser.add_argument("--copies", type=int, help="Documents per (page count, layout) pair")
+    parser.add_argument("--requests", type=int, help="End-to-end analysis requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent end-to-end requests")
+    parser.add_argument("--latency", type=float, default=0.5, help="Local backend base latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Local backend extra uniform latency (s)")
+    parser.add_argument("--users", default=",".join(map(str, DEFAULT_USER_COUNTS)), help="User counts for the auth phase")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON report; exit 1 if any metric regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression for --compare")
+    args = parser.parse_args()
+
+    phases = {phase.strip() for phase in args.phases.split(",") if phase.strip()}
+    copies = args.copies or (1 if args.quick else 3)
+    requests = args.requests or (12 if args.quick else 48)
+    repeat = 5 if args.quick else 20
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            'quick': args.quick,
+        },
+    }
+    if "extraction" in phases:
+        report['extraction'] = bench_extraction(build_corpus(DEFAULT_PAGE_COUNTS, LAYOUTS, copies))
+    if "analysis" in phases:
+        report['analysis'] = bench_analysis(requests, args.concurrency, args.latency, args.jitter, pages=2)
+    if "auth" in phases:
+        user_counts = [int(count) for count in args.users.split(",") if count.strip()]
+        report['auth'] = bench_auth(user_counts, repeat)
+
+    from metrics import stage_summary
+    report['stages'] = {
+        stage: {name: round(value, 6) if isinstance(value, float) else value for name, value in values.items()}
+        for stage, values in stage_summary().items()
+    }
+    report['memory'] = rss_high_water_mb()
+
+    from pdf_extractor import get_extraction_engine
+    get_extraction_engine().shutdown()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare_reports(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"❌ Regression: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✓ No regressions beyond {args.tolerance:.0%} against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
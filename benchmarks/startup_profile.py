@@ -0,0 +1,145 @@
+"""
+Startup Import Profile
+======================
+
+Measures the import cost app.py pays before the first page is rendered,
+using `python -X importtime`, and reports the slowest modules.
+
+Usage:
+    python benchmarks/startup_profile.py                  # profile app.py's top-level imports
+    python benchmarks/startup_profile.py --json           # machine-readable output
+    python benchmarks/startup_profile.py --budget-ms 800  # exit 1 if total import time exceeds the budget
+    python benchmarks/startup_profile.py --module gemini_service --module resume_ranker
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT_DIR, "app.py")
+
+
+def get_startup_modules(app_file: str = APP_FILE) -> list[str]:
+    """
+    List the modules app.py imports at module level (i.e. on every cold start).
+
+    Args:
+        app_file (str): Path to the Streamlit entry point
+
+    Returns:
+        list[str]: Module names in import order
+    """
+    with open(app_file, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=app_file)
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def run_importtime(modules: list[str]) -> list[dict]:
+    """
+    Import the modules in a fresh interpreter with -X importtime.
+
+    Args:
+        modules (list[str]): Modules to import
+
+    Returns:
+        list[dict]: One entry per imported module with self/cumulative microseconds and depth
+    """
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        # Show the actual import error rather than a partial profile
+        sys.stderr.write("\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:")))
+        raise SystemExit(result.returncode)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+        })
+    return entries
+
+
+def profile(modules: list[str], repeat: int = 3) -> dict:
+    """
+    Profile startup imports, taking the median over several fresh interpreters.
+
+    Args:
+        modules (list[str]): Modules to import
+        repeat (int): Number of interpreter runs
+
+    Returns:
+        dict: Total import time and per-module cumulative times (ms), slowest first
+    """
+    # Modules the bare interpreter loads (site, encodings, ...) are not the app's cost
+    interpreter_modules = {entry['module'] for entry in run_importtime([])}
+    runs = [run_importtime(modules) for _ in range(max(1, repeat))]
+
+    per_module = {}
+    totals = []
+    for entries in runs:
+        top_level = [entry for entry in entries if entry['depth'] == 0 and entry['module'] not in interpreter_modules]
+        totals.append(sum(entry['cumulative_us'] for entry in top_level) / 1000)
+        for entry in top_level:
+            per_module.setdefault(entry['module'], []).append(entry['cumulative_us'] / 1000)
+
+    report = sorted(
+        ({'module': name, 'cumulative_ms': round(statistics.median(times), 2)} for name, times in per_module.items()),
+        key=lambda item: item['cumulative_ms'], reverse=True,
+    )
+    return {
+        'python': sys.version.split()[0],
+        'modules': modules,
+        'repeat': len(runs),
+        'total_ms': round(statistics.median(totals), 2),
+        'imports': report,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report per-module import time for app start-up")
+    parser.add_argument("--module", action="append", help="Module to profile (default: app.py top-level imports)")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreter runs to take the median of")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules to list")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    parser.add_argument("--budget-ms", type=float, help="Fail if total import time exceeds this many ms")
+    args = parser.parse_args()
+
+    result = profile(args.module or get_startup_modules(), args.repeat)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Total start-up import time: {result['total_ms']:.1f} ms (median of {result['repeat']} runs)")
+        print(f"{'cumulative ms':>14}  module")
+        for item in result['imports'][:args.top]:
+            print(f"{item['cumulative_ms']:>14.1f}  {item['module']}")
+
+    if args.budget_ms is not None and result['total_ms'] > args.budget_ms:
+        print(f"❌ Import time {result['total_ms']:.1f} ms exceeds budget of {args.budget_ms:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Synthetic PDF Corpus
+====================
+
+Generates deterministic, text-based resume PDFs with a minimal PDF writer
+(no reportlab or other third-party dependency), so benchmark inputs are
+identical on every machine and commit.
+
+Layouts:
+    single      one column, 10.5pt, repeated header and "Page i of n" footer
+    two_column  skills/education/projects on the left, experience on the right
+    dense       one column, 8pt, more lines per page (stresses per-page extraction cost)
+"""
+
+import random
+import textwrap
+
+LAYOUTS = ("single", "two_column", "dense")
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+
+_SKILLS = (
+    "Python", "Django", "FastAPI", "Flask", "AWS", "GCP", "Azure", "Docker", "Kubernetes", "Terraform",
+    "PostgreSQL", "MySQL", "Redis", "Kafka", "Spark", "Airflow", "React", "TypeScript", "Node.js",
+    "GraphQL", "REST APIs", "CI/CD", "Git", "Linux", "Pandas", "NumPy", "scikit-learn", "PyTorch",
+    "TensorFlow", "Tableau", "Snowflake", "Jenkins", "Agile", "Scrum", "Microservices",
+)
+_VERBS = (
+    "Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Shipped", "Maintained",
+    "Refactored", "Launched", "Owned", "Improved", "Mentored", "Delivered",
+)
+_OBJECTS = (
+    "a payments service", "the data platform", "an internal analytics dashboard", "customer-facing APIs",
+    "the deployment pipeline", "a recommendation engine", "search indexing jobs", "billing reports",
+    "a real-time event stream", "the onboarding flow", "ETL workflows", "the monitoring stack",
+)
+_RESULTS = (
+    "cutting latency by {n}%", "serving {n}k requests per day", "reducing cloud spend by {n}%",
+    "improving conversion by {n}%", "supporting {n} engineering teams", "raising test coverage to {n}%",
+)
+_COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Systems", "Hooli")
+_SCHOOLS = ("State University", "Institute of Technology", "City College")
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def build_pdf(pages: list[list[tuple[float, float, float, str]]], title: str = "Resume") -> bytes:
+    """
+    Write a PDF whose pages contain the given text lines.
+
+    Args:
+        pages (list): One list per page of (x, y, font size, text) lines; y is from the bottom
+        title (str): Document title stored in the info dictionary
+
+    Returns:
+        bytes: Complete PDF file
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        f"<< /Title ({_escape(title)}) /Producer (CareerLens benchmark) >>".encode("latin-1"),
+    ]
+    page_refs = []
+    for lines in pages:
+        stream = "\n".join(
+            f"BT /F1 {size:g} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET" for x, y, size, text in lines
+        ).encode("latin-1", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>".encode("latin-1")
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_refs)} >>".encode("latin-1")
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def _bullet(rng: random.Random) -> str:
+    result = rng.choice(_RESULTS).format(n=rng.randint(10, 90))
+    return f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} using {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}, {result}"
+
+
+def _resume_blocks(rng: random.Random, page_count: int) -> dict[str, list[str]]:
+    # Roughly one job per page keeps the text volume proportional to the page count
+    experience = ["EXPERIENCE"]
+    for job in range(max(1, page_count)):
+        company = rng.choice(_COMPANIES)
+        experience.append(f"Senior Engineer, {company} ({2023 - 2 * job - 2} - {2023 - 2 * job})")
+        experience.extend(_bullet(rng) for _ in range(12))
+    return {
+        'summary': ["SUMMARY", f"Software engineer with {rng.randint(3, 15)} years of experience in "
+                    f"{rng.choice(_SKILLS)}, {rng.choice(_SKILLS)} and {rng.choice(_SKILLS)}."],
+        'skills': ["SKILLS"] + [", ".join(rng.sample(_SKILLS, 5)) for _ in range(4)],
+        'education': ["EDUCATION", f"B.S. Computer Science, {rng.choice(_SCHOOLS)} ({rng.randint(2005, 2018)})"],
+        'projects': ["PROJECTS"] + [_bullet(rng) for _ in range(3)],
+        'experience': experience,
+    }
+
+
+def _flow(lines: list[str], x: float, size: float, top: float, bottom: float, width: float) -> list[list[tuple]]:
+    """Lay lines out top to bottom, wrapped to the column width, starting a new page when the column is full."""
+    leading = size * 1.35
+    # Helvetica averages about half an em per character
+    max_chars = max(20, int(width / (size * 0.5)))
+    wrapped = [part for text in lines for part in (textwrap.wrap(text, max_chars, subsequent_indent="  ") or [""])]
+    pages, current, y = [], [], top
+    for text in wrapped:
+        if y < bottom:
+            pages.append(current)
+            current, y = [], top
+        current.append((x, y, size, text))
+        y -= leading
+    pages.append(current)
+    return pages
+
+
+def make_resume_pdf(page_count: int, layout: str = "single", seed: int = 0, doc_id: str = "") -> bytes:
+    """
+    Generate one synthetic resume PDF.
+
+    Args:
+        page_count (int): Number of pages
+        layout (str): One of LAYOUTS
+        seed (int): Seed for the deterministic text generator
+        doc_id (str): Stored in the title, so otherwise identical files hash differently
+
+    Returns:
+        bytes: PDF file contents
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+    rng = random.Random(f"{seed}-{page_count}-{layout}")
+    blocks = _resume_blocks(rng, page_count)
+    name = f"Candidate {seed:03d}"
+    top, bottom = PAGE_HEIGHT - MARGIN - 24, MARGIN + 24
+
+    if layout == "two_column":
+        left = blocks['skills'] + [""] + blocks['education'] + [""] + blocks['projects']
+        right = blocks['summary'] + [""] + blocks['experience']
+        gutter = PAGE_WIDTH / 2 - 20
+        left_pages = _flow(left, MARGIN, 9.5, top, bottom, gutter - MARGIN - 24)
+        right_pages = _flow(right, gutter, 9.5, top, bottom, PAGE_WIDTH - MARGIN - gutter)
+        body = [
+            (left_pages[i] if i < len(left_pages) else []) + (right_pages[i] if i < len(right_pages) else [])
+            for i in range(max(len(left_pages), len(right_pages)))
+        ]
+    else:
+        size = 8 if layout == "dense" else 10.5
+        lines = [name, f"{name.lower().replace(' ', '.')}@example.com | +1 555 0100 | linkedin.com/in/candidate"]
+        for section in ('summary', 'experience', 'skills', 'projects', 'education'):
+            lines += [""] + blocks[section]
+        body = _flow(lines, MARGIN, size, top, bottom, PAGE_WIDTH - 2 * MARGIN)
+
+    # Pad or cut to exactly page_count pages so pages/sec figures are exact
+    body = (body + [[(MARGIN, top, 10.5, "Additional information available on request.")]] * page_count)[:page_count]
+    pages = []
+    for number, lines in enumerate(body, start=1):
+        header = (MARGIN, PAGE_HEIGHT - MARGIN, 8, f"{name} - Resume")
+        footer = (PAGE_WIDTH / 2 - 20, MARGIN - 10, 8, f"Page {number} of {page_count}")
+        pages.append([header] + lines + [footer])
+    return build_pdf(pages, title=f"{name} {layout} {doc_id}".strip())
+
+
+def make_job_description(seed: int = 0) -> str:
+    """
+    Generate a deterministic job description matching the resume vocabulary.
+
+    Args:
+        seed (int): Seed for the deterministic text generator
+
+    Returns:
+        str: Job description text
+    """
+    rng = random.Random(f"job-{seed}")
+    must = rng.sample(_SKILLS, 8)
+    nice = rng.sample(_SKILLS, 5)
+    return "\n".join([
+        "Senior Backend Engineer",
+        "We are looking for an engineer to design and scale our core platform services.",
+        "Requirements:",
+        *[f"- {rng.randint(3, 7)}+ years with {skill}" for skill in must],
+        "Nice to have:",
+        *[f"- Experience with {skill}" for skill in nice],
+    ])
@@ -0,0 +1,600 @@
+"""
+Credential Store Module
+Indexed, cached access to user credentials (YAML file or SQLite backend)
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Journaled sign-ups are folded into the YAML file once this many accumulate
+JOURNAL_COMPACT_THRESHOLD = int(os.getenv("CREDENTIALS_JOURNAL_COMPACT_AT", "200"))
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """
+    Hold an exclusive cross-process lock on lock_path for the duration of the block.
+
+    Args:
+        lock_path (str): Path of the lock file (created if missing)
+    """
+    with open(lock_path, 'a+') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class CredentialConflictError(Exception):
+    """The config file was rewritten after the snapshot being saved was taken."""
+
+
+def _apply_new_user(config: dict, username: str, record: dict) -> None:
+    config.setdefault('credentials', {}).setdefault('usernames', {})[username] = record
+
+    # Automatically add user to preauthorized list
+    emails = config.setdefault('preauthorized', {}).setdefault('emails', [])
+    if record.get('email') and record['email'] not in emails:
+        emails.append(record['email'])
+
+
+class YamlCredentialStore:
+    """
+    Keeps the parsed YAML config in memory with a case-folded username index.
+
+    - The file is re-parsed only when it (or the journal) changes on disk,
+      so repeated lookups cost a stat() instead of a full YAML load
+    - Writes hold a cross-process file lock and replace the file atomically,
+      so readers never observe a truncated config
+    - Sign-ups are appended to a journal instead of rewriting the whole file;
+      the journal is compacted into the YAML file periodically
+    - Callers get deep copies; a snapshot's version lets save() merge sign-ups
+      journaled after it and reject it if the file was rewritten since
+    """
+
+    def __init__(self, path: str, default_factory):
+        """
+        Args:
+            path (str): Path to the YAML credentials file
+            default_factory: Callable returning the default config dict
+        """
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.lock_path = path + ".lock"
+        self.default_factory = default_factory
+        self._config = None
+        self._index = {}
+        self._signature = None
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._lock = threading.RLock()
+        self._file_lock_depth = 0
+
+    @contextmanager
+    def _locked(self):
+        # Thread lock plus re-entrant use of the cross-process file lock
+        with self._lock:
+            if self._file_lock_depth:
+                self._file_lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._file_lock_depth -= 1
+                return
+            with file_lock(self.lock_path):
+                self._file_lock_depth = 1
+                try:
+                    yield
+                finally:
+                    self._file_lock_depth = 0
+
+    @staticmethod
+    def _stat(path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _file_signature(self):
+        config_stat = self._stat(self.path)
+        if config_stat is None:
+            return None
+        return config_stat, self._stat(self.journal_path)
+
+    def _rebuild_index(self) -> None:
+        usernames = self._config.get('credentials', {}).get('usernames', {}) or {}
+        self._index = {username.casefold(): username for username in usernames}
+
+    def _read_journal(self, offset: int = 0) -> tuple[list[dict], int]:
+        """Read complete journal lines from offset; returns (entries, end offset)."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return [], offset
+
+        entries = []
+        consumed = 0
+        for line in data.splitlines(keepends=True):
+            # A line without a newline is a write still in progress
+            if not line.endswith(b"\n"):
+                break
+            consumed += len(line)
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+        return entries, offset + consumed
+
+    def _write_atomic(self, config: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".yaml", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                yaml.dump(config, f, default_flow_style=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _parse_config_file(self) -> dict | None:
+        try:
+            with open(self.path, 'r') as f:
+                return yaml.safe_load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading config: {e}. Creating new config.")
+            return None
+
+    def invalidate(self) -> None:
+        """Force the next access to re-read the file."""
+        with self._lock:
+            self._signature = None
+
+    def _load(self) -> dict:
+        # Shared cached config; never handed to callers
+        with self._lock:
+            signature = self._file_signature()
+            if self._config is not None and signature is not None and signature == self._signature:
+                return self._config
+
+            config = self._parse_config_file() if signature is not None else None
+
+            if not config:
+                with self._locked():
+                    # Another process may have written the file while we waited for the lock
+                    signature = self._file_signature()
+                    config = self._parse_config_file() if signature is not None else None
+                    if not config:
+                        # Create and save default config if file doesn't exist, keeping any journaled users
+                        self.save(self.default_factory(), (signature and signature[0], 0))
+                        return self._config
+
+            entries, offset = self._read_journal()
+            for entry in entries:
+                _apply_new_user(config, entry['username'], entry['record'])
+
+            self._config = config
+            self._signature = signature
+            self._journal_offset = offset
+            self._journal_entries = len(entries)
+            self._rebuild_index()
+            return self._config
+
+    def _version(self) -> tuple:
+        # Caller must hold the lock, right after _load()
+        return self._signature[0], self._journal_offset
+
+    def load(self) -> dict:
+        """
+        Get the current config, re-parsing the file only if it changed.
+
+        Returns:
+            dict: Private deep copy of the configuration; persist changes with
+                  save() (ideally with a version from snapshot()) or transaction()
+        """
+        return self.snapshot()[0]
+
+    def snapshot(self) -> tuple[dict, tuple]:
+        """
+        Get a private copy of the config together with the version it was read at.
+
+        Returns:
+            tuple: (deep copy of the configuration, version to pass to save())
+        """
+        with self._lock:
+            config = self._load()
+            return copy.deepcopy(config), self._version()
+
+    def save(self, config: dict, version: tuple | None = None) -> None:
+        """
+        Atomically write the full config to disk and refresh the in-memory copy.
+
+        Sign-ups journaled since the snapshot was taken are merged in first, so
+        a full rewrite never drops them. Without a version, config is written
+        as given: users it leaves out stay deleted, including journaled ones.
+
+        Args:
+            config (dict): Configuration dictionary to save
+            version (tuple | None): Version from snapshot() that config was based on
+
+        Raises:
+            CredentialConflictError: If the file was rewritten after the snapshot
+        """
+        with self._locked():
+            if version is not None and version[0] != self._stat(self.path):
+                # A compaction or another full save happened; its changes cannot be told apart from deletions
+                raise CredentialConflictError("Credentials changed since they were read; reload and try again.")
+
+            entries, _ = self._read_journal(version[1]) if version is not None else ([], 0)
+            config = copy.deepcopy(config)
+            usernames = config.get('credentials', {}).get('usernames', {}) or {}
+            present = {username.casefold() for username in usernames}
+            for entry in entries:
+                if entry['username'].casefold() not in present:
+                    _apply_new_user(config, entry['username'], entry['record'])
+                    present.add(entry['username'].casefold())
+
+            self._write_atomic(config)
+            # Everything in the journal is now part of the YAML file
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+
+            self._config = config
+            self._signature = self._file_signature()
+            self._journal_offset = 0
+            self._journal_entries = 0
+            self._rebuild_index()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Read-modify-write the config under the cross-process lock.
+
+        Yields a fresh private copy of the config; it is saved atomically when
+        the block exits without an exception.
+        """
+        with self._locked():
+            self.invalidate()
+            config, version = self.snapshot()
+            yield config
+            self.save(config, version)
+
+    def get_user(self, username: str) -> tuple[str, dict] | None:
+        """
+        Case-insensitive user lookup.
+
+        Args:
+            username (str): Username as typed by the user
+
+        Returns:
+            tuple | None: (stored username, user record) or None if not found
+        """
+        with self._lock:
+            config = self._load()
+            stored = self._index.get((username or "").casefold())
+            if stored is None:
+                return None
+            return stored, dict(config['credentials']['usernames'][stored])
+
+    def user_exists(self, username: str) -> bool:
+        """Check whether a username is taken (case-insensitive)."""
+        return self.get_user(username) is not None
+
+    def add_user(self, username: str, record: dict) -> bool:
+        """
+        Add a user unless the (case-folded) username already exists.
+
+        The user is appended to the journal as one line instead of rewriting
+        the YAML file.
+
+        Args:
+            username (str): New username
+            record (dict): User record with name, email and hashed password
+
+        Returns:
+            bool: True if added, False if the username was taken
+        """
+        with self._locked():
+            config = self._load()
+            if username.casefold() in self._index:
+                return False
+
+            line = json.dumps({'username': username, 'record': record}) + "\n"
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+            _apply_new_user(config, username, record)
+            self._index[username.casefold()] = username
+            self._signature = self._file_signature()
+            self._journal_offset += len(line.encode('utf-8'))
+            self._journal_entries += 1
+
+            if self._journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+                self.save(config, self._version())
+            return True
+
+    def update_password(self, username: str, hashed: str) -> bool:
+        """
+        Replace a user's stored password hash.
+
+        Args:
+            username (str): Stored username
+            hashed (str): New bcrypt hash
+
+        Returns:
+            bool: True if the user exists and was updated
+        """
+        with self._locked():
+            # Look up first: returning inside transaction() would still rewrite the file
+            found = self.get_user(username)
+            if found is None or found[0] != username:
+                return False
+            with self.transaction() as config:
+                config['credentials']['usernames'][username]['password'] = hashed
+            return True
+
+    def remove_user(self, username: str) -> bool:
+        """
+        Delete a user (case-insensitive); their email stays preauthorized.
+
+        Args:
+            username (str): Username to remove
+
+        Returns:
+            bool: True if the user existed and was removed
+        """
+        with self._locked():
+            found = self.get_user(username)
+            if found is None:
+                return False
+            with self.transaction() as config:
+                del config['credentials']['usernames'][found[0]]
+            return True
+
+    def replace_users(self, usernames: dict, emails: list[str]) -> None:
+        """
+        Replace every user and the preauthorized email list (e.g. a reset to defaults).
+
+        Args:
+            usernames (dict): Stored username -> user record
+            emails (list[str]): Preauthorized emails
+        """
+        with self.transaction() as config:
+            config['credentials'] = {'usernames': {name: dict(record) for name, record in usernames.items()}}
+            config['preauthorized'] = {'emails': list(emails)}
+
+    def list_users(self) -> dict:
+        """
+        Get every user.
+
+        Returns:
+            dict: Stored username -> user record (copies)
+        """
+        with self._lock:
+            usernames = self._load().get('credentials', {}).get('usernames', {}) or {}
+            return {name: dict(record) for name, record in usernames.items()}
+
+    def preauthorized_emails(self) -> list[str]:
+        """
+        Get the preauthorized email list (sign-ups add their email to it).
+
+        Returns:
+            list[str]: Emails in insertion order
+        """
+        with self._lock:
+            return list((self._load().get('preauthorized') or {}).get('emails') or [])
+
+
+class SqliteCredentialStore:
+    """
+    SQLite-backed user table with an indexed, case-folded username key.
+
+    Lookups are single indexed reads and sign-ups are single-row inserts,
+    independent of the number of accounts.
+
+    The database is the only source of truth for users and preauthorized
+    emails: the YAML file is imported once, into an empty database, and is
+    not consulted (or kept in sync) afterwards.
+    """
+
+    def __init__(self, path: str, seed_loader=None):
+        """
+        Args:
+            path (str): SQLite database path
+            seed_loader: Optional callable returning a config dict whose users
+                and preauthorized emails are imported into an empty database
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    username_key TEXT PRIMARY KEY,
+                    username TEXT NOT NULL,
+                    name TEXT,
+                    email TEXT,
+                    password TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS preauthorized (email_key TEXT PRIMARY KEY, email TEXT NOT NULL)"
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM users").fetchone()
+            self._conn.commit()
+
+        if count == 0 and seed_loader is not None:
+            config = seed_loader()
+            self.replace_users(
+                config.get('credentials', {}).get('usernames', {}) or {},
+                (config.get('preauthorized') or {}).get('emails') or [],
+            )
+
+    def _insert_user(self, username: str, record: dict) -> bool:
+        # Caller must hold the lock and commit
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO users (username_key, username, name, email, password) VALUES (?, ?, ?, ?, ?)",
+            (username.casefold(), username, record.get('name'), record.get('email'), record.get('password', '')),
+        )
+        return cursor.rowcount == 1
+
+    def _preauthorize(self, email: str | None) -> None:
+        # Caller must hold the lock and commit
+        if email:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO preauthorized (email_key, email) VALUES (?, ?)", (email.casefold(), email)
+            )
+
+    def get_user(self, username: str) -> tuple[str, dict] | None:
+        """
+        Case-insensitive user lookup.
+
+        Args:
+            username (str): Username as typed by the user
+
+        Returns:
+            tuple | None: (stored username, user record) or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT username, name, email, password FROM users WHERE username_key = ?",
+                ((username or "").casefold(),),
+            ).fetchone()
+        if row is None:
+            return None
+        stored, name, email, password = row
+        return stored, {'name': name, 'email': email, 'password': password}
+
+    def user_exists(self, username: str) -> bool:
+        """Check whether a username is taken (case-insensitive)."""
+        return self.get_user(username) is not None
+
+    def add_user(self, username: str, record: dict) -> bool:
+        """
+        Insert one user row unless the (case-folded) username already exists.
+
+        As with the YAML store, the new user's email is added to the
+        preauthorized list.
+
+        Args:
+            username (str): New username
+            record (dict): User record with name, email and hashed password
+
+        Returns:
+            bool: True if added, False if the username was taken
+        """
+        with self._lock:
+            added = self._insert_user(username, record)
+            if added:
+                self._preauthorize(record.get('email'))
+            self._conn.commit()
+            return added
+
+    def update_password(self, username: str, hashed: str) -> bool:
+        """
+        Replace a user's stored password hash.
+
+        Args:
+            username (str): Stored username
+            hashed (str): New bcrypt hash
+
+        Returns:
+            bool: True if the user exists and was updated
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE users SET password = ? WHERE username_key = ?", (hashed, username.casefold())
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def remove_user(self, username: str) -> bool:
+        """
+        Delete a user (case-insensitive); their email stays preauthorized.
+
+        Args:
+            username (str): Username to remove
+
+        Returns:
+            bool: True if the user existed and was removed
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM users WHERE username_key = ?", ((username or "").casefold(),))
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def replace_users(self, usernames: dict, emails: list[str]) -> None:
+        """
+        Replace every user and the preauthorized email list in one transaction.
+
+        Args:
+            usernames (dict): Stored username -> user record
+            emails (list[str]): Preauthorized emails
+        """
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM users")
+                self._conn.execute("DELETE FROM preauthorized")
+                for username, record in usernames.items():
+                    self._insert_user(username, record)
+                for email in emails:
+                    self._preauthorize(email)
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+    def list_users(self) -> dict:
+        """
+        Get every user.
+
+        Returns:
+            dict: Stored username -> user record
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT username, name, email, password FROM users ORDER BY rowid").fetchall()
+        return {username: {'name': name, 'email': email, 'password': password} for username, name, email, password in rows}
+
+    def preauthorized_emails(self) -> list[str]:
+        """
+        Get the preauthorized email list (sign-ups add their email to it).
+
+        Returns:
+            list[str]: Emails in insertion order
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT email FROM preauthorized ORDER BY rowid").fetchall()
+        return [email for (email,) in rows]
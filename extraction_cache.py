@@ -0,0 +1,155 @@
+"""
+Extraction Cache Module
+Caches parsed PDF text by the SHA-256 of the uploaded file bytes
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+# In-process tier size (entries and memory budget) and optional on-disk tier location
+DEFAULT_MAX_ITEMS = int(os.getenv("EXTRACTION_CACHE_MAX_ITEMS", "128"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "32")) * 1024 * 1024)
+DEFAULT_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR") or None
+
+
+def hash_pdf_bytes(pdf_bytes: bytes) -> str:
+    """
+    Compute the content hash used as the extraction cache key.
+
+    Args:
+        pdf_bytes (bytes): Raw bytes of the uploaded PDF
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for extract_text_from_pdf results:
+    - In-process LRU tier (always on), bounded by entry count and bytes
+    - Optional on-disk tier shared across processes/restarts
+    """
+
+    def __init__(self, max_items: int = DEFAULT_MAX_ITEMS, cache_dir: str | None = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """Create the cache; the disk tier is enabled only when cache_dir is set."""
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # key -> ((text, error), size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _remember(self, key: str, result: tuple) -> None:
+        # Caller must hold the lock
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous[1]
+        size = sum(sys.getsizeof(part) for part in result if part is not None)
+        self._items[key] = (result, size)
+        self._bytes += size
+        # Keep the newest entry even if it alone exceeds the budget
+        while len(self._items) > 1 and (len(self._items) > self.max_items or self._bytes > self.max_bytes):
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self._bytes -= evicted_size
+
+    def get(self, key: str) -> tuple[str | None, str | None] | None:
+        """
+        Look up a previous extraction result.
+
+        Args:
+            key (str): Hash produced by hash_pdf_bytes
+
+        Returns:
+            tuple | None: (text, error) as returned by extract_text_from_pdf, or None on a miss
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                result = (data.get('text'), data.get('error'))
+                with self._lock:
+                    self._remember(key, result)
+                    self.hits += 1
+                return result
+            except (OSError, ValueError):
+                pass
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, result: tuple[str | None, str | None]) -> None:
+        """
+        Store an extraction result in every enabled tier.
+
+        Args:
+            key (str): Hash produced by hash_pdf_bytes
+            result (tuple): (text, error) pair from extract_text_from_pdf
+        """
+        with self._lock:
+            self._remember(key, result)
+
+        if self.cache_dir:
+            text, error = result
+            tmp_path = None
+            try:
+                # A unique temp name per writer, so concurrent sets of one key never share a file
+                fd, tmp_path = tempfile.mkstemp(prefix=f".{key}-", suffix=".tmp", dir=self.cache_dir)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'text': text, 'error': error}, f)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError as e:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                print(f"⚠️ Could not write extraction cache entry: {e}")
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hit/miss counters, in-memory entry count and bytes held
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._items), 'bytes': self._bytes}
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """
+    Get the process-wide extraction cache, creating it on first use.
+
+    Returns:
+        ExtractionCache: Shared cache instance
+    """
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = ExtractionCache()
+    return _cache_instance
@@ -0,0 +1,457 @@
+"""
+Gemini Service Module
+Sends resume analyses to the routed model, with result/prefix caching and streaming support
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from analysis_cache import get_analysis_cache, make_cache_key
+from analysis_schema import STRUCTURED_ANALYSES, parse_analysis
+from llm_backend import LLM_RECORD_PATH, describe_llm_error, get_llm_backend, load_generation_config, record_response
+from metrics import observe_stage, record_cache, record_model_fallback, record_retry, record_tokens, span
+from model_router import GEMINI_MODEL_NAME, get_model_router
+from prompt_cache import PROMPT_CACHE_BACKEND, GeminiPrefixCache, LocalPrefixCache
+from prompts import build_full_prompt, build_resume_part
+from rate_limiter import call_with_retry, get_gemini_limiter, get_status_code
+from resume_compactor import CHARS_PER_TOKEN, compact_resume, estimate_tokens, get_compaction_stats
+from single_flight import FlightAbandoned, SingleFlight
+
+# Shared pool for running several analyses at once (calls are network-bound)
+_analysis_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GEMINI_CONCURRENT_REQUESTS", "4")),
+    thread_name_prefix="gemini-analysis",
+)
+
+
+_lock = threading.Lock()
+_prefix_cache = None
+# Concurrent identical analyses share one model call
+_inflight = SingleFlight("analysis")
+
+
+def configure_gemini(api_key: str | None) -> None:
+    """
+    Configure the LLM backend once per process.
+
+    Streamlit calls this on every rerun; only a changed key reconfigures the
+    SDK (and drops models bound to the old client). The local backend needs no key.
+
+    Args:
+        api_key (str | None): Google API key
+    """
+    if get_llm_backend().configure(api_key) and _prefix_cache is not None:
+        # Cached prefixes belong to the old key's project
+        _prefix_cache.clear()
+
+
+def get_generative_model(model_name: str | None = None):
+    """
+    Get the shared model handle for a model name from the active backend.
+
+    Args:
+        model_name (str | None): Model name; defaults to GEMINI_MODEL_NAME
+
+    Returns:
+        Model with a generate_content(contents, **kwargs) method
+    """
+    return get_llm_backend().get_model(model_name or GEMINI_MODEL_NAME)
+
+
+def get_prefix_cache():
+    """
+    Get the process-wide prompt prefix cache selected by PROMPT_CACHE_BACKEND.
+
+    Backends without server-side cached content get the local stand-in.
+
+    Returns:
+        GeminiPrefixCache | LocalPrefixCache | None: Shared cache, or None when disabled
+    """
+    global _prefix_cache
+    if _prefix_cache is None and PROMPT_CACHE_BACKEND in ("gemini", "local"):
+        with _lock:
+            if _prefix_cache is None:
+                if PROMPT_CACHE_BACKEND == "gemini" and get_llm_backend().supports_cached_content:
+                    _prefix_cache = GeminiPrefixCache(generation_config=load_generation_config() or None)
+                else:
+                    _prefix_cache = LocalPrefixCache()
+    return _prefix_cache
+
+
+def get_inflight_analyses() -> SingleFlight:
+    """
+    Get the coalescer shared by every session's analysis requests.
+
+    Returns:
+        SingleFlight: Shared instance (see stats() for coalesced requests)
+    """
+    return _inflight
+
+
+def route_request(prompt_text: str, job_desc: str, compaction: dict, kind: str | None = None) -> tuple[str, str]:
+    """
+    Pick the model tier for one analysis from its type and prompt size.
+
+    Args:
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+        compaction (dict): Result of compact_resume for the resume being sent
+        kind (str | None): "ats", "hr" or "screening"; inferred from the prompt when None
+
+    Returns:
+        tuple[str, str]: (tier, model name)
+    """
+    prompt_tokens = estimate_tokens(prompt_text) + estimate_tokens(job_desc) + compaction['tokens']
+    return get_model_router().route(prompt_text, prompt_tokens, kind)
+
+
+def _generate_with_model(model_name: str, prompt_text: str, job_desc: str, resume_text: str, **kwargs):
+    base_model = get_generative_model(model_name)
+    limiter = get_gemini_limiter()
+    prefix_cache = get_prefix_cache()
+    prefixed_model = (
+        prefix_cache.get_model(model_name, base_model, prompt_text, job_desc)
+        if prefix_cache is not None else None
+    )
+
+    if prefixed_model is not None:
+        resume_part = build_resume_part(resume_text)
+        try:
+            return call_with_retry(
+                lambda: prefixed_model.generate_content(resume_part, **kwargs), limiter, on_retry=record_retry
+            )
+        except Exception as error:
+            if get_status_code(error) not in (403, 404):
+                raise
+            # The cached prefix expired or was deleted server-side; send the full prompt instead
+            prefix_cache.invalidate(model_name, prompt_text, job_desc)
+
+    full_prompt = build_full_prompt(prompt_text, job_desc, resume_text)
+    return call_with_retry(lambda: base_model.generate_content(full_prompt, **kwargs), limiter, on_retry=record_retry)
+
+
+def generate_analysis(prompt_text: str, job_desc: str, resume_text: str, model_name: str | None = None, **kwargs):
+    """
+    Send one analysis request, reusing a cached prompt prefix when available.
+
+    With a cached prefix only the resume part is sent; otherwise the full
+    prompt is. Retries and rate limiting apply either way. A routed model
+    the project cannot use (404) falls back to GEMINI_MODEL_NAME.
+
+    Args:
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+        resume_text (str): Resume text to send
+        model_name (str | None): Model chosen by the router; defaults to GEMINI_MODEL_NAME
+        **kwargs: Passed to generate_content (e.g. stream=True)
+
+    Returns:
+        Backend response (GenerateContentResponse for Gemini)
+    """
+    model_name = model_name or GEMINI_MODEL_NAME
+    try:
+        return _generate_with_model(model_name, prompt_text, job_desc, resume_text, **kwargs)
+    except Exception as error:
+        if model_name == GEMINI_MODEL_NAME or get_status_code(error) != 404:
+            raise
+        record_model_fallback(model_name, GEMINI_MODEL_NAME)
+        return _generate_with_model(GEMINI_MODEL_NAME, prompt_text, job_desc, resume_text, **kwargs)
+
+
+def _record_output(prompt_text: str, job_desc: str, resume_text: str, model_name: str, output: str) -> None:
+    """Save a response for the local backend's replay when LLM_RECORD_PATH is set."""
+    if LLM_RECORD_PATH:
+        record_response(build_full_prompt(prompt_text, job_desc, resume_text), model_name, output)
+
+
+def _record_usage(stage, response, prompt_chars: int, response_text: str) -> None:
+    """Attach prompt/response sizes to a span, preferring Gemini's own token counts."""
+    usage = getattr(response, 'usage_metadata', None)
+    prompt_tokens = getattr(usage, 'prompt_token_count', None) or math.ceil(prompt_chars / CHARS_PER_TOKEN)
+    response_tokens = getattr(usage, 'candidates_token_count', None) or estimate_tokens(response_text)
+    record_tokens(prompt_tokens, response_tokens)
+    stage.set(
+        prompt_chars=prompt_chars, prompt_tokens=prompt_tokens,
+        response_chars=len(response_text), response_tokens=response_tokens,
+        cached_tokens=getattr(usage, 'cached_content_token_count', None) or 0,
+    )
+
+
+def _request_text(prompt_text: str, job_desc: str, compaction: dict, tier: str, model_name: str,
+                  cache_key: str) -> tuple[str | None, str | None]:
+    with span("gemini_request", mode="text", backend=get_llm_backend().name, model=model_name, tier=tier) as stage:
+        try:
+            get_compaction_stats().record(compaction)
+            get_model_router().record(tier)
+            # Shared limiter paces all sessions; 429/5xx are retried with backoff
+            response = generate_analysis(prompt_text, job_desc, compaction['text'], model_name)
+            output = response.text
+        except Exception as error:
+            stage.fail(error)
+            return None, describe_llm_error(error, model_name)
+        _record_usage(stage, response, len(prompt_text) + len(job_desc) + len(compaction['text']), output)
+
+    get_analysis_cache().set(cache_key, output)
+    _record_output(prompt_text, job_desc, compaction['text'], model_name, output)
+    return output, None
+
+
+def _request_structured(prompt_text: str, job_desc: str, compaction: dict, tier: str, model_name: str,
+                        cache_key: str, kind: str):
+    schema, _ = STRUCTURED_ANALYSES[kind]
+    with span("gemini_request", mode="structured", backend=get_llm_backend().name, model=model_name, tier=tier) as stage:
+        try:
+            get_compaction_stats().record(compaction)
+            get_model_router().record(tier)
+            response = generate_analysis(
+                prompt_text, job_desc, compaction['text'], model_name,
+                generation_config={'response_mime_type': "application/json", 'response_schema': schema},
+            )
+            output = response.text
+        except Exception as error:
+            stage.fail(error)
+            return None, describe_llm_error(error, model_name)
+        _record_usage(stage, response, len(prompt_text) + len(job_desc) + len(compaction['text']), output)
+
+        result, error = parse_analysis(kind, output)
+        if error:
+            stage.error_class = "invalid_schema"
+
+    # Only responses that pass validation are cached
+    if result is not None:
+        get_analysis_cache().set(cache_key, output)
+        _record_output(prompt_text, job_desc, compaction['text'], model_name, output)
+    return result, error
+
+
+def analyze_resume_with_gemini(job_desc: str, resume_text: str, prompt_text: str,
+                               kind: str | None = None) -> tuple[str | None, str | None]:
+    """
+    Send inputs to the routed model and wait for the complete response.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        prompt_text (str): HR/ATS instruction prompt
+        kind (str | None): "ats" or "hr" for routing; inferred from the prompt when None
+
+    Returns:
+        tuple: (analysis text, None) on success or (None, error message)
+    """
+    # Only the job-relevant sections of the resume that fit the token budget are sent
+    compaction = compact_resume(resume_text, job_desc)
+    tier, model_name = route_request(prompt_text, job_desc, compaction, kind)
+
+    # Identical (model, prompt, job, resume) requests are served from the result cache
+    cache = get_analysis_cache()
+    cache_key = make_cache_key(model_name, prompt_text, job_desc, compaction['text'])
+    cached_output = cache.get(cache_key)
+    record_cache("analysis", cached_output is not None)
+    if cached_output is not None:
+        return cached_output, None
+
+    # Identical requests already in flight (double clicks, other sessions) share that call
+    return _inflight.do(cache_key, lambda: _request_text(prompt_text, job_desc, compaction, tier, model_name, cache_key))
+
+
+def analyze_resume_structured(job_desc: str, resume_text: str, prompt_text: str, kind: str):
+    """
+    Request a JSON analysis constrained to a schema and parse it into a typed result.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        prompt_text (str): Structured instruction prompt (e.g. ATS_JSON_PROMPT)
+        kind (str): Key of analysis_schema.STRUCTURED_ANALYSES ("ats", "hr" or "screening")
+
+    Returns:
+        tuple: (AtsAnalysis | HrAnalysis | ScreeningResult, None) or (None, error message)
+    """
+    compaction = compact_resume(resume_text, job_desc)
+    tier, model_name = route_request(prompt_text, job_desc, compaction, kind)
+
+    # The raw JSON is cached; it is re-validated on the way out
+    cache = get_analysis_cache()
+    cache_key = make_cache_key(model_name, prompt_text, job_desc, compaction['text'])
+    cached_output = cache.get(cache_key)
+    record_cache("analysis", cached_output is not None)
+    if cached_output is not None:
+        result, error = parse_analysis(kind, cached_output)
+        if result is not None:
+            return result, None
+
+    # Structured and free-form calls never share a flight, even for the same prompt
+    return _inflight.do(
+        f"structured:{cache_key}",
+        lambda: _request_structured(prompt_text, job_desc, compaction, tier, model_name, cache_key, kind),
+    )
+
+
+class AnalysisStream:
+    """
+    Iterable over the text chunks of one analysis as Gemini emits them.
+
+    After iteration finishes, `text` holds the assembled response and
+    `error` holds a user-facing message if the request failed. `compaction`
+    describes the resume text that was sent (see compact_resume), and
+    `tier`/`model_name` the model the router picked. `coalesced` is True when
+    an identical request was already in flight and its result was reused.
+    """
+
+    def __init__(self, job_desc: str, resume_text: str, prompt_text: str, kind: str | None = None):
+        """Prepare and route the request; nothing is sent until iteration starts."""
+        self.job_desc = job_desc
+        self.resume_text = resume_text
+        self.prompt_text = prompt_text
+        self.compaction = compact_resume(resume_text, job_desc)
+        self.tier, self.model_name = route_request(prompt_text, job_desc, self.compaction, kind)
+        self.text = ""
+        self.error = None
+        self.from_cache = False
+        self.coalesced = False
+
+    def __iter__(self):
+        cache = get_analysis_cache()
+        cache_key = make_cache_key(self.model_name, self.prompt_text, self.job_desc, self.compaction['text'])
+        cached_output = cache.get(cache_key)
+        record_cache("analysis", cached_output is not None)
+        if cached_output is not None:
+            self.text = cached_output
+            self.from_cache = True
+            yield cached_output
+            return
+
+        # A duplicate of a request already in flight waits for it and shows the whole result at once
+        future, leader = _inflight.begin(cache_key)
+        while not leader:
+            try:
+                text, self.error = future.result()
+            except FlightAbandoned:
+                # The leading stream was dropped; retry, possibly as the new leader
+                future, leader = _inflight.begin(cache_key)
+                continue
+            self.text = text or ""
+            self.coalesced = True
+            if self.text:
+                yield self.text
+            return
+
+        completed = False
+        try:
+            yield from self._stream(cache, cache_key)
+            completed = True
+        finally:
+            # Waiters get the full text or the error; if the reader stopped early they retry
+            if self.error:
+                _inflight.finish(cache_key, future, (None, self.error))
+            elif completed:
+                _inflight.finish(cache_key, future, (self.text, None))
+            else:
+                _inflight.abandon(cache_key, future)
+
+    def _stream(self, cache, cache_key: str):
+        chunks = []
+        with span("gemini_request", mode="stream", backend=get_llm_backend().name,
+                  model=self.model_name, tier=self.tier) as stage:
+            try:
+                get_compaction_stats().record(self.compaction)
+                get_model_router().record(self.tier)
+                # Retries only cover opening the stream; a failure mid-stream is reported as-is
+                response = generate_analysis(
+                    self.prompt_text, self.job_desc, self.compaction['text'], self.model_name, stream=True
+                )
+                for chunk in response:
+                    chunk_text = chunk.text
+                    if chunk_text:
+                        if not chunks:
+                            # Time to first token is what the user perceives as latency
+                            observe_stage("gemini_first_chunk", time.perf_counter() - stage.started)
+                        chunks.append(chunk_text)
+                        yield chunk_text
+            except Exception as error:
+                stage.fail(error)
+                self.error = describe_llm_error(error, self.model_name)
+                self.text = "".join(chunks)
+                return
+
+            self.text = "".join(chunks)
+            prompt_chars = len(self.prompt_text) + len(self.job_desc) + len(self.compaction['text'])
+            _record_usage(stage, response, prompt_chars, self.text)
+
+        # Only complete responses are cached; a partial stream must not be replayed
+        if self.text:
+            cache.set(cache_key, self.text)
+            _record_output(self.prompt_text, self.job_desc, self.compaction['text'], self.model_name, self.text)
+
+
+def stream_resume_with_gemini(job_desc: str, resume_text: str, prompt_text: str,
+                              kind: str | None = None) -> AnalysisStream:
+    """
+    Start a streaming analysis that yields text chunks as they arrive.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        prompt_text (str): HR/ATS instruction prompt
+        kind (str | None): "ats" or "hr" for routing; inferred from the prompt when None
+
+    Returns:
+        AnalysisStream: Iterable of text chunks (pass to st.write_stream)
+    """
+    return AnalysisStream(job_desc, resume_text, prompt_text, kind)
+
+
+def analyze_many_with_gemini(job_desc: str, resume_text: str, prompts: dict[str, str]):
+    """
+    Run several analyses of the same resume concurrently.
+
+    Results are yielded in completion order, so the total wall-clock time is
+    that of the slowest analysis rather than the sum of all of them. A section
+    that raises is reported as an error without affecting the others.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        prompts (dict[str, str]): Section name -> instruction prompt
+
+    Yields:
+        tuple: (section name, analysis text or None, error message or None)
+    """
+    futures = {
+        _analysis_pool.submit(analyze_resume_with_gemini, job_desc, resume_text, prompt_text): name
+        for name, prompt_text in prompts.items()
+    }
+    for future in as_completed(futures):
+        try:
+            output, error = future.result()
+        except Exception as e:
+            # One failed section must not take the others' results with it
+            output, error = None, f"⚠️ Analysis failed: {str(e)}"
+        yield futures[future], output, error
+
+
+def analyze_many_structured(job_desc: str, resume_text: str, analyses: dict[str, tuple[str, str]]):
+    """
+    Run several structured analyses of the same resume concurrently.
+
+    Args:
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+        analyses (dict): Section name -> (structured prompt, schema kind)
+
+    Yields:
+        tuple: (section name, typed result or None, error message or None)
+    """
+    futures = {
+        _analysis_pool.submit(analyze_resume_structured, job_desc, resume_text, prompt_text, kind): name
+        for name, (prompt_text, kind) in analyses.items()
+    }
+    for future in as_completed(futures):
+        try:
+            result, error = future.result()
+        except Exception as e:
+            result, error = None, f"⚠️ Analysis failed: {str(e)}"
+        yield futures[future], result, error
@@ -0,0 +1,220 @@
+"""
+Layout Extractor Module
+Fast pypdfium2 text extraction with multi-column reading order and quality checks
+"""
+
+import threading
+import unicodedata
+
+# pdfium is not thread-safe; calls made in the Streamlit process are serialized
+PDFIUM_LOCK = threading.Lock()
+
+# A gutter is searched for in this middle band of the page width
+GUTTER_SEARCH_BAND = (0.25, 0.75)
+GUTTER_STEP_POINTS = 2
+MIN_GUTTER_POINTS = 6
+# Each column must hold at least this share of the page's text width
+MIN_COLUMN_SHARE = 0.2
+MIN_SEGMENTS_FOR_COLUMNS = 8
+
+# Quality thresholds below which the text is re-extracted with pdfplumber
+MAX_BAD_CHAR_RATIO = 0.02
+MAX_SINGLE_CHAR_TOKEN_RATIO = 0.4
+MAX_MEAN_TOKEN_LENGTH = 15
+
+
+def find_gutter(boxes: list[tuple], page_width: float) -> float | None:
+    """
+    Find the x position of the gap between two text columns, if any.
+
+    Args:
+        boxes (list[tuple]): (left, bottom, right, top, ...) text segment boxes of one page
+        page_width (float): Page width in points
+
+    Returns:
+        float | None: Gutter x position, or None for a single-column page
+    """
+    if len(boxes) < MIN_SEGMENTS_FOR_COLUMNS:
+        return None
+    # Full-width lines (name, headings, footers) may cross the gutter; a few are tolerated
+    max_crossing = max(2, len(boxes) // 10)
+
+    best = None  # (crossing count, -gap width, gap center)
+    run_start = run_crossing = None
+    x = page_width * GUTTER_SEARCH_BAND[0]
+    end = page_width * GUTTER_SEARCH_BAND[1]
+    while True:
+        crossing = sum(1 for box in boxes if box[0] < x < box[2]) if x <= end else None
+        if run_start is not None and crossing != run_crossing:
+            # A run of positions crossed by the same few segments is a candidate gap
+            width = x - GUTTER_STEP_POINTS - run_start
+            candidate = (run_crossing, -width, run_start + width / 2)
+            if width >= MIN_GUTTER_POINTS and run_crossing <= max_crossing and (best is None or candidate < best):
+                best = candidate
+            run_start = None
+        if crossing is None:
+            break
+        if run_start is None:
+            run_start, run_crossing = x, crossing
+        x += GUTTER_STEP_POINTS
+    if best is None:
+        return None
+
+    # Text width stands in for character count: right-aligned dates alone are not a column
+    gutter = best[2]
+    total = sum(box[2] - box[0] for box in boxes) or 1
+    left = sum(box[2] - box[0] for box in boxes if box[2] <= gutter)
+    right = sum(box[2] - box[0] for box in boxes if box[0] >= gutter)
+    if min(left, right) < MIN_COLUMN_SHARE * total:
+        return None
+    return gutter
+
+
+def _join_lines(segments: list[tuple]) -> str:
+    """Group segments into lines by vertical overlap and join them top to bottom, left to right."""
+    lines = []  # [top, bottom, [segments]]
+    for segment in sorted(segments, key=lambda s: -s[3]):
+        left, bottom, right, top, _ = segment
+        if lines:
+            line = lines[-1]
+            overlap = min(top, line[0]) - max(bottom, line[1])
+            if overlap > 0.5 * min(top - bottom, line[0] - line[1]):
+                line[2].append(segment)
+                line[0], line[1] = max(top, line[0]), min(bottom, line[1])
+                continue
+        lines.append([top, bottom, [segment]])
+    return "\n".join(" ".join(s[4] for s in sorted(line[2], key=lambda s: s[0])) for line in lines)
+
+
+def order_columns(segments: list[tuple], gutter: float) -> str:
+    """
+    Assemble a two-column page in reading order.
+
+    Full-width segments split the page into bands; within a band the left
+    column is read before the right one.
+
+    Args:
+        segments (list[tuple]): (left, bottom, right, top, text) text segments
+        gutter (float): Gutter x position from find_gutter
+
+    Returns:
+        str: Page text
+    """
+    blocks = []
+    left_column, right_column = [], []
+
+    def flush():
+        for column in (left_column, right_column):
+            if column:
+                blocks.append(_join_lines(column))
+                column.clear()
+
+    for segment in sorted(segments, key=lambda s: -s[3]):
+        left, _, right, _, _ = segment
+        if left < gutter < right:
+            flush()
+            blocks.append(segment[4])
+        elif right <= gutter:
+            left_column.append(segment)
+        else:
+            right_column.append(segment)
+    flush()
+    return "\n".join(block for block in blocks if block)
+
+
+def _page_segments(textpage) -> list[tuple]:
+    segments = []
+    for index in range(textpage.count_rects()):
+        left, bottom, right, top = textpage.get_rect(index)
+        text = textpage.get_text_bounded(left=left, bottom=bottom, right=right, top=top).strip()
+        if text:
+            segments.append((left, bottom, right, top, text))
+    return segments
+
+
+def _clean(text: str) -> str:
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # pdfium marks generated hyphens and other artifacts with control characters
+    return "".join(char for char in text if char in "\n\t" or unicodedata.category(char) != "Cc")
+
+
+def extract_pages_pdfium(pdf_bytes: bytes, start: int = 0, end: int | None = None) -> tuple[list[str], int]:
+    """
+    Extract text for pages [start, end) with pdfium, reordering multi-column pages.
+
+    Args:
+        pdf_bytes (bytes): PDF file contents
+        start (int): First page index (inclusive)
+        end (int | None): Last page index (exclusive); None for the last page
+
+    Returns:
+        tuple: (non-empty page texts in page order, number of pages read as columns)
+    """
+    import pypdfium2 as pdfium
+
+    texts, column_pages = [], 0
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for index in range(start, len(pdf) if end is None else min(end, len(pdf))):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    # Rect geometry is cheap; segment text is only read for multi-column pages
+                    rects = [textpage.get_rect(i) for i in range(textpage.count_rects())]
+                    gutter = find_gutter(rects, page.get_width())
+                    if gutter is not None:
+                        page_text = order_columns(_page_segments(textpage), gutter)
+                        column_pages += 1
+                    else:
+                        page_text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                page_text = _clean(page_text).strip()
+                if page_text:
+                    texts.append(page_text)
+        finally:
+            pdf.close()
+    return texts, column_pages
+
+
+def count_pages_pdfium(pdf_bytes: bytes) -> int:
+    """Return the number of pages in a PDF (without parsing page content)."""
+    import pypdfium2 as pdfium
+
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def text_quality_ok(page_texts: list[str], min_length: int) -> bool:
+    """
+    Check fast-path text for signs that pdfplumber would do better.
+
+    Flags empty text, unmapped glyphs (replacement/private-use characters),
+    letter-spaced text ("P y t h o n") and text with missing spaces.
+
+    Args:
+        page_texts (list[str]): Extracted page texts
+        min_length (int): Minimum characters expected from a text-based PDF
+
+    Returns:
+        bool: True if the text can be used as-is
+    """
+    text = "\n".join(page_texts)
+    if len(text.strip()) < min_length:
+        return False
+    bad = sum(1 for char in text if char == "\ufffd" or unicodedata.category(char) == "Co")
+    if bad > MAX_BAD_CHAR_RATIO * len(text):
+        return False
+    tokens = text.split()
+    if not tokens:
+        return False
+    single = sum(1 for token in tokens if len(token) == 1 and token.isalpha())
+    if single > MAX_SINGLE_CHAR_TOKEN_RATIO * len(tokens):
+        return False
+    return sum(len(token) for token in tokens) / len(tokens) <= MAX_MEAN_TOKEN_LENGTH
@@ -0,0 +1,410 @@
+"""
+LLM Backend Module
+Interchangeable model backends (Gemini or a local deterministic stand-in) with unified error mapping
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from rate_limiter import get_retry_after, get_status_code
+
+# Backend selection (overridable through environment variables)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()  # gemini or local
+# Local backend: simulated latency, share of requests failing with a retryable 503, and recorded responses
+LOCAL_LLM_LATENCY_SECONDS = float(os.getenv("LOCAL_LLM_LATENCY_SECONDS", "0"))
+LOCAL_LLM_JITTER_SECONDS = float(os.getenv("LOCAL_LLM_JITTER_SECONDS", "0"))
+LOCAL_LLM_ERROR_RATE = float(os.getenv("LOCAL_LLM_ERROR_RATE", "0"))
+LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH", "")
+# When set, every successful response is appended here (JSON lines) for later replay
+LLM_RECORD_PATH = os.getenv("LLM_RECORD_PATH", "")
+
+# Characters per streamed chunk from the local backend
+LOCAL_CHUNK_CHARS = 200
+
+# Client errors are not retried, so rate_limiter's status parsing leaves them out
+_CLIENT_STATUS_PATTERN = re.compile(r"\b(400|401|403|404)\b")
+
+# Error kind -> user-facing message ({model} is replaced with the model name)
+ERROR_MESSAGES = {
+    'quota': "⚠️ API quota exceeded. Please try again later or add billing to your Google Cloud project.",
+    'auth': "⚠️ Invalid API key. Please check your .env file and ensure the key is valid.",
+    'not_found': "⚠️ Model not found. The {model} model may not be available.",
+    'invalid_request': "⚠️ The model rejected the request: {detail}",
+    'unavailable': "⚠️ The model service is temporarily unavailable. Please try again in a moment.",
+    'timeout': "⚠️ The model took too long to respond. Please try again.",
+    'unknown': "⚠️ API Error: {detail}",
+}
+
+
+class LLMError(Exception):
+    """
+    Backend-independent model error.
+
+    `code` holds the HTTP status (read by rate_limiter's retry logic) and
+    `kind` one of the ERROR_MESSAGES keys.
+    """
+
+    def __init__(self, message: str, kind: str = "unknown", code: int | None = None, retry_after: float | None = None):
+        """Create an error of the given kind and optional HTTP status."""
+        super().__init__(message)
+        self.kind = kind
+        self.code = code
+        self.retry_after = retry_after
+
+
+def _classify(status: int | None, message: str) -> str:
+    if status == 429 or "RESOURCE_EXHAUSTED" in message:
+        return "quota"
+    if status in (401, 403) or "API key" in message or "API_KEY" in message:
+        return "auth"
+    if status == 404:
+        return "not_found"
+    if status == 400 or "INVALID" in message:
+        return "invalid_request"
+    if status is not None and status >= 500:
+        return "unavailable"
+    if "timed out" in message.lower() or "deadline" in message.lower():
+        return "timeout"
+    return "unknown"
+
+
+def to_llm_error(error: Exception) -> LLMError:
+    """
+    Normalize an exception from any backend into an LLMError.
+
+    Args:
+        error (Exception): Exception raised by a backend or SDK
+
+    Returns:
+        LLMError: The same error if already normalized, otherwise a new one chained to it
+    """
+    if isinstance(error, LLMError):
+        return error
+    message = str(error)
+    status = get_status_code(error)
+    if status is None:
+        match = _CLIENT_STATUS_PATTERN.search(message)
+        status = int(match.group(1)) if match else None
+    kind = "timeout" if isinstance(error, TimeoutError) else _classify(status, message)
+    normalized = LLMError(message, kind, status, get_retry_after(error))
+    normalized.__cause__ = error
+    return normalized
+
+
+def describe_llm_error(error: Exception, model_name: str) -> str:
+    """
+    Translate a backend exception into a user-facing message.
+
+    Args:
+        error (Exception): Exception raised by a backend or SDK
+        model_name (str): Model the request was sent to
+
+    Returns:
+        str: Friendly error message
+    """
+    normalized = to_llm_error(error)
+    return ERROR_MESSAGES[normalized.kind].format(model=model_name, detail=str(normalized)[:200])
+
+
+def load_generation_config() -> dict:
+    """
+    Read optional generation settings from environment variables.
+
+    Returns:
+        dict: Generation config for GenerativeModel (only the keys that are set)
+    """
+    settings = {
+        'temperature': ("GEMINI_TEMPERATURE", float),
+        'top_p': ("GEMINI_TOP_P", float),
+        'top_k': ("GEMINI_TOP_K", int),
+        'max_output_tokens': ("GEMINI_MAX_OUTPUT_TOKENS", int),
+    }
+    config = {}
+    for key, (env_name, cast) in settings.items():
+        value = os.getenv(env_name)
+        if value:
+            config[key] = cast(value)
+    return config
+
+
+def prompt_digest(prompt: str) -> str:
+    """Hex SHA-256 of a full prompt, used as the replay key."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+_record_lock = threading.Lock()
+
+
+def record_response(prompt: str, model_name: str, text: str) -> None:
+    """
+    Append a successful response to LLM_RECORD_PATH (no-op when unset).
+
+    Args:
+        prompt (str): Full prompt that was answered
+        model_name (str): Model that answered it
+        text (str): Response text
+    """
+    if not LLM_RECORD_PATH:
+        return
+    line = json.dumps({'key': prompt_digest(prompt), 'model': model_name, 'text': text})
+    with _record_lock:
+        with open(LLM_RECORD_PATH, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+
+class GeminiBackend:
+    """Google Gemini through the google-generativeai SDK."""
+
+    name = "gemini"
+    requires_api_key = True
+    # Gemini cached content can hold the shared prompt prefix server-side
+    supports_cached_content = True
+
+    def __init__(self):
+        """Create the backend; the SDK is imported on first use."""
+        self._configured_api_key = None
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def configure(self, api_key: str | None) -> bool:
+        """
+        Configure the SDK once per key.
+
+        Args:
+            api_key (str | None): Google API key
+
+        Returns:
+            bool: True if the key changed (models bound to the old client were dropped)
+        """
+        with self._lock:
+            if not api_key or api_key == self._configured_api_key:
+                return False
+            # Imported on first use: the SDK is slow to import and not needed before login
+            import google.generativeai as genai
+
+            transport = os.getenv("GEMINI_TRANSPORT")
+            if transport:
+                genai.configure(api_key=api_key, transport=transport)
+            else:
+                genai.configure(api_key=api_key)
+            self._configured_api_key = api_key
+            self._models.clear()
+            return True
+
+    def get_model(self, model_name: str):
+        """
+        Get the shared GenerativeModel for a model name, creating it on first use.
+
+        Reusing one model per process keeps its client (and pooled keep-alive
+        connections) alive across requests and sessions.
+
+        Args:
+            model_name (str): Gemini model name
+
+        Returns:
+            genai.GenerativeModel: Shared model instance
+        """
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                import google.generativeai as genai
+
+                model = genai.GenerativeModel(model_name, generation_config=load_generation_config() or None)
+                self._models[model_name] = model
+            return model
+
+
+class _LocalUsage:
+    def __init__(self, prompt_tokens: int, response_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = response_tokens
+        self.cached_content_token_count = 0
+
+
+class _LocalResponse:
+    def __init__(self, text: str, usage: _LocalUsage | None = None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+class _LocalStream:
+    """Iterable of response chunks, with usage metadata like a Gemini stream."""
+
+    def __init__(self, text: str, usage: _LocalUsage):
+        self.text = text
+        self.usage_metadata = usage
+
+    def __iter__(self):
+        for start in range(0, len(self.text), LOCAL_CHUNK_CHARS):
+            yield _LocalResponse(self.text[start:start + LOCAL_CHUNK_CHARS])
+
+
+def _sample_from_schema(schema: dict, rng: random.Random, name: str = "value"):
+    """Build a value that satisfies one of analysis_schema's response schemas."""
+    schema_type = schema.get('type')
+    if 'enum' in schema:
+        return rng.choice(schema['enum'])
+    if schema_type == 'object':
+        return {key: _sample_from_schema(value, rng, key) for key, value in schema.get('properties', {}).items()}
+    if schema_type == 'array':
+        return [_sample_from_schema(schema.get('items', {}), rng, name) for _ in range(rng.randint(1, 3))]
+    if schema_type == 'integer':
+        return rng.randint(40, 95)
+    if schema_type == 'number':
+        return round(rng.uniform(0, 1), 2)
+    if schema_type == 'boolean':
+        return rng.random() < 0.5
+    return f"Local {name.replace('_', ' ')} {rng.randint(1, 99)}"
+
+
+def _sample_report(rng: random.Random) -> str:
+    score = rng.randint(40, 95)
+    lines = [f"## ATS Score: {score}/100", "", "## Keyword Analysis", "### Matching Keywords:"]
+    lines += [f"- Keyword {rng.randint(1, 99)}" for _ in range(5)]
+    lines += ["", "### Missing Keywords:"] + [f"- Keyword {rng.randint(100, 199)} (medium)" for _ in range(3)]
+    lines += ["", "## Summary", f"- Recommendation: {rng.choice(('Yes', 'No', 'Maybe'))}",
+              "- Deterministic response from the local LLM backend."]
+    return "\n".join(lines)
+
+
+class LocalModel:
+    """Model handle of LocalBackend with the GenerativeModel.generate_content interface."""
+
+    def __init__(self, backend: "LocalBackend", model_name: str):
+        self.backend = backend
+        self.model_name = model_name
+
+    def generate_content(self, contents, stream: bool = False, generation_config: dict | None = None, **kwargs):
+        text = self.backend.respond(self.model_name, contents, generation_config)
+        usage = _LocalUsage(max(1, len(contents) // 4), max(1, len(text) // 4))
+        return _LocalStream(text, usage) if stream else _LocalResponse(text, usage)
+
+
+class LocalBackend:
+    """
+    Offline stand-in for load tests, benchmarks and development.
+
+    Answers from recorded responses (LLM_REPLAY_PATH) when the prompt was
+    seen before; otherwise returns deterministic output derived from the
+    prompt (JSON matching the requested response_schema, or a markdown report).
+    Latency and a retryable failure rate can be simulated.
+    """
+
+    name = "local"
+    requires_api_key = False
+    supports_cached_content = False
+
+    def __init__(self, latency_seconds: float = LOCAL_LLM_LATENCY_SECONDS,
+                 jitter_seconds: float = LOCAL_LLM_JITTER_SECONDS,
+                 error_rate: float = LOCAL_LLM_ERROR_RATE, replay_path: str = LLM_REPLAY_PATH, seed: int = 0):
+        """
+        Args:
+            latency_seconds (float): Base delay per request
+            jitter_seconds (float): Extra uniform random delay per request
+            error_rate (float): Share of requests that raise a 503 LLMError
+            replay_path (str): JSON lines file written via LLM_RECORD_PATH, or "" for none
+            seed (int): Seed for the latency/failure random generator
+        """
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay = self._load_replay(replay_path)
+        self.calls = 0
+        self.replayed = 0
+        self.failed = 0
+        self.prompt_chars = 0
+
+    @staticmethod
+    def _load_replay(path: str) -> dict:
+        replay = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        replay[record['key']] = record['text']
+        return replay
+
+    def configure(self, api_key: str | None) -> bool:
+        """No credentials are needed; always returns False."""
+        return False
+
+    def get_model(self, model_name: str) -> LocalModel:
+        """Get a model handle (cheap; created per call)."""
+        return LocalModel(self, model_name)
+
+    def respond(self, model_name: str, prompt: str, generation_config: dict | None = None) -> str:
+        """
+        Produce the response text for one request, after the simulated delay.
+
+        Raises:
+            LLMError: A simulated 503, at error_rate
+        """
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+            delay = self.latency_seconds + self._rng.uniform(0, self.jitter_seconds)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.failed += 1
+        time.sleep(delay)
+        if fail:
+            raise LLMError("503 Simulated local backend failure", "unavailable", 503)
+
+        key = prompt_digest(prompt)
+        if key in self._replay:
+            with self._lock:
+                self.replayed += 1
+            return self._replay[key]
+
+        # Seeded by the prompt so the same request always gets the same answer
+        rng = random.Random(f"{model_name}:{key}")
+        schema = (generation_config or {}).get('response_schema')
+        if schema:
+            return json.dumps(_sample_from_schema(schema, rng))
+        return _sample_report(rng)
+
+    def stats(self) -> dict:
+        """
+        Get local backend counters.
+
+        Returns:
+            dict: Requests served, replayed from recordings, simulated failures and prompt characters
+        """
+        with self._lock:
+            return {'calls': self.calls, 'replayed': self.replayed, 'failed': self.failed,
+                    'prompt_chars': self.prompt_chars}
+
+
+# LLM_BACKEND value -> backend class
+LLM_BACKENDS = {'gemini': GeminiBackend, 'local': LocalBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_llm_backend():
+    """
+    Get the process-wide backend selected by LLM_BACKEND.
+
+    Returns:
+        GeminiBackend | LocalBackend: Shared backend instance
+
+    Raises:
+        ValueError: If LLM_BACKEND names no known backend
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if LLM_BACKEND not in LLM_BACKENDS:
+                    raise ValueError(f"Unknown LLM_BACKEND: {LLM_BACKEND} (expected one of: {', '.join(LLM_BACKENDS)})")
+                _backend = LLM_BACKENDS[LLM_BACKEND]()
+    return _backend
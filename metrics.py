@@ -0,0 +1,381 @@
+"""
+Metrics Module
+Per-stage latency spans, Prometheus-style counters/histograms and optional JSON request logs
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from rate_limiter import get_gemini_limiter, get_status_code
+
+METRIC_PREFIX = "careerlens"
+# "stderr" (or "1") prints one JSON line per span; any other value is a file to append to
+METRICS_JSON_LOG = os.getenv("METRICS_JSON_LOG", "")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 disables the /metrics HTTP endpoint
+# Recent samples per stage kept for the in-app p50/p95/p99 view
+RECENT_SAMPLES = 2048
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: tuple, extra: dict | None = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help_text: str):
+        """Create an empty counter."""
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Add amount to the series identified by labels."""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Current value of one series."""
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def expose(self) -> list[str]:
+        """Render in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Value that can go up and down (sizes, counts of live objects)."""
+
+    def __init__(self, name: str, help_text: str, function=None):
+        """
+        Create a gauge at zero.
+
+        Args:
+            name (str): Metric name
+            help_text (str): HELP line
+            function: Optional zero-argument callable read at exposition time instead of set() values
+        """
+        self.name = name
+        self.help_text = help_text
+        self._function = function
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Replace the current value."""
+        with self._lock:
+            self._value = float(value)
+
+    def value(self) -> float:
+        """Current value."""
+        if self._function is not None:
+            return float(self._function())
+        with self._lock:
+            return self._value
+
+    def expose(self) -> list[str]:
+        """Render in the Prometheus text exposition format."""
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.value():g}"]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        """Create an empty histogram with the given upper bounds."""
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # key -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation in the series identified by labels."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0, 0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def expose(self) -> list[str]:
+        """Render in the Prometheus text exposition format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, {'le': f'{bound:g}'})} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]:g}")
+        return lines
+
+
+def _bcrypt_queue_depth() -> int:
+    # Imported on scrape: password_hasher imports metrics. Only the shared hasher is reported,
+    # so hashers built elsewhere (tools, tests) do not overwrite its depth
+    from password_hasher import shared_queue_depth
+
+    return shared_queue_depth()
+
+
+STAGE_SECONDS = Histogram(f"{METRIC_PREFIX}_stage_duration_seconds", "Time spent per processing stage")
+STAGE_ERRORS = Counter(f"{METRIC_PREFIX}_stage_errors_total", "Failed stage runs by error class")
+CACHE_REQUESTS = Counter(f"{METRIC_PREFIX}_cache_requests_total", "Cache lookups by cache and result")
+EXTRACTION_TIERS = Counter(f"{METRIC_PREFIX}_pdf_extractions_total", "Extracted PDFs by the tier that produced the text")
+# Read from the limiter on scrape: metrics imports rate_limiter, so the limiter cannot push to it
+GEMINI_QUEUE_DEPTH = Gauge(f"{METRIC_PREFIX}_gemini_queue_depth", "Gemini requests waiting for a rate limiter slot",
+                           function=lambda: get_gemini_limiter().stats()['queue_depth'])
+# Read from the shared hasher on scrape, like the Gemini queue depth
+BCRYPT_QUEUE_DEPTH = Gauge(f"{METRIC_PREFIX}_bcrypt_queue_depth", "bcrypt operations waiting for a hashing worker",
+                           function=_bcrypt_queue_depth)
+BCRYPT_WAIT_SECONDS = Histogram(f"{METRIC_PREFIX}_bcrypt_wait_seconds", "Time bcrypt operations waited for a hashing worker")
+GEMINI_RETRIES = Counter(f"{METRIC_PREFIX}_gemini_retries_total", "Gemini requests retried, by status code")
+MODEL_FALLBACKS = Counter(f"{METRIC_PREFIX}_gemini_model_fallbacks_total", "Routed models that were unavailable (404), by model")
+PROMPT_TOKENS = Histogram(f"{METRIC_PREFIX}_gemini_prompt_tokens", "Prompt tokens per Gemini request", SIZE_BUCKETS)
+RESPONSE_TOKENS = Histogram(f"{METRIC_PREFIX}_gemini_response_tokens", "Response tokens per Gemini request", SIZE_BUCKETS)
+SESSION_STORE_BYTES = Gauge(f"{METRIC_PREFIX}_session_store_bytes", "Bytes of resume text and reports held for sessions")
+SESSION_STORE_SESSIONS = Gauge(f"{METRIC_PREFIX}_session_store_sessions", "Sessions holding payloads in the session store")
+
+_REGISTRY = (STAGE_SECONDS, STAGE_ERRORS, CACHE_REQUESTS, EXTRACTION_TIERS, GEMINI_QUEUE_DEPTH, BCRYPT_QUEUE_DEPTH,
+             BCRYPT_WAIT_SECONDS, GEMINI_RETRIES, MODEL_FALLBACKS, PROMPT_TOKENS, RESPONSE_TOKENS, SESSION_STORE_BYTES,
+             SESSION_STORE_SESSIONS)
+_recent = {}
+_recent_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def classify_error(error) -> str:
+    """
+    Reduce an exception or error message to a low-cardinality class label.
+
+    Args:
+        error: Exception raised by a stage, or its user-facing message
+
+    Returns:
+        str: HTTP status ("429", "400", "404", ...), "timeout", or the exception type name
+    """
+    if isinstance(error, str):
+        for status in ("429", "400", "404", "500", "503"):
+            if status in error:
+                return status
+        return "timeout" if "Timed out" in error else "error"
+    status = get_status_code(error)
+    if status is not None:
+        return str(status)
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    return type(error).__name__
+
+
+class Span:
+    """One timed stage run; fields set on it are added to the JSON log line."""
+
+    def __init__(self, stage: str):
+        """Start timing a stage."""
+        self.stage = stage
+        self.fields = {}
+        self.error_class = None
+        self.started = time.perf_counter()
+
+    def set(self, **fields) -> None:
+        """Attach request attributes (sizes, cache result, ...) to the log line."""
+        self.fields.update(fields)
+
+    def fail(self, error) -> None:
+        """Mark the stage as failed without raising (for (value, error) style functions)."""
+        self.error_class = classify_error(error)
+
+
+def _write_log_line(record: dict) -> None:
+    line = json.dumps(record, default=str)
+    with _log_lock:
+        if METRICS_JSON_LOG.lower() in ("1", "true", "stderr"):
+            print(line, file=sys.stderr, flush=True)
+        else:
+            with open(METRICS_JSON_LOG, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+
+def observe_stage(stage: str, seconds: float, error_class: str | None = None, **fields) -> None:
+    """
+    Record one completed stage run.
+
+    Args:
+        stage (str): Stage name, e.g. "pdf_extract"
+        seconds (float): Wall-clock duration
+        error_class (str | None): Set when the stage failed
+        **fields: Extra attributes for the JSON log line
+    """
+    outcome = "error" if error_class else "ok"
+    STAGE_SECONDS.observe(seconds, stage=stage, outcome=outcome)
+    if error_class:
+        STAGE_ERRORS.inc(stage=stage, error_class=error_class)
+    with _recent_lock:
+        _recent.setdefault(stage, deque(maxlen=RECENT_SAMPLES)).append(seconds)
+
+    if METRICS_JSON_LOG:
+        record = {'ts': round(time.time(), 3), 'stage': stage, 'seconds': round(seconds, 6), 'outcome': outcome}
+        if error_class:
+            record['error_class'] = error_class
+        record.update(fields)
+        _write_log_line(record)
+
+
+@contextmanager
+def span(stage: str, **fields):
+    """
+    Time a block as one run of a stage.
+
+    An exception escaping the block is recorded with its error class and re-raised.
+
+    Args:
+        stage (str): Stage name
+        **fields: Initial attributes for the JSON log line
+
+    Yields:
+        Span: Call set() to add attributes or fail() to mark a handled error
+    """
+    current = Span(stage)
+    current.set(**fields)
+    try:
+        yield current
+    except BaseException as e:
+        current.error_class = classify_error(e)
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - current.started, current.error_class, **current.fields)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one cache lookup."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_retry(status: int | None) -> None:
+    """Count one retried Gemini request (e.g. a 429 that later succeeded)."""
+    GEMINI_RETRIES.inc(status=status if status is not None else "unknown")
+
+
+def record_model_fallback(model_name: str, fallback_model: str) -> None:
+    """Count one request re-sent to the default model because the routed one returned 404."""
+    MODEL_FALLBACKS.inc(model=model_name, fallback=fallback_model)
+    if METRICS_JSON_LOG:
+        _write_log_line({'ts': round(time.time(), 3), 'event': "model_fallback",
+                         'model': model_name, 'fallback': fallback_model})
+
+
+def record_tokens(prompt_tokens: int | None, response_tokens: int | None) -> None:
+    """Record the prompt and response size of one Gemini request."""
+    if prompt_tokens is not None:
+        PROMPT_TOKENS.observe(prompt_tokens)
+    if response_tokens is not None:
+        RESPONSE_TOKENS.observe(response_tokens)
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def stage_summary() -> dict:
+    """
+    Latency percentiles over the most recent runs of each stage.
+
+    Returns:
+        dict: stage -> {'count', 'p50', 'p95', 'p99'} in seconds
+    """
+    with _recent_lock:
+        samples = {stage: sorted(values) for stage, values in _recent.items() if values}
+    return {
+        stage: {
+            'count': len(values),
+            'p50': _percentile(values, 0.50),
+            'p95': _percentile(values, 0.95),
+            'p99': _percentile(values, 0.99),
+        }
+        for stage, values in sorted(samples.items())
+    }
+
+
+def render_prometheus() -> str:
+    """
+    Render every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text (content type text/plain; version=0.0.4)
+    """
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT):
+    """
+    Serve /metrics on a background thread, once per process.
+
+    Args:
+        port (int): TCP port; 0 leaves the endpoint disabled
+
+    Returns:
+        ThreadingHTTPServer | None: The running server, or None if disabled
+    """
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would flood the Streamlit console
+                pass
+
+        _server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
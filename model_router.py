@@ -0,0 +1,135 @@
+"""
+Model Router Module
+Picks a model tier per request from its prompt size and analysis type
+"""
+
+import os
+import threading
+
+from prompts import ATS_JSON_PROMPT, ATS_PROMPT, BATCH_SCREENING_PROMPT, HR_JSON_PROMPT, HR_PROMPT
+
+# Model tiers (overridable through environment variables)
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "models/gemini-2.5-flash")
+GEMINI_FAST_MODEL_NAME = os.getenv("GEMINI_FAST_MODEL_NAME", "models/gemini-2.5-flash-lite")
+GEMINI_LARGE_MODEL_NAME = os.getenv("GEMINI_LARGE_MODEL_NAME", "models/gemini-2.5-pro")
+# Opt-in: routing moves requests off GEMINI_MODEL_NAME, which changes output quality and cost
+MODEL_ROUTING = os.getenv("MODEL_ROUTING", "off").lower() in ("1", "on", "true")
+# Keyword checks up to this many prompt tokens go to the fast tier
+ROUTE_FAST_MAX_TOKENS = int(os.getenv("ROUTE_FAST_MAX_TOKENS", "8000"))
+# Any request above this many prompt tokens goes to the large tier
+ROUTE_LARGE_MIN_TOKENS = int(os.getenv("ROUTE_LARGE_MIN_TOKENS", "16000"))
+
+TIER_FAST = "fast"
+TIER_STANDARD = "standard"
+TIER_LARGE = "large"
+
+# Scoring/keyword matching is cheap for a small model; narrative review benefits from a larger one
+FAST_KINDS = ("ats", "screening")
+LARGE_KINDS = ("hr",)
+
+# Instruction prompt -> analysis kind, for callers that only pass the prompt
+PROMPT_KINDS = {
+    ATS_PROMPT: "ats",
+    ATS_JSON_PROMPT: "ats",
+    HR_PROMPT: "hr",
+    HR_JSON_PROMPT: "hr",
+    BATCH_SCREENING_PROMPT: "screening",
+}
+
+
+class ModelRouter:
+    """Maps (analysis kind, prompt tokens) to a model tier and counts the requests sent to each tier."""
+
+    def __init__(self, enabled: bool = MODEL_ROUTING, fast_max_tokens: int = ROUTE_FAST_MAX_TOKENS,
+                 large_min_tokens: int = ROUTE_LARGE_MIN_TOKENS, models: dict[str, str] | None = None):
+        """
+        Args:
+            enabled (bool): When False every request uses the standard tier
+            fast_max_tokens (int): Largest prompt sent to the fast tier
+            large_min_tokens (int): Prompts above this go to the large tier
+            models (dict | None): Tier -> model name; defaults to the GEMINI_*_MODEL_NAME settings
+        """
+        self.enabled = enabled
+        self.fast_max_tokens = fast_max_tokens
+        self.large_min_tokens = large_min_tokens
+        self.models = models or {
+            TIER_FAST: GEMINI_FAST_MODEL_NAME,
+            TIER_STANDARD: GEMINI_MODEL_NAME,
+            TIER_LARGE: GEMINI_LARGE_MODEL_NAME,
+        }
+        self._lock = threading.Lock()
+        self._counts = {tier: 0 for tier in self.models}
+        if enabled and self.models[TIER_LARGE] == self.models[TIER_STANDARD]:
+            print(f"⚠️ Model routing: the large tier uses the standard model ({self.models[TIER_STANDARD]}); "
+                  "set GEMINI_LARGE_MODEL_NAME to route HR reviews and long prompts to a larger model.")
+
+    def choose_tier(self, kind: str | None, prompt_tokens: int) -> str:
+        """
+        Pick the tier for one request.
+
+        Args:
+            kind (str | None): "ats", "hr", "screening", or None if unknown
+            prompt_tokens (int): Estimated prompt size
+
+        Returns:
+            str: TIER_FAST, TIER_STANDARD or TIER_LARGE
+        """
+        if not self.enabled:
+            return TIER_STANDARD
+        if prompt_tokens > self.large_min_tokens or kind in LARGE_KINDS:
+            return TIER_LARGE
+        if kind in FAST_KINDS and prompt_tokens <= self.fast_max_tokens:
+            return TIER_FAST
+        return TIER_STANDARD
+
+    def route(self, prompt_text: str, prompt_tokens: int, kind: str | None = None) -> tuple[str, str]:
+        """
+        Pick the model for one request.
+
+        Nothing is counted here, since the request may still be served from a
+        cache; call record() once it is sent to the model.
+
+        Args:
+            prompt_text (str): Instruction prompt (used to infer the kind when not given)
+            prompt_tokens (int): Estimated prompt size
+            kind (str | None): Analysis kind, if the caller knows it
+
+        Returns:
+            tuple[str, str]: (tier, model name)
+        """
+        tier = self.choose_tier(kind or PROMPT_KINDS.get(prompt_text), prompt_tokens)
+        return tier, self.models[tier]
+
+    def record(self, tier: str) -> None:
+        """Count one request that was sent to the model of a tier."""
+        with self._lock:
+            self._counts[tier] = self._counts.get(tier, 0) + 1
+
+    def stats(self) -> dict:
+        """
+        Get routing counters.
+
+        Returns:
+            dict: Tier -> requests sent to its model (cache hits and coalesced requests excluded)
+        """
+        with self._lock:
+            return dict(self._counts)
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Get the process-wide model router.
+
+    Returns:
+        ModelRouter: Shared router instance
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
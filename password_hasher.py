@@ -0,0 +1,185 @@
+"""
+Password Hasher Module
+Runs bcrypt hashing and verification on a bounded worker pool
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import BCRYPT_WAIT_SECONDS, span
+
+# bcrypt cost factor and pool size (overridable through environment variables)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+DEFAULT_MAX_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+
+
+def get_hash_rounds(hashed: str) -> int | None:
+    """
+    Read the cost factor from a bcrypt hash like "$2b$12$...".
+
+    Args:
+        hashed (str): Stored bcrypt hash
+
+    Returns:
+        int | None: Cost factor, or None if the hash is not recognized
+    """
+    parts = (hashed or "").split("$")
+    if len(parts) < 4:
+        return None
+    try:
+        return int(parts[2])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    """
+    Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so worker threads run in parallel
+    on separate cores while the pool size caps CPU use during login spikes.
+    bcrypt itself is imported on first use to keep app start-up light.
+    """
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, max_workers: int = DEFAULT_MAX_WORKERS):
+        """Create the hasher with the given cost factor and pool size."""
+        self.rounds = rounds
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.operations = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    def _submit(self, func, *args):
+        submitted = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self.total_wait_seconds += started - submitted
+            BCRYPT_WAIT_SECONDS.observe(started - submitted)
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.operations += 1
+                    self.total_seconds += elapsed
+                    self.max_seconds = max(self.max_seconds, elapsed)
+
+        return self._pool.submit(task)
+
+    def _run(self, func, *args):
+        return self._submit(func, *args).result()
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password at the configured cost factor.
+
+        Args:
+            password (str): Plain text password
+
+        Returns:
+            str: bcrypt hash
+        """
+        import bcrypt
+
+        with span("bcrypt_hash", rounds=self.rounds):
+            salt = bcrypt.gensalt(rounds=self.rounds)
+            return self._run(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash several passwords in parallel on the pool.
+
+        Args:
+            passwords (list[str]): Plain text passwords
+
+        Returns:
+            list[str]: bcrypt hashes in the same order
+        """
+        import bcrypt
+
+        futures = [
+            self._submit(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=self.rounds))
+            for password in passwords
+        ]
+        return [future.result().decode('utf-8') for future in futures]
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """
+        Check a password against a stored bcrypt hash.
+
+        Args:
+            password (str): Plain text password
+            hashed (str): Stored bcrypt hash
+
+        Returns:
+            bool: True if the password matches
+        """
+        import bcrypt
+
+        with span("bcrypt_verify", rounds=get_hash_rounds(hashed)) as stage:
+            try:
+                return self._run(bcrypt.checkpw, password.encode('utf-8'), (hashed or "").encode('utf-8'))
+            except ValueError as e:
+                # Malformed or empty stored hash
+                stage.fail(e)
+                return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Check whether a stored hash uses a different cost factor than configured."""
+        return get_hash_rounds(hashed) != self.rounds
+
+    def stats(self) -> dict:
+        """
+        Get hashing metrics.
+
+        Returns:
+            dict: Queue depth, operation count and latency figures
+        """
+        with self._lock:
+            return {
+                'queue_depth': self._queued,
+                'operations': self.operations,
+                'avg_seconds': self.total_seconds / self.operations if self.operations else 0.0,
+                'max_seconds': self.max_seconds,
+                'avg_wait_seconds': self.total_wait_seconds / self.operations if self.operations else 0.0,
+            }
+
+
+_hasher_instance = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """
+    Get the process-wide password hasher, creating it on first use.
+
+    Returns:
+        PasswordHasher: Shared hasher instance
+    """
+    global _hasher_instance
+    if _hasher_instance is None:
+        with _hasher_lock:
+            if _hasher_instance is None:
+                _hasher_instance = PasswordHasher()
+    return _hasher_instance
+
+
+def shared_queue_depth() -> int:
+    """
+    Get the queue depth of the shared hasher without creating it.
+
+    Returns:
+        int: Operations waiting for a worker (0 before the first use)
+    """
+    hasher = _hasher_instance
+    return hasher.stats()['queue_depth'] if hasher is not None else 0
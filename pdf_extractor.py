@@ -0,0 +1,526 @@
+"""
+PDF Extraction Module
+Parallel, page-range based text extraction: fast pypdfium2 tier with pdfplumber fallback
+"""
+
+import io
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from extraction_cache import get_extraction_cache, hash_pdf_bytes
+from layout_extractor import count_pages_pdfium, extract_pages_pdfium, text_quality_ok
+from metrics import EXTRACTION_TIERS, record_cache, span
+from resume_compactor import RESUME_TOKEN_BUDGET, normalize_whitespace, strip_page_furniture
+
+# Engine tuning (overridable through environment variables)
+DEFAULT_MAX_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "60"))
+DEFAULT_PAGES_PER_CHUNK = int(os.getenv("PDF_PAGES_PER_CHUNK", "4"))
+# "auto" tries pdfium first and falls back to pdfplumber on poor text; "fast" or "pdfplumber" force one tier
+EXTRACT_MODE = os.getenv("PDF_EXTRACT_MODE", "auto").lower()
+
+TIER_FAST = "pdfium"
+TIER_FULL = "pdfplumber"
+
+MIN_TEXT_LENGTH = 100
+# With compaction on, the raw text is only bounded by a safety cap: resume_compactor picks the
+# job-relevant sections that fit RESUME_TOKEN_BUDGET. Without it the text is sent as-is, so the
+# conservative 30k cap (Gemini context consideration) applies.
+MAX_TEXT_LENGTH = 200000 if RESUME_TOKEN_BUDGET > 0 else 30000
+
+SCANNED_PDF_ERROR = "⚠️ Could not extract text from PDF. This may be a scanned/image-based resume. Please upload a text-based PDF."
+TIMEOUT_ERROR = "⚠️ Timed out while reading PDF. Please upload a simpler text-based PDF."
+
+
+def read_pdf_bytes(source) -> bytes:
+    """
+    Get raw bytes from an uploaded file, a path or a bytes object.
+
+    Args:
+        source: Streamlit UploadedFile, file-like object, path, or bytes
+
+    Returns:
+        bytes: PDF file contents
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return f.read()
+    if hasattr(source, 'getvalue'):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def count_pdf_pages(pdf_bytes: bytes, mode: str = EXTRACT_MODE) -> int:
+    """
+    Return the number of pages in a PDF.
+
+    pdfium counts without parsing page content; pdfplumber counts when the mode
+    skips the fast tier or pdfium cannot open the file, so such files still
+    reach the pdfplumber tier.
+
+    Args:
+        pdf_bytes (bytes): PDF file contents
+        mode (str): "auto", "fast" or "pdfplumber"
+
+    Returns:
+        int: Page count
+    """
+    if mode != TIER_FULL:
+        try:
+            return count_pages_pdfium(pdf_bytes)
+        except Exception:
+            if mode == "fast":
+                raise
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return len(pdf.pages)
+
+
+def extract_page_range(pdf_bytes: bytes, start: int, end: int) -> list[str]:
+    """
+    Extract text for pages [start, end) with pdfplumber (the accurate, slow tier).
+
+    Args:
+        pdf_bytes (bytes): PDF file contents
+        start (int): First page index (inclusive)
+        end (int): Last page index (exclusive)
+
+    Returns:
+        list[str]: Non-empty page texts in page order
+    """
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        for page in pdf.pages[start:end]:
+            page_text = page.extract_text()
+            if page_text:
+                texts.append(page_text)
+    return texts
+
+
+def extract_page_range_tiered(pdf_bytes: bytes, start: int, end: int | None,
+                              mode: str = EXTRACT_MODE) -> tuple[list[str], dict]:
+    """
+    Extract text for pages [start, end), fast tier first. Runs inside pool workers.
+
+    pdfium text (with multi-column pages put in reading order) is used unless it
+    fails the quality checks or pdfium cannot open the file; then pdfplumber runs.
+
+    Args:
+        pdf_bytes (bytes): PDF file contents
+        start (int): First page index (inclusive)
+        end (int | None): Last page index (exclusive); None for the last page
+        mode (str): "auto", "fast" or "pdfplumber"
+
+    Returns:
+        tuple: (non-empty page texts in page order, {'tier', 'pages', 'column_pages'})
+    """
+    if mode != TIER_FULL:
+        try:
+            texts, column_pages = extract_pages_pdfium(pdf_bytes, start, end)
+            # Only a range starting at page one must carry a whole resume's worth of text
+            if mode == "fast" or text_quality_ok(texts, MIN_TEXT_LENGTH if start == 0 else 1):
+                return texts, {'tier': TIER_FAST, 'pages': len(texts), 'column_pages': column_pages}
+        except Exception:
+            if mode == "fast":
+                raise
+    texts = extract_page_range(pdf_bytes, start, end)
+    return texts, {'tier': TIER_FULL, 'pages': len(texts), 'column_pages': 0}
+
+
+def merge_tier_info(infos: list[dict]) -> dict:
+    """
+    Combine the tier info of several page ranges of one document.
+
+    Args:
+        infos (list[dict]): Results of extract_page_range_tiered
+
+    Returns:
+        dict: {'tier': TIER_FAST, TIER_FULL or "mixed", 'pages', 'column_pages'}
+    """
+    tiers = {info['tier'] for info in infos}
+    return {
+        'tier': tiers.pop() if len(tiers) == 1 else "mixed",
+        'pages': sum(info['pages'] for info in infos),
+        'column_pages': sum(info['column_pages'] for info in infos),
+    }
+
+
+def record_extraction_tier(info: dict) -> None:
+    """Count one extracted document under the tier that produced its text."""
+    EXTRACTION_TIERS.inc(tier=info['tier'])
+
+
+def clean_extracted_text(page_texts: list[str]) -> tuple[str | None, str | None]:
+    """
+    Join page texts and apply the standard cleanup rules.
+
+    Args:
+        page_texts (list[str]): Text of each page in order
+
+    Returns:
+        tuple: (cleaned text, None) or (None, error message)
+    """
+    # Drop page numbers and headers/footers repeated on every page, then combine all pages
+    full_text = "\n\n".join(strip_page_furniture(page_texts))
+
+    # Collapse runs of spaces and excessive blank lines
+    full_text = normalize_whitespace(full_text)
+
+    # Check if text was extracted
+    if not full_text or len(full_text) < MIN_TEXT_LENGTH:
+        return None, SCANNED_PDF_ERROR
+
+    # Truncate if too long
+    if len(full_text) > MAX_TEXT_LENGTH:
+        full_text = full_text[:MAX_TEXT_LENGTH] + "\n\n[Resume truncated due to length]"
+
+    return full_text, None
+
+
+def is_cacheable_result(result: tuple[str | None, str | None]) -> bool:
+    """
+    Whether an extraction outcome is definitive and may be cached.
+
+    Only successes and the scanned-PDF error depend on the file alone; timeouts,
+    broken worker pools and other errors may pass on a later attempt.
+
+    Args:
+        result (tuple): (text, error) from an extraction
+
+    Returns:
+        bool: True if the result can be served for later uploads of the same file
+    """
+    return result[1] is None or result[1] == SCANNED_PDF_ERROR
+
+
+def extract_document_text(pdf_bytes: bytes) -> tuple[str | None, str | None, dict | None]:
+    """
+    Extract and clean a whole document in one call. Runs inside pool workers.
+
+    Args:
+        pdf_bytes (bytes): PDF file contents
+
+    Returns:
+        tuple: (text, None, tier info) on success or (None, error message, tier info or None)
+    """
+    try:
+        page_texts, info = extract_page_range_tiered(pdf_bytes, 0, None)
+        return (*clean_extracted_text(page_texts), info)
+    except Exception as e:
+        return None, f"⚠️ Error reading PDF: {str(e)}", None
+
+
+def _register_worker(pid_queue) -> None:
+    """Pool initializer: report this worker's pid so a stuck worker can be terminated."""
+    pid_queue.put(os.getpid())
+
+
+class PdfExtractionEngine:
+    """
+    Splits a document into page ranges and extracts them on a bounded
+    process pool, reassembling the text in page order.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+                 pages_per_chunk: int = DEFAULT_PAGES_PER_CHUNK):
+        """Configure the engine; worker processes are started lazily."""
+        self.max_workers = max(1, max_workers)
+        self.timeout_seconds = timeout_seconds
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self._pool = None
+        self._worker_pids = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn avoids forking the multi-threaded Streamlit server process
+                context = multiprocessing.get_context("spawn")
+                self._worker_pids = context.Queue()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_register_worker,
+                    initargs=(self._worker_pids,),
+                )
+            return self._pool
+
+    def _reset_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        Tear down a pool, killing workers stuck on a pathological document.
+
+        Only the given pool is torn down; if another caller already replaced it,
+        the fresh pool is left alone.
+        """
+        with self._lock:
+            if pool is not self._pool:
+                return
+            self._pool = None
+            worker_pids, self._worker_pids = self._worker_pids, None
+        # ProcessPoolExecutor cannot cancel running tasks, so terminate the workers directly
+        pids = []
+        while True:
+            try:
+                pids.append(worker_pids.get_nowait())
+            except queue.Empty:
+                break
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass  # Already exited
+        pool.shutdown(wait=False, cancel_futures=True)
+        worker_pids.close()
+
+    def extract_pages(self, pdf_bytes: bytes) -> tuple[list[str], dict]:
+        """
+        Extract page texts in order on the worker pool, in parallel for long documents.
+
+        Short documents go to the pool as a single page range, and the page count
+        is taken on the pool too, so every document is bounded by timeout_seconds
+        and a stuck parser never blocks the caller.
+
+        Args:
+            pdf_bytes (bytes): PDF file contents
+
+        Returns:
+            tuple: (non-empty page texts in page order, tier info from merge_tier_info)
+
+        Raises:
+            TimeoutError: If the document takes longer than timeout_seconds
+        """
+        try:
+            return self._extract_pages_once(pdf_bytes)
+        except BrokenProcessPool:
+            # Another document's timeout tore the pool down under us; retry once on a fresh pool
+            return self._extract_pages_once(pdf_bytes)
+
+    def _extract_pages_once(self, pdf_bytes: bytes) -> tuple[list[str], dict]:
+        pool = self._get_pool()
+        # A single deadline covers the whole document: counting and every page range
+        deadline = time.monotonic() + self.timeout_seconds
+        try:
+            page_count = pool.submit(count_pdf_pages, pdf_bytes).result(timeout=max(0.0, deadline - time.monotonic()))
+            # Splitting only pays off when more than one worker can take a range
+            chunk = self.pages_per_chunk if self.max_workers > 1 else max(1, page_count)
+            futures = [
+                pool.submit(extract_page_range_tiered, pdf_bytes, start, min(start + chunk, page_count))
+                for start in range(0, max(1, page_count), chunk)
+            ]
+
+            page_texts, infos = [], []
+            for future in futures:
+                texts, info = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                page_texts.extend(texts)
+                infos.append(info)
+        except FutureTimeoutError:
+            self._reset_pool(pool)
+            raise TimeoutError(f"PDF extraction exceeded {self.timeout_seconds}s")
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise
+        return page_texts, merge_tier_info(infos)
+
+    def extract_document(self, pdf_bytes: bytes) -> tuple[str | None, str | None, dict | None]:
+        """
+        Extract and clean text for one document, reporting the tier used.
+
+        Args:
+            pdf_bytes (bytes): PDF file contents
+
+        Returns:
+            tuple: (text, None, tier info) on success or (None, error message, tier info or None)
+        """
+        try:
+            page_texts, info = self.extract_pages(pdf_bytes)
+            record_extraction_tier(info)
+            return (*clean_extracted_text(page_texts), info)
+        except TimeoutError:
+            return None, TIMEOUT_ERROR, None
+        except Exception as e:
+            return None, f"⚠️ Error reading PDF: {str(e)}", None
+
+    def extract_text(self, pdf_bytes: bytes) -> tuple[str | None, str | None]:
+        """
+        Extract and clean text for one document.
+
+        Args:
+            pdf_bytes (bytes): PDF file contents
+
+        Returns:
+            tuple: (text, None) on success or (None, error message)
+        """
+        text, error, _ = self.extract_document(pdf_bytes)
+        return text, error
+
+    def extract_many(self, documents: list[bytes]):
+        """
+        Extract many documents in parallel, one document per worker task.
+
+        Args:
+            documents (list[bytes]): PDF file contents
+
+        Yields:
+            tuple: (index into documents, (text, error)) in completion order
+        """
+        if not documents:
+            return
+
+        broken = []
+        yield from self._extract_many_once(documents, range(len(documents)), broken)
+        if broken:
+            # Documents lost to a torn-down pool get one more attempt on a fresh pool
+            yield from self._extract_many_once(documents, broken, None)
+
+    def _extract_many_once(self, documents: list[bytes], indices, broken: list[int] | None):
+        """
+        Run one pass of extract_many over documents[indices].
+
+        Documents whose worker died with the pool are appended to broken, or
+        reported as errors when broken is None.
+        """
+        pool = self._get_pool()
+        try:
+            futures = {pool.submit(extract_document_text, documents[index]): index for index in indices}
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            for index in indices:
+                if broken is None:
+                    yield index, (None, "⚠️ Error reading PDF: worker pool stopped")
+                else:
+                    broken.append(index)
+            return
+        # Budget one timeout per "wave" of documents the pool can work through
+        waves = math.ceil(len(futures) / self.max_workers)
+        remaining = set(futures)
+        try:
+            for future in as_completed(futures, timeout=self.timeout_seconds * waves):
+                remaining.discard(future)
+                try:
+                    text, error, info = future.result()
+                except BrokenProcessPool as e:
+                    self._reset_pool(pool)
+                    if broken is None:
+                        yield futures[future], (None, f"⚠️ Error reading PDF: {str(e)}")
+                    else:
+                        broken.append(futures[future])
+                    continue
+                if info is not None:
+                    record_extraction_tier(info)
+                yield futures[future], (text, error)
+        except FutureTimeoutError:
+            self._reset_pool(pool)
+            for future in remaining:
+                yield futures[future], (None, TIMEOUT_ERROR)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            worker_pids, self._worker_pids = self._worker_pids, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            worker_pids.close()
+
+
+_engine_instance = None
+_engine_lock = threading.Lock()
+
+
+def get_extraction_engine() -> PdfExtractionEngine:
+    """
+    Get the process-wide extraction engine, creating it on first use.
+
+    Returns:
+        PdfExtractionEngine: Shared engine instance
+    """
+    global _engine_instance
+    if _engine_instance is None:
+        with _engine_lock:
+            if _engine_instance is None:
+                _engine_instance = PdfExtractionEngine()
+    return _engine_instance
+
+
+def extract_text_from_pdf(uploaded_pdf) -> tuple[str | None, str | None]:
+    """
+    Extract resume text from a PDF, serving repeat files from the extraction cache.
+
+    Args:
+        uploaded_pdf: Streamlit UploadedFile, file-like object, path, or bytes
+
+    Returns:
+        tuple: (text, None) on success or (None, error message)
+    """
+    with span("pdf_extract") as stage:
+        try:
+            pdf_bytes = read_pdf_bytes(uploaded_pdf)
+        except Exception as e:
+            stage.fail(e)
+            return None, f"⚠️ Error reading PDF: {str(e)}"
+        stage.set(pdf_bytes=len(pdf_bytes))
+
+        # Streamlit reruns the script on every interaction; parse each distinct file only once
+        cache = get_extraction_cache()
+        cache_key = hash_pdf_bytes(pdf_bytes)
+        cached_result = cache.get(cache_key)
+        record_cache("extraction", cached_result is not None)
+        stage.set(cache="hit" if cached_result is not None else "miss")
+        if cached_result is not None:
+            return cached_result
+
+        text, error, info = get_extraction_engine().extract_document(pdf_bytes)
+        result = (text, error)
+        if info is not None:
+            stage.set(tier=info['tier'], pages=info['pages'], column_pages=info['column_pages'])
+        if error:
+            stage.fail(error)
+        else:
+            stage.set(text_chars=len(text))
+        # Timeouts and pool failures may be transient, so only cache definitive outcomes
+        if is_cacheable_result(result):
+            cache.set(cache_key, result)
+        return result
+
+
+def extract_texts_from_pdfs(documents: list[bytes]):
+    """
+    Extract many PDFs, serving repeat files from the extraction cache.
+
+    Args:
+        documents (list[bytes]): PDF file contents
+
+    Yields:
+        tuple: (index into documents, (text, error)) in completion order
+    """
+    cache = get_extraction_cache()
+    keys = [hash_pdf_bytes(pdf_bytes) for pdf_bytes in documents]
+
+    misses = []
+    for index, key in enumerate(keys):
+        cached_result = cache.get(key)
+        record_cache("extraction", cached_result is not None)
+        if cached_result is not None:
+            yield index, cached_result
+        else:
+            misses.append(index)
+
+    for position, result in get_extraction_engine().extract_many([documents[i] for i in misses]):
+        index = misses[position]
+        if is_cacheable_result(result):
+            cache.set(keys[index], result)
+        yield index, result
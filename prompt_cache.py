@@ -0,0 +1,268 @@
+"""
+Prompt Cache Module
+Reuses the shared prompt prefix (instructions + job description) across resumes
+"""
+
+import datetime
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from prompts import build_prompt_prefix
+from resume_compactor import estimate_tokens
+
+# Backend and limits (overridable through environment variables)
+PROMPT_CACHE_BACKEND = os.getenv("PROMPT_CACHE_BACKEND", "gemini").lower()  # gemini, local or off
+DEFAULT_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "3600"))
+# Gemini rejects cached contents below a model-specific minimum (1024 tokens for 2.5 Flash)
+DEFAULT_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "1024"))
+# A prefix is not reused this close to its expiry; a fresh one is created instead
+EXPIRY_MARGIN_SECONDS = 60
+# After a failed create, the prefix is sent inline for this long before retrying
+FAILURE_BACKOFF_SECONDS = 300
+# A prefix is cached only once it has been requested this many times within the TTL,
+# so a one-off analysis never pays for a server-side create it would not reuse
+DEFAULT_MIN_USES = int(os.getenv("PROMPT_CACHE_MIN_USES", "2"))
+# Expired entries, backoffs and first sightings are swept at most this often
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def make_prefix_key(model_name: str, prompt_text: str, job_desc: str) -> str:
+    """
+    Build a content-addressed key for one (model, prompt, job description) prefix.
+
+    Args:
+        model_name (str): Gemini model the prefix is used with
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+
+    Returns:
+        str: Hex SHA-256 digest identifying the prefix
+    """
+    digest = hashlib.sha256()
+    for part in (model_name, prompt_text, job_desc):
+        data = (part or "").encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class _PrefixCacheBase:
+    """
+    Shared bookkeeping: one entry per prefix key, created at most once at a
+    time per key once the prefix has been seen min_uses times, expired after
+    the TTL, with hit/creation counters.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, min_tokens: int = DEFAULT_MIN_TOKENS,
+                 min_uses: int = DEFAULT_MIN_USES):
+        """Create an empty prefix cache."""
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.min_uses = max(1, min_uses)
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, holders]; dropped when the last holder leaves
+        self._entries = {}  # key -> (model, expires_at)
+        self._failures = {}  # key -> retry_after
+        self._sightings = {}  # key -> (uses, expires_at) for prefixes not cached yet
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.created = 0
+        self.failures = 0
+        self.skipped = 0
+        self.deferred = 0
+        self.tokens_reused = 0
+
+    def _create(self, model_name: str, base_model, prefix: str):
+        raise NotImplementedError
+
+    def _delete(self, model) -> None:
+        pass
+
+    def _sweep(self, now: float) -> None:
+        # Caller must hold self._lock; expired server-side caches are already gone, so only forget them
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        for table, expiry in ((self._entries, lambda value: value[1]),
+                              (self._failures, lambda value: value),
+                              (self._sightings, lambda value: value[1])):
+            for key in [key for key, value in table.items() if expiry(value) <= now]:
+                del table[key]
+
+    @contextmanager
+    def _locked_key(self, key: str):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+        try:
+            with key_lock[0]:
+                yield
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+
+    def get_model(self, model_name: str, base_model, prompt_text: str, job_desc: str):
+        """
+        Get a model whose context already holds the prompt prefix.
+
+        Args:
+            model_name (str): Gemini model name
+            base_model: Shared GenerativeModel used when no prefix is cached
+            prompt_text (str): HR/ATS instruction prompt
+            job_desc (str): Job description text
+
+        Returns:
+            Model to call with only build_resume_part(...), or None if the
+            full prompt should be sent instead
+        """
+        prefix = build_prompt_prefix(prompt_text, job_desc)
+        prefix_tokens = estimate_tokens(prefix)
+        if prefix_tokens < self.min_tokens:
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        key = make_prefix_key(model_name, prompt_text, job_desc)
+
+        # Concurrent batch requests for one posting wait for a single create call
+        with self._locked_key(key):
+            now = time.time()
+            with self._lock:
+                self._sweep(now)
+                entry = self._entries.get(key)
+                if entry is not None and entry[1] - EXPIRY_MARGIN_SECONDS > now:
+                    self.hits += 1
+                    self.tokens_reused += prefix_tokens
+                    return entry[0]
+                if self._failures.get(key, 0) > now:
+                    return None
+                # Only a prefix that is actually repeated is worth a create call
+                uses, expires_at = self._sightings.get(key, (0, 0))
+                uses = uses + 1 if expires_at > now else 1
+                if uses < self.min_uses:
+                    self._sightings[key] = (uses, now + self.ttl_seconds)
+                    self.deferred += 1
+                    return None
+                self._sightings.pop(key, None)
+
+            try:
+                model = self._create(model_name, base_model, prefix)
+            except Exception as e:
+                print(f"⚠️ Prompt cache unavailable, sending full prompts: {str(e)[:200]}")
+                with self._lock:
+                    self.failures += 1
+                    self._failures[key] = now + FAILURE_BACKOFF_SECONDS
+                return None
+
+            with self._lock:
+                self._entries[key] = (model, now + self.ttl_seconds)
+                self._failures.pop(key, None)
+                self.created += 1
+            return model
+
+    def invalidate(self, model_name: str, prompt_text: str, job_desc: str) -> None:
+        """Forget a prefix (e.g. after the server rejected it) so it is recreated."""
+        key = make_prefix_key(model_name, prompt_text, job_desc)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._delete(entry[0])
+
+    def clear(self) -> None:
+        """Forget every cached prefix."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            self._failures.clear()
+            self._sightings.clear()
+        for model, _ in entries:
+            self._delete(model)
+
+    def stats(self) -> dict:
+        """
+        Get prefix cache metrics.
+
+        Returns:
+            dict: Live prefixes, hits, creations, failures, skipped (too short),
+            deferred (not repeated yet) and tokens reused
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'created': self.created,
+                'failures': self.failures,
+                'skipped': self.skipped,
+                'deferred': self.deferred,
+                'tokens_reused': self.tokens_reused,
+            }
+
+
+class GeminiPrefixCache(_PrefixCacheBase):
+    """
+    Stores each prefix as Gemini cached content, so repeat requests are billed
+    the reduced cached-token rate and skip re-processing the prefix.
+    """
+
+    def __init__(self, generation_config: dict | None = None, **kwargs):
+        """
+        Args:
+            generation_config (dict | None): Generation config for models built on cached content
+        """
+        super().__init__(**kwargs)
+        self.generation_config = generation_config
+
+    def _create(self, model_name: str, base_model, prefix: str):
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        cached_content = caching.CachedContent.create(
+            model=model_name,
+            display_name="careerlens-prompt-prefix",
+            system_instruction=prefix,
+            ttl=datetime.timedelta(seconds=self.ttl_seconds),
+        )
+        return genai.GenerativeModel.from_cached_content(cached_content, generation_config=self.generation_config)
+
+    def _delete(self, model) -> None:
+        # Free server-side storage early; it would expire with the TTL anyway
+        try:
+            from google.generativeai import caching
+
+            caching.CachedContent.get(model.cached_content).delete()
+        except Exception:
+            pass
+
+
+class _PrefixedModel:
+    """Local stand-in for a model built on cached content: prepends the prefix itself."""
+
+    def __init__(self, base_model, prefix: str):
+        self.base_model = base_model
+        self.prefix = prefix
+
+    def generate_content(self, contents, **kwargs):
+        return self.base_model.generate_content(self.prefix + contents, **kwargs)
+
+
+class LocalPrefixCache(_PrefixCacheBase):
+    """
+    In-process stand-in with the same lifecycle as GeminiPrefixCache.
+
+    Sends the same text as an uncached request, so it saves no tokens; it is
+    meant for tests and for checking hit rates without creating server-side caches.
+    """
+
+    def __init__(self, **kwargs):
+        """Create the stand-in cache (no minimum prefix size by default)."""
+        kwargs.setdefault('min_tokens', 0)
+        super().__init__(**kwargs)
+
+    def _create(self, model_name: str, base_model, prefix: str):
+        return _PrefixedModel(base_model, prefix)
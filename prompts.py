@@ -0,0 +1,149 @@
+"""
+Prompts Module
+Instruction prompts for the HR and ATS analyses
+"""
+
+# Prompts for HR and ATS perspective
+HR_PROMPT = """
+You are an experienced HR specialist with strong technical awareness.
+Analyze the resume against the job description provided below.
+
+**Provide a detailed evaluation with:**
+
+## Strengths
+- List 3-5 key strengths where the candidate excels
+- Highlight relevant experience and skills that match well
+
+## Weaknesses/Gaps
+- Identify areas where the candidate falls short
+- Note missing qualifications or experience
+
+## Key Observations
+- Overall fit for the role
+- Cultural and technical alignment
+- Career progression and growth potential
+
+## Recommendation
+- Should we proceed with this candidate? (Yes/No/Maybe)
+- Brief reasoning for your recommendation
+"""
+
+ATS_PROMPT = """
+You are an ATS (Applicant Tracking System) analyzer.
+Evaluate the resume against the job description for ATS compatibility.
+
+**Provide a structured analysis:**
+
+## ATS Score: [X/100]
+Provide a numerical score based on keyword matching and formatting.
+
+## Keyword Analysis
+### Matching Keywords:
+- List keywords from job description found in resume
+
+### Missing Keywords:
+- List critical keywords from job description NOT found in resume
+- Prioritize by importance (high/medium/low)
+
+## Formatting Assessment
+- Rate formatting quality (Good/Fair/Poor)
+- Identify any ATS compatibility issues
+- Note any parsing problems
+
+## Optimization Suggestions
+1. Add these specific keywords: [list]
+2. Improve these sections: [list]
+3. Formatting fixes: [list]
+
+## Summary
+- Overall likelihood of passing ATS screening
+- Top 3 actionable improvements
+"""
+
+# Structured variants: Gemini is constrained to the schemas in analysis_schema.py
+HR_JSON_PROMPT = """
+You are an experienced HR specialist with strong technical awareness.
+Analyze the resume against the job description provided below.
+
+**Respond with a JSON object containing:**
+- fit_score: overall fit for the role, 0-100
+- strengths: 3-5 key strengths, with relevant experience and skills that match well
+- weaknesses: areas where the candidate falls short, missing qualifications or experience
+- observations: cultural and technical alignment, career progression and growth potential
+- recommendation: should we proceed with this candidate? (Yes/No/Maybe)
+- reasoning: brief reasoning for your recommendation
+"""
+
+ATS_JSON_PROMPT = """
+You are an ATS (Applicant Tracking System) analyzer.
+Evaluate the resume against the job description for ATS compatibility.
+
+**Respond with a JSON object containing:**
+- score: numerical score 0-100 based on keyword matching and formatting
+- matched_keywords: keywords from the job description found in the resume
+- missing_keywords: critical keywords NOT found in the resume, each with a priority (high/medium/low)
+- formatting_rating: formatting quality (Good/Fair/Poor)
+- formatting_issues: ATS compatibility issues or parsing problems
+- suggestions: specific, actionable improvements (keywords to add, sections to improve, formatting fixes)
+- recommendation: likelihood of passing ATS screening (Yes/No/Maybe)
+- summary: one or two sentences on the overall result
+"""
+
+BATCH_SCREENING_PROMPT = """
+You are an ATS (Applicant Tracking System) screener.
+Score the resume against the job description for a high-volume shortlist.
+
+**Respond with a JSON object containing:**
+- score: ATS match score, 0-100
+- recommendation: Yes/No/Maybe
+- reasoning: one sentence of reasoning
+"""
+
+
+def build_prompt_prefix(prompt_text: str, job_desc: str) -> str:
+    """
+    Build the part of a request shared by every resume screened for one posting.
+
+    Args:
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+
+    Returns:
+        str: Instruction prompt followed by the job description
+    """
+    return f"""{prompt_text}
+
+=== JOB DESCRIPTION ===
+{job_desc}
+"""
+
+
+def build_resume_part(resume_text: str) -> str:
+    """
+    Build the per-resume part of a request.
+
+    Args:
+        resume_text (str): Extracted resume text
+
+    Returns:
+        str: Resume section of the prompt
+    """
+    return f"""
+=== RESUME TEXT ===
+{resume_text}
+"""
+
+
+def build_full_prompt(prompt_text: str, job_desc: str, resume_text: str) -> str:
+    """
+    Combine the instruction prompt, job description and resume into one request.
+
+    Args:
+        prompt_text (str): HR/ATS instruction prompt
+        job_desc (str): Job description text
+        resume_text (str): Extracted resume text
+
+    Returns:
+        str: Full prompt sent to Gemini
+    """
+    return build_prompt_prefix(prompt_text, job_desc) + build_resume_part(resume_text)
@@ -0,0 +1,246 @@
+"""
+Rate Limiter Module
+Shared adaptive token-bucket limiter and retry scheduler for Gemini calls
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+# Quota and retry policy (overridable through environment variables)
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+DEFAULT_BURST = int(os.getenv("GEMINI_BURST", "5"))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "4"))
+DEFAULT_BASE_DELAY_SECONDS = float(os.getenv("GEMINI_RETRY_BASE_DELAY_SECONDS", "1"))
+DEFAULT_MAX_DELAY_SECONDS = float(os.getenv("GEMINI_RETRY_MAX_DELAY_SECONDS", "60"))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_STATUS_PATTERN = re.compile(r"\b(429|500|502|503|504)\b")
+_RETRY_AFTER_PATTERNS = (
+    re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE),
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+    re.compile(r"retry-after:?\s*([\d.]+)", re.IGNORECASE),
+)
+
+
+def get_status_code(error: Exception) -> int | None:
+    """
+    Best-effort HTTP status code of an SDK exception.
+
+    Args:
+        error (Exception): Exception raised by the SDK
+
+    Returns:
+        int | None: Status code, or None if it cannot be determined
+    """
+    code = getattr(error, 'code', None)
+    try:
+        if code is not None:
+            return int(code)
+    except (TypeError, ValueError):
+        pass
+    match = _STATUS_PATTERN.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """
+    Extract a server-provided retry delay from an exception, if any.
+
+    Args:
+        error (Exception): Exception raised by the SDK
+
+    Returns:
+        float | None: Seconds to wait before retrying
+    """
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is not None:
+        return float(retry_after)
+    message = str(error)
+    for pattern in _RETRY_AFTER_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket limiter shared by every Streamlit session in the process.
+
+    - Waiters are served strictly first-come, first-served
+    - A 429 halves the refill rate and pauses the bucket for the retry-after
+      hint; each success recovers the rate additively up to the quota
+    - Queue depth and wait times are exposed through stats() (queue depth
+      also as the careerlens_gemini_queue_depth gauge)
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 burst: int = DEFAULT_BURST, min_rate_fraction: float = 0.1):
+        """Create a limiter sized to the given per-minute quota."""
+        self.max_rate = max(requests_per_minute, 1.0) / 60.0
+        self.min_rate = self.max_rate * min_rate_fraction
+        self.rate = self.max_rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters = deque()
+        self._condition = threading.Condition()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.retries = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        # Caller must hold the condition lock
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> float:
+        """
+        Block until a request slot is available, in arrival order.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        start = time.monotonic()
+        ticket = object()
+        with self._condition:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._waiters[0] is ticket and now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._waiters.popleft()
+                        break
+                    if self._waiters[0] is ticket:
+                        deficit_wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+                        self._condition.wait(max(self._paused_until - now, deficit_wait, 0.001))
+                    else:
+                        self._condition.wait()
+            except BaseException:
+                # An interrupted waiter (e.g. a stopped Streamlit script) must not keep its place at the head
+                self._waiters.remove(ticket)
+                self._condition.notify_all()
+                raise
+
+            waited = time.monotonic() - start
+            self.acquired += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            # Wake the next waiter so it can take over the head of the queue
+            self._condition.notify_all()
+        return waited
+
+    def record_success(self) -> None:
+        """Recover the refill rate after a successful call."""
+        with self._condition:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """
+        Back off after a 429: halve the rate and honor the retry-after hint.
+
+        Args:
+            retry_after (float | None): Server-provided delay in seconds
+        """
+        with self._condition:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            self._condition.notify_all()
+
+    def record_retry(self) -> None:
+        """Count a retried request."""
+        with self._condition:
+            self.retries += 1
+
+    def stats(self) -> dict:
+        """
+        Get limiter metrics.
+
+        Returns:
+            dict: Queue depth, current rate, wait times and throttle/retry counters
+        """
+        with self._condition:
+            return {
+                'queue_depth': len(self._waiters),
+                'requests_per_minute': self.rate * 60,
+                'acquired': self.acquired,
+                'avg_wait_seconds': self.total_wait_seconds / self.acquired if self.acquired else 0.0,
+                'max_wait_seconds': self.max_wait_seconds,
+                'throttled': self.throttled,
+                'retries': self.retries,
+            }
+
+
+def call_with_retry(func, limiter: AdaptiveRateLimiter, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                    base_delay: float = DEFAULT_BASE_DELAY_SECONDS, max_delay: float = DEFAULT_MAX_DELAY_SECONDS,
+                    on_retry=None):
+    """
+    Call func through the limiter, retrying 429/5xx with exponential backoff and jitter.
+
+    Args:
+        func: Zero-argument callable performing one API request
+        limiter (AdaptiveRateLimiter): Shared limiter
+        max_attempts (int): Total attempts including the first
+        base_delay (float): Backoff delay for the first retry
+        max_delay (float): Upper bound for any single delay
+        on_retry: Optional callable receiving the status code of each retried error
+
+    Returns:
+        Whatever func returns
+
+    Raises:
+        Exception: The last error if it is not retryable or attempts run out
+    """
+    for attempt in range(max_attempts):
+        limiter.acquire()
+        try:
+            result = func()
+        except Exception as error:
+            status = get_status_code(error)
+            if status not in RETRYABLE_STATUS_CODES or attempt == max_attempts - 1:
+                raise
+
+            retry_after = get_retry_after(error)
+            if status == 429:
+                limiter.record_throttle(retry_after)
+            limiter.record_retry()
+            if on_retry is not None:
+                on_retry(status)
+            # Full jitter spreads out sessions that failed at the same moment
+            delay = retry_after if retry_after is not None else random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            time.sleep(min(delay, max_delay))
+        else:
+            limiter.record_success()
+            return result
+
+
+_limiter_instance = None
+_limiter_lock = threading.Lock()
+
+
+def get_gemini_limiter() -> AdaptiveRateLimiter:
+    """
+    Get the process-wide Gemini limiter, creating it on first use.
+
+    Returns:
+        AdaptiveRateLimiter: Shared limiter instance
+    """
+    global _limiter_instance
+    if _limiter_instance is None:
+        with _limiter_lock:
+            if _limiter_instance is None:
+                _limiter_instance = AdaptiveRateLimiter()
+    return _limiter_instance
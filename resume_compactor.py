@@ -0,0 +1,323 @@
+"""
+Resume Compactor Module
+Token-budgeted resume representation: strips page furniture, segments sections, keeps the relevant ones
+"""
+
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+from ats_scorer import extract_job_keywords, extract_terms
+
+# Prompt budget for the resume part of a request (overridable through environment variables)
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "4000"))
+CHARS_PER_TOKEN = 4  # Rough average for English text with Gemini's tokenizer
+MIN_SECTION_TOKENS = 40  # Below this a trimmed section is not worth including
+EDGE_LINES = 3  # Lines at the top/bottom of a page checked for headers and footers
+
+TRIMMED_NOTE = "[...section trimmed]"
+
+_PAGE_NUMBER_PATTERN = re.compile(
+    r"^[\s\-–—|]*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?[\s\-–—|]*$", re.IGNORECASE
+)
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    'summary': ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    'experience': ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience",
+                   "internships", "internship"],
+    'skills': ["skills", "technical skills", "key skills", "core skills", "core competencies",
+               "competencies", "technologies", "tools", "tech stack", "skills and tools"],
+    'education': ["education", "academic background", "academics", "qualifications",
+                  "education and training"],
+    'projects': ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    'certifications': ["certifications", "certificates", "licenses", "courses", "training",
+                       "licenses and certifications"],
+    'achievements': ["achievements", "awards", "honors", "honors and awards", "accomplishments"],
+    'publications': ["publications", "research", "patents"],
+    'volunteer': ["volunteer", "volunteering", "volunteer experience", "leadership", "activities",
+                  "extracurricular activities"],
+    'languages': ["languages"],
+    'interests': ["interests", "hobbies", "hobbies and interests"],
+    'references': ["references"],
+}
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Base priority of each section when the budget is tight; 0 means never sent
+SECTION_WEIGHTS = {
+    'header': 3.0,
+    'experience': 2.0,
+    'skills': 2.0,
+    'projects': 1.5,
+    'education': 1.5,
+    'summary': 1.0,
+    'certifications': 1.0,
+    'other': 0.8,
+    'achievements': 0.8,
+    'publications': 0.6,
+    'volunteer': 0.5,
+    'languages': 0.5,
+    'interests': 0.2,
+    'references': 0.0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of prompt tokens for a piece of text.
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        int: Approximate token count
+    """
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of spaces/tabs, trim line ends and squeeze blank lines.
+
+    Args:
+        text (str): Raw extracted text
+
+    Returns:
+        str: Normalized text
+    """
+    text = (text or "").replace("\xa0", " ").replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"[ \t\f\v]+", " ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _furniture_key(line: str) -> str:
+    # Page numbers differ between pages, so compare lines with digits masked
+    return re.sub(r"\d+", "#", re.sub(r"\s+", " ", line.strip().lower()))
+
+
+def strip_page_furniture(page_texts: list[str]) -> list[str]:
+    """
+    Remove page numbers and headers/footers repeated across pages.
+
+    A line near the top or bottom of a page is treated as a header/footer when
+    the same line (ignoring digits) appears at a page edge on at least half
+    of the pages.
+
+    Args:
+        page_texts (list[str]): Text of each page in order
+
+    Returns:
+        list[str]: Page texts without the repeated lines
+    """
+    pages = [[line for line in (text or "").split("\n")] for text in page_texts]
+
+    def edge_indexes(lines):
+        content = [i for i, line in enumerate(lines) if line.strip()]
+        return set(content[:EDGE_LINES] + content[-EDGE_LINES:])
+
+    repeated = set()
+    if len(pages) >= 2:
+        counts = Counter()
+        for lines in pages:
+            counts.update({_furniture_key(lines[i]) for i in edge_indexes(lines)})
+        threshold = max(2, math.ceil(len(pages) / 2))
+        repeated = {key for key, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for lines in pages:
+        edges = edge_indexes(lines)
+        kept = [
+            line for i, line in enumerate(lines)
+            if i not in edges or not (_PAGE_NUMBER_PATTERN.match(line) or _furniture_key(line) in repeated)
+        ]
+        cleaned.append("\n".join(kept))
+    return cleaned
+
+
+def match_section_heading(line: str) -> str | None:
+    """
+    Recognize a section heading line such as "WORK EXPERIENCE" or "Skills:".
+
+    Args:
+        line (str): One line of resume text
+
+    Returns:
+        str | None: Canonical section name, or None if the line is not a heading
+    """
+    candidate = line.strip()
+    if not candidate or len(candidate) > 40:
+        return None
+    candidate = re.sub(r"[^a-z ]+", " ", candidate.lower().replace("&", " and "))
+    candidate = re.sub(r"\s+", " ", candidate).strip()
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def split_sections(text: str) -> list[dict]:
+    """
+    Segment resume text into sections at recognized headings.
+
+    Text before the first heading (name, contact details) becomes the
+    "header" section.
+
+    Args:
+        text (str): Normalized resume text
+
+    Returns:
+        list[dict]: Sections in document order, each with 'name' and 'text'
+    """
+    sections = [{'name': 'header', 'lines': []}]
+    for line in text.split("\n"):
+        name = match_section_heading(line)
+        if name is not None:
+            sections.append({'name': name, 'lines': [line]})
+        else:
+            sections[-1]['lines'].append(line)
+
+    result = []
+    for section in sections:
+        section_text = "\n".join(section['lines']).strip()
+        if section_text:
+            result.append({'name': section['name'], 'text': section_text})
+    return result
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text at a line boundary so it fits in max_tokens, including the trim note."""
+    max_chars = (max_tokens - estimate_tokens(TRIMMED_NOTE) - 1) * CHARS_PER_TOKEN
+    kept, used = [], 0
+    for line in text.split("\n"):
+        if used + len(line) + 1 > max_chars:
+            if not kept and max_chars > 1:
+                # A first line longer than the budget (e.g. a section extracted without
+                # line breaks) is cut at a word boundary rather than dropping the section
+                cut = line[:max_chars - 1]
+                kept.append(cut.rsplit(" ", 1)[0] if " " in cut else cut)
+            break
+        kept.append(line)
+        used += len(line) + 1
+    if not kept:
+        return ""
+    return "\n".join(kept).rstrip() + "\n" + TRIMMED_NOTE
+
+
+def compact_resume(resume_text: str, job_desc: str = "", token_budget: int = RESUME_TOKEN_BUDGET) -> dict:
+    """
+    Build the resume text sent to Gemini within a token budget.
+
+    Sections are ranked by a base weight (experience and skills first) boosted
+    by how many job-description keywords they contain. Sections are kept
+    whole in that order while they fit; sections too large for the remaining
+    budget are then trimmed at a line boundary or dropped. Kept sections stay
+    in their original order.
+
+    Args:
+        resume_text (str): Extracted resume text
+        job_desc (str): Job description used to rank sections
+        token_budget (int): Maximum resume tokens (<= 0 disables the budget)
+
+    Returns:
+        dict: text, original_tokens, tokens, tokens_saved, and the
+            kept/trimmed/dropped section names
+    """
+    original_tokens = estimate_tokens(resume_text)
+    sections = split_sections(normalize_whitespace(resume_text))
+
+    keywords = extract_job_keywords(job_desc) if job_desc else []
+    total_weight = sum(weight for _, weight in keywords) or 1.0
+
+    def priority(section):
+        base = SECTION_WEIGHTS.get(section['name'], SECTION_WEIGHTS['other'])
+        if base == 0 or not keywords:
+            return base
+        counts, _ = extract_terms(section['text'])
+        relevance = sum(weight for term, weight in keywords if term in counts) / total_weight
+        return base * (1.0 + relevance)
+
+    ranked = sorted(range(len(sections)), key=lambda i: (-priority(sections[i]), i))
+    remaining = token_budget if token_budget > 0 else math.inf
+    chosen, overflow, trimmed, dropped = {}, [], [], []
+    for i in ranked:
+        section = sections[i]
+        cost = estimate_tokens(section['text']) + 1
+        if priority(section) == 0:
+            dropped.append(section['name'])
+        elif cost <= remaining:
+            chosen[i] = section['text']
+            remaining -= cost
+        else:
+            overflow.append(i)
+
+    # Oversized sections are trimmed into what is left, so one long section cannot crowd out the rest
+    for i in overflow:
+        text = _trim_to_tokens(sections[i]['text'], int(remaining)) if remaining >= MIN_SECTION_TOKENS else ""
+        if text:
+            chosen[i] = text
+            remaining -= estimate_tokens(text) + 1
+            trimmed.append(sections[i]['name'])
+        else:
+            dropped.append(sections[i]['name'])
+
+    text = "\n\n".join(chosen[i] for i in sorted(chosen))
+    tokens = estimate_tokens(text)
+    return {
+        'text': text,
+        'original_tokens': original_tokens,
+        'tokens': tokens,
+        'tokens_saved': max(0, original_tokens - tokens),
+        'sections': [sections[i]['name'] for i in sorted(chosen)],
+        'trimmed_sections': trimmed,
+        'dropped_sections': dropped,
+    }
+
+
+class CompactionStats:
+    """Running totals of resume tokens sent versus extracted, across all requests."""
+
+    def __init__(self):
+        """Start with empty counters."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.original_tokens = 0
+        self.sent_tokens = 0
+
+    def record(self, result: dict) -> None:
+        """Add one compact_resume result to the totals."""
+        with self._lock:
+            self.requests += 1
+            self.original_tokens += result['original_tokens']
+            self.sent_tokens += result['tokens']
+
+    def stats(self) -> dict:
+        """
+        Get compaction totals.
+
+        Returns:
+            dict: Request count, original/sent/saved tokens and saved ratio
+        """
+        with self._lock:
+            saved = max(0, self.original_tokens - self.sent_tokens)
+            return {
+                'requests': self.requests,
+                'original_tokens': self.original_tokens,
+                'sent_tokens': self.sent_tokens,
+                'tokens_saved': saved,
+                'saved_ratio': saved / self.original_tokens if self.original_tokens else 0.0,
+            }
+
+
+_stats_instance = CompactionStats()
+
+
+def get_compaction_stats() -> CompactionStats:
+    """
+    Get the process-wide compaction counters.
+
+    Returns:
+        CompactionStats: Shared counters
+    """
+    return _stats_instance
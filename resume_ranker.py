@@ -0,0 +1,146 @@
+"""
+Resume Ranker Module
+Vectorized BM25 / TF-IDF ranking of many resumes against one job description
+"""
+
+import numpy as np
+from scipy import sparse
+
+from ats_scorer import extract_terms
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def build_term_matrix(texts: list[str]) -> tuple[sparse.csr_matrix, dict]:
+    """
+    Build a sparse document-term count matrix.
+
+    Args:
+        texts (list[str]): Extracted resume texts
+
+    Returns:
+        tuple: (CSR matrix of shape (documents, terms), term -> column index)
+    """
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    for row, text in enumerate(texts):
+        counts, _ = extract_terms(text)
+        for term, count in counts.items():
+            col = vocabulary.setdefault(term, len(vocabulary))
+            rows.append(row)
+            cols.append(col)
+            values.append(count)
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float64), (rows, cols)),
+        shape=(len(texts), len(vocabulary)),
+    )
+    return matrix, vocabulary
+
+
+def _query_columns(job_desc: str, vocabulary: dict) -> tuple[np.ndarray, np.ndarray]:
+    counts, _ = extract_terms(job_desc)
+    columns = [vocabulary[term] for term in counts if term in vocabulary]
+    weights = [counts[term] for term in counts if term in vocabulary]
+    return np.asarray(columns, dtype=np.int64), np.asarray(weights, dtype=np.float64)
+
+
+def bm25_scores(job_desc: str, matrix: sparse.csr_matrix, vocabulary: dict,
+                k1: float = BM25_K1, b: float = BM25_B) -> np.ndarray:
+    """
+    Score every document against the job description with Okapi BM25 in one pass.
+
+    Args:
+        job_desc (str): Job description text (the query)
+        matrix (sparse.csr_matrix): Output of build_term_matrix
+        vocabulary (dict): Output of build_term_matrix
+        k1 (float): Term-frequency saturation
+        b (float): Length normalization strength
+
+    Returns:
+        np.ndarray: One score per document
+    """
+    n_docs = matrix.shape[0]
+    columns, query_tf = _query_columns(job_desc, vocabulary)
+    if n_docs == 0 or columns.size == 0:
+        return np.zeros(n_docs)
+
+    doc_lengths = np.asarray(matrix.sum(axis=1)).ravel()
+    avg_length = doc_lengths.mean() or 1.0
+
+    # Restrict to query terms before doing any per-entry math
+    tf = matrix[:, columns].tocsc()
+    df = np.diff(tf.indptr)
+    idf = np.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+
+    # BM25 term saturation applied to the non-zeros only
+    tf = tf.tocoo()
+    norm = k1 * (1 - b + b * doc_lengths[tf.row] / avg_length)
+    saturated = tf.data * (k1 + 1) / (tf.data + norm)
+    weighted = sparse.csr_matrix((saturated, (tf.row, tf.col)), shape=tf.shape)
+    # Query terms that repeat in the job description count proportionally more
+    return weighted @ (idf * query_tf)
+
+
+def tfidf_cosine_scores(job_desc: str, matrix: sparse.csr_matrix, vocabulary: dict) -> np.ndarray:
+    """
+    Score every document by cosine similarity of TF-IDF vectors.
+
+    Args:
+        job_desc (str): Job description text (the query)
+        matrix (sparse.csr_matrix): Output of build_term_matrix
+        vocabulary (dict): Output of build_term_matrix
+
+    Returns:
+        np.ndarray: One score in [0, 1] per document
+    """
+    n_docs = matrix.shape[0]
+    columns, query_tf = _query_columns(job_desc, vocabulary)
+    if n_docs == 0 or columns.size == 0:
+        return np.zeros(n_docs)
+
+    df = np.diff(matrix.tocsc().indptr)
+    idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+
+    weighted = matrix.multiply(idf).tocsr()
+    doc_norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    query = np.zeros(matrix.shape[1])
+    query[columns] = query_tf * idf[columns]
+    query_norm = np.linalg.norm(query) or 1.0
+
+    dots = weighted @ query
+    return dots / (np.where(doc_norms == 0, 1.0, doc_norms) * query_norm)
+
+
+def rank_resumes(job_desc: str, resume_texts: list[str], top_k: int | None = None,
+                 method: str = "bm25") -> list[tuple[int, float]]:
+    """
+    Rank resumes against a job description.
+
+    Args:
+        job_desc (str): Job description text
+        resume_texts (list[str]): Extracted resume texts
+        top_k (int | None): Number of results to return (all if None)
+        method (str): "bm25" or "tfidf"
+
+    Returns:
+        list[tuple[int, float]]: (index into resume_texts, score), best first
+    """
+    if not resume_texts:
+        return []
+    matrix, vocabulary = build_term_matrix(resume_texts)
+    if method == "tfidf":
+        scores = tfidf_cosine_scores(job_desc, matrix, vocabulary)
+    elif method == "bm25":
+        scores = bm25_scores(job_desc, matrix, vocabulary)
+    else:
+        raise ValueError(f"Unknown ranking method: {method}")
+
+    k = len(scores) if top_k is None else min(top_k, len(scores))
+    if k <= 0:
+        return []
+    # argpartition finds the top-k in linear time; only those are sorted
+    top = np.argpartition(-scores, k - 1)[:k]
+    # Stable tie-break on index keeps the ranking reproducible
+    top = sorted(top, key=lambda i: (-scores[i], i))
+    return [(int(i), float(scores[i])) for i in top]
@@ -0,0 +1,304 @@
+"""
+Session Store Module
+Shared, content-addressed, size-bounded storage for per-session payloads (resume text, reports)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from metrics import SESSION_STORE_BYTES, SESSION_STORE_SESSIONS
+
+# Budget and idle expiry (overridable through environment variables)
+DEFAULT_MAX_BYTES = int(float(os.getenv("SESSION_STORE_MAX_MB", "256")) * 1024 * 1024)
+DEFAULT_IDLE_TTL_SECONDS = int(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800"))
+# Idle sessions are looked for at most this often (on the next touch)
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def hash_payload(text: str) -> str:
+    """
+    Compute the content hash a payload is stored under.
+
+    Args:
+        text (str): Payload text
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    """
+    One copy of each payload for the whole process, referenced by sessions:
+    - Sessions hold named slots ("resume", "report", ...) pointing at a digest;
+      session state keeps only the digest
+    - A payload is freed when no slot references it
+    - Sessions not seen for the idle TTL lose their slots
+    - Over the byte budget, the least recently used payloads are evicted
+      (readers then get None and fall back to recomputing)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, idle_ttl_seconds: int = DEFAULT_IDLE_TTL_SECONDS):
+        """Create an empty store."""
+        self.max_bytes = max_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._lock = threading.Lock()
+        self._payloads = OrderedDict()  # digest -> (text, size), least recently used first
+        self._refs = {}  # digest -> set of (session id, slot)
+        self._sessions = {}  # session id -> {'slots': {slot: digest}, 'last_seen': timestamp}
+        self._bytes = 0
+        self._last_sweep = time.time()
+        self.deduplicated = 0
+        self.evicted_idle = 0
+        self.evicted_budget = 0
+
+    def _update_gauges(self) -> None:
+        # Caller must hold the lock
+        SESSION_STORE_BYTES.set(self._bytes)
+        SESSION_STORE_SESSIONS.set(len(self._sessions))
+
+    def _session(self, session_id: str) -> dict:
+        # Caller must hold the lock
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = {'slots': {}, 'last_seen': time.time()}
+        return session
+
+    def _drop_payload(self, digest: str) -> None:
+        # Caller must hold the lock
+        _, size = self._payloads.pop(digest)
+        self._bytes -= size
+        for session_id, slot in self._refs.pop(digest, ()):
+            session = self._sessions.get(session_id)
+            if session is not None and session['slots'].get(slot) == digest:
+                del session['slots'][slot]
+
+    def _unref(self, session_id: str, slot: str) -> None:
+        # Caller must hold the lock
+        session = self._sessions.get(session_id)
+        digest = session['slots'].pop(slot, None) if session else None
+        if digest is None:
+            return
+        refs = self._refs.get(digest)
+        if refs is not None:
+            refs.discard((session_id, slot))
+            if not refs:
+                self._drop_payload(digest)
+
+    def put(self, session_id: str, slot: str, text: str) -> str:
+        """
+        Store a payload (once per content) and point a session slot at it.
+
+        Args:
+            session_id (str): Streamlit session id
+            slot (str): Slot name, e.g. "resume" or "report"
+            text (str): Payload text
+
+        Returns:
+            str: Digest to keep in session state
+        """
+        digest = hash_payload(text)
+        with self._lock:
+            session = self._session(session_id)
+            session['last_seen'] = time.time()
+            if session['slots'].get(slot) != digest:
+                self._unref(session_id, slot)
+            if digest in self._payloads:
+                self._payloads.move_to_end(digest)
+                if (session_id, slot) not in self._refs[digest]:
+                    self.deduplicated += 1
+            else:
+                size = sys.getsizeof(text)
+                self._payloads[digest] = (text, size)
+                self._bytes += size
+                self._refs[digest] = set()
+            self._refs[digest].add((session_id, slot))
+            session['slots'][slot] = digest
+
+            # Keep the newest payload even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._payloads) > 1:
+                oldest = next(iter(self._payloads))
+                if oldest == digest:
+                    self._payloads.move_to_end(digest)
+                    continue
+                self._drop_payload(oldest)
+                self.evicted_budget += 1
+            self._update_gauges()
+        return digest
+
+    def get(self, digest: str | None) -> str | None:
+        """
+        Read a payload by digest.
+
+        Args:
+            digest (str | None): Digest returned by put()
+
+        Returns:
+            str | None: Payload text, or None if it was evicted (or digest is None)
+        """
+        if digest is None:
+            return None
+        with self._lock:
+            entry = self._payloads.get(digest)
+            if entry is None:
+                return None
+            self._payloads.move_to_end(digest)
+            return entry[0]
+
+    def release(self, session_id: str, slot: str | None = None) -> None:
+        """
+        Drop one slot of a session, or the whole session when slot is None.
+
+        Args:
+            session_id (str): Streamlit session id
+            slot (str | None): Slot to drop; None drops every slot (e.g. on logout)
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            for name in ([slot] if slot else list(session['slots'])):
+                self._unref(session_id, name)
+            if slot is None:
+                del self._sessions[session_id]
+            self._update_gauges()
+
+    def touch(self, session_id: str) -> None:
+        """
+        Mark a session active (call once per rerun); occasionally sweeps idle sessions.
+
+        Args:
+            session_id (str): Streamlit session id
+        """
+        now = time.time()
+        with self._lock:
+            self._session(session_id)['last_seen'] = now
+            sweep_due = now - self._last_sweep >= SWEEP_INTERVAL_SECONDS
+        if sweep_due:
+            self.evict_idle(now)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """
+        Drop every session not seen within the idle TTL.
+
+        Args:
+            now (float | None): Current time (defaults to time.time())
+
+        Returns:
+            int: Sessions evicted
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._last_sweep = now
+            idle = [
+                session_id for session_id, session in self._sessions.items()
+                if now - session['last_seen'] > self.idle_ttl_seconds
+            ]
+            for session_id in idle:
+                for slot in list(self._sessions[session_id]['slots']):
+                    self._unref(session_id, slot)
+                del self._sessions[session_id]
+            self.evicted_idle += len(idle)
+            self._update_gauges()
+        return len(idle)
+
+    def session_stats(self, session_id: str) -> dict:
+        """
+        Get the memory attributed to one session.
+
+        Returns:
+            dict: Slots held, bytes referenced, and bytes owned (each payload split across its referrers)
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            slots = dict(session['slots']) if session else {}
+            referenced = owned = 0
+            for digest in set(slots.values()):
+                size = self._payloads[digest][1]
+                referenced += size
+                owned += size / len({ref[0] for ref in self._refs[digest]})
+            return {'slots': len(slots), 'referenced_bytes': referenced, 'owned_bytes': round(owned)}
+
+    def stats(self) -> dict:
+        """
+        Get store-wide metrics for sizing.
+
+        Returns:
+            dict: Payloads, bytes stored and budget, sessions, average/max bytes per session,
+                  duplicate stores avoided and evictions (idle, budget)
+        """
+        with self._lock:
+            per_session = [
+                sum(self._payloads[digest][1] for digest in set(session['slots'].values()))
+                for session in self._sessions.values()
+            ]
+            return {
+                'payloads': len(self._payloads),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'sessions': len(self._sessions),
+                'avg_session_bytes': round(sum(per_session) / len(per_session)) if per_session else 0,
+                'max_session_bytes': max(per_session, default=0),
+                'deduplicated': self.deduplicated,
+                'evicted_idle': self.evicted_idle,
+                'evicted_budget': self.evicted_budget,
+            }
+
+
+def current_session_id() -> str:
+    """
+    Get the id of the Streamlit session running this script.
+
+    Returns:
+        str: Session id, or "default" outside a Streamlit run
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+
+def process_rss_bytes() -> int | None:
+    """
+    Current resident set size of this process.
+
+    Returns:
+        int | None: Bytes, or None where it cannot be read
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Peak rather than current RSS (kilobytes on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """
+    Get the process-wide session payload store.
+
+    Returns:
+        SessionStore: Shared store instance
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = SessionStore()
+    return _instance
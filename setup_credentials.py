@@ -6,19 +6,20 @@ This script helps you set up and manage user credentials for the Resume Analyzer
 Run this to create/update user accounts with hashed passwords.
 """
 
-from auth_config import hash_password, save_config, get_config, create_default_config
-import yaml
+import auth_config
+from auth_config import ensure_config_initialized
 
 def create_credentials_interactive():
     """
     Interactive tool to create/update user credentials.
+
+    Every change goes through the active credential store (CREDENTIAL_BACKEND),
+    so it is visible to the running app whether users live in config.yaml or SQLite.
     """
     print("\n" + "="*60)
     print("📝 RESUME ANALYZER - USER CREDENTIALS SETUP")
     print("="*60)
     
-    config = get_config()
-    
     while True:
         print("\n📋 Choose an option:")
         print("1. Add new user")
@@ -31,22 +32,22 @@ def create_credentials_interactive():
         choice = input("\nEnter choice (1-6): ").strip()
         
         if choice == "1":
-            add_user(config)
+            add_user()
         elif choice == "2":
-            update_password(config)
+            update_password()
         elif choice == "3":
-            remove_user(config)
+            remove_user()
         elif choice == "4":
-            view_users(config)
+            view_users()
         elif choice == "5":
-            reset_defaults(config)
+            reset_defaults()
         elif choice == "6":
             print("\n✅ Setup complete! Exiting...")
             break
         else:
             print("❌ Invalid choice. Please try again.")
 
-def add_user(config: dict) -> None:
+def add_user() -> None:
     """Add a new user to the credentials."""
     print("\n➕ ADD NEW USER")
     print("-" * 40)
@@ -54,7 +55,7 @@ def add_user(config: dict) -> None:
     username = input("Username: ").strip().lower()
     
     # Check if user exists
-    if username in config['credentials']['usernames']:
+    if auth_config.user_exists(username):
         print("❌ User already exists!")
         return
     
@@ -67,28 +68,21 @@ def add_user(config: dict) -> None:
         print("❌ Passwords don't match!")
         return
     
-    if len(password) < 6:
-        print("❌ Password must be at least 6 characters!")
-        return
-    
-    # Add user
-    config['credentials']['usernames'][username] = {
-        'name': name,
-        'password': hash_password(password),
-        'email': email
-    }
-    
-    save_config(config)
-    print(f"✅ User '{username}' added successfully!")
+    # Same validation, hashing and preauthorized-email handling as the sign-up form
+    ok, message = auth_config.add_user(username, name, email, password)
+    if ok:
+        print(f"✅ User '{username}' added successfully!")
+    else:
+        print(f"❌ {message}")
 
-def update_password(config: dict) -> None:
+def update_password() -> None:
     """Update a user's password."""
     print("\n🔐 UPDATE PASSWORD")
     print("-" * 40)
     
     username = input("Username: ").strip().lower()
     
-    if username not in config['credentials']['usernames']:
+    if not auth_config.user_exists(username):
         print("❌ User not found!")
         return
     
@@ -99,40 +93,37 @@ def update_password(config: dict) -> None:
         print("❌ Passwords don't match!")
         return
     
-    if len(password) < 6:
-        print("❌ Password must be at least 6 characters!")
-        return
-    
-    config['credentials']['usernames'][username]['password'] = hash_password(password)
-    save_config(config)
-    print(f"✅ Password for '{username}' updated successfully!")
+    ok, message = auth_config.set_password(username, password)
+    if ok:
+        print(f"✅ Password for '{username}' updated successfully!")
+    else:
+        print(f"❌ {message}")
 
-def remove_user(config: dict) -> None:
+def remove_user() -> None:
     """Remove a user from credentials."""
     print("\n🗑️  REMOVE USER")
     print("-" * 40)
     
     username = input("Username to remove: ").strip().lower()
     
-    if username not in config['credentials']['usernames']:
+    if not auth_config.user_exists(username):
         print("❌ User not found!")
         return
     
     confirm = input(f"Are you sure? This cannot be undone (yes/no): ").strip().lower()
     
     if confirm == "yes":
-        del config['credentials']['usernames'][username]
-        save_config(config)
+        auth_config.remove_user(username)
         print(f"✅ User '{username}' removed successfully!")
     else:
         print("❌ Operation cancelled.")
 
-def view_users(config: dict) -> None:
+def view_users() -> None:
     """Display all users in the system."""
     print("\n👥 ALL USERS")
     print("-" * 40)
     
-    users = config['credentials']['usernames']
+    users = auth_config.list_users()
     
     if not users:
         print("No users found.")
@@ -144,15 +135,14 @@ def view_users(config: dict) -> None:
         print(f"   Email: {info.get('email', 'N/A')}")
         print(f"   Status: ✅ Active")
 
-def reset_defaults(config: dict) -> None:
+def reset_defaults() -> None:
     """Reset credentials to default demo users."""
     print("\n⚠️  RESET TO DEFAULTS")
     print("-" * 40)
     confirm = input("This will overwrite all users. Continue? (yes/no): ").strip().lower()
     
     if confirm == "yes":
-        config = create_default_config()
-        save_config(config)
+        auth_config.reset_to_default_users()
         print("✅ Reset to default users successfully!")
         print("\nDefault Users:")
         print("1. admin / admin123")
@@ -190,10 +180,10 @@ def print_quick_start():
     print("\n" + "="*60)
 
 if __name__ == "__main__":
-    config = get_config()
+    ensure_config_initialized()
     
     # Check if default config was just created
-    if not any(config['credentials']['usernames']):
+    if not auth_config.list_users():
         print_quick_start()
     
     create_credentials_interactive()
@@ -0,0 +1,112 @@
+"""
+Single Flight Module
+Coalesces concurrent identical requests into one in-flight call
+"""
+
+import threading
+from concurrent.futures import Future
+
+from metrics import record_cache
+
+
+class FlightAbandoned(Exception):
+    """Set on a flight whose leader stopped without a result; waiters should retry."""
+
+
+class SingleFlight:
+    """
+    At most one call per key runs at a time; callers arriving while it is in
+    flight wait for it and share its result (or exception).
+
+    Nothing is kept after the call finishes, so this complements rather than
+    replaces the result cache: it covers the window before a result exists.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Label for the coalescing metric (cache="<name>_inflight")
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> Future
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key: str) -> tuple[Future, bool]:
+        """
+        Join the in-flight call for a key, or become its leader.
+
+        A leader must call finish() (or fail()) exactly once, even on error.
+
+        Args:
+            key (str): Request identity (e.g. the analysis cache key)
+
+        Returns:
+            tuple[Future, bool]: (future holding the shared result, True if the caller leads)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+                leader = True
+        record_cache(f"{self.name}_inflight", not leader)
+        return future, leader
+
+    def finish(self, key: str, future: Future, value) -> None:
+        """Publish the leader's result to every waiter and let the next call start afresh."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        future.set_result(value)
+
+    def fail(self, key: str, future: Future, error: BaseException) -> None:
+        """Publish the leader's exception to every waiter."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        future.set_exception(error)
+
+    def abandon(self, key: str, future: Future) -> None:
+        """End a flight without a result (e.g. its reader went away); each waiter retries, one as the new leader."""
+        self.fail(key, future, FlightAbandoned(key))
+
+    def do(self, key: str, func):
+        """
+        Run func once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Request identity
+            func: Zero-argument callable performing the request
+
+        Returns:
+            Whatever func returned (for the leader or any waiter)
+        """
+        future, leader = self.begin(key)
+        while not leader:
+            try:
+                return future.result()
+            except FlightAbandoned:
+                future, leader = self.begin(key)
+        try:
+            value = func()
+        except BaseException as e:
+            self.fail(key, future, e)
+            raise
+        self.finish(key, future, value)
+        return value
+
+    def stats(self) -> dict:
+        """
+        Get coalescing counters.
+
+        Returns:
+            dict: Calls in flight, calls made (leaders) and duplicate requests that joined one
+        """
+        with self._lock:
+            return {'in_flight': len(self._calls), 'leaders': self.leaders, 'coalesced': self.coalesced}
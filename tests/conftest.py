@@ -0,0 +1,23 @@
+"""
+Shared pytest setup: isolate caches and stores, and make the top-level modules importable.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = tempfile.mkdtemp(prefix="careerlens-tests-")
+
+# Set before the app modules are imported, since they read configuration at import time
+os.environ.update({
+    "ANALYSIS_CACHE_PATH": os.path.join(WORK_DIR, "analysis_cache.sqlite3"),
+    "ANALYSIS_JOBS_PATH": os.path.join(WORK_DIR, "analysis_jobs.sqlite3"),
+    "CREDENTIALS_DB_PATH": os.path.join(WORK_DIR, "credentials.sqlite3"),
+    "LLM_BACKEND": "local",
+    "BCRYPT_ROUNDS": "4",
+})
+os.environ.pop("EXTRACTION_CACHE_DIR", None)
+os.environ.pop("METRICS_JSON_LOG", None)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
@@ -0,0 +1,83 @@
+"""
+Tests for the persistent analysis result cache
+"""
+
+import itertools
+
+import pytest
+
+import analysis_cache
+from analysis_cache import AnalysisCache, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # One second per call keeps LRU order deterministic
+    ticks = itertools.count(1_000_000)
+    now = {'value': 0.0}
+
+    def time():
+        now['value'] = float(next(ticks))
+        return now['value']
+
+    monkeypatch.setattr(analysis_cache.time, "time", time)
+    return now
+
+
+def test_key_depends_on_every_part():
+    base = make_cache_key("model", "prompt", "job", "resume")
+
+    assert base == make_cache_key("model", "prompt", "job", "resume")
+    assert base != make_cache_key("other", "prompt", "job", "resume")
+    assert base != make_cache_key("model", "prompt", "job", "resume v2")
+    assert make_cache_key("m", "ab", "c", "") != make_cache_key("m", "a", "bc", "")
+
+
+def test_hit_after_set_and_counters():
+    cache = AnalysisCache(":memory:")
+
+    assert cache.get("key") is None
+    cache.set("key", "report")
+
+    assert cache.get("key") == "report"
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1}
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    AnalysisCache(path).set("key", "report")
+
+    assert AnalysisCache(path).get("key") == "report"
+
+
+def test_expired_entry_is_a_miss(clock, monkeypatch):
+    cache = AnalysisCache(":memory:", ttl_seconds=10)
+    cache.set("key", "report")
+
+    expired = clock['value'] + 11
+    monkeypatch.setattr(analysis_cache.time, "time", lambda: expired)
+
+    assert cache.get("key") is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = AnalysisCache(":memory:", max_entries=2)
+    cache.set("a", "report a")
+    cache.set("b", "report b")
+    cache.get("a")
+    cache.set("c", "report c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "report a"
+    assert cache.get("c") == "report c"
+
+
+def test_clear_resets_entries_and_counters():
+    cache = AnalysisCache(":memory:")
+    cache.set("key", "report")
+    cache.get("key")
+
+    cache.clear()
+
+    assert cache.stats() == {'hits': 0, 'misses': 0, 'hit_rate': 0.0, 'entries': 0}
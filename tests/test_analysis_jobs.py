@@ -0,0 +1,158 @@
+"""
+Tests for the background analysis job queue and its stores
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from analysis_jobs import (
+    INTERRUPTED_ERROR, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING, InMemoryJobStore, JobQueue,
+    SqliteJobStore,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    return InMemoryJobStore() if request.param == "memory" else SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def _wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in (STATUS_DONE, STATUS_FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_result_is_stored(store):
+    queue = JobQueue(store, max_workers=2)
+    release = threading.Event()
+
+    def analysis():
+        release.wait(5)
+        return {'score': 80}, None
+
+    job_id = queue.submit(analysis, owner="alice", label="resume.pdf", meta={'kind': "ats"})
+    assert queue.get(job_id)['status'] in (STATUS_QUEUED, STATUS_RUNNING)
+    release.set()
+    job = _wait_for(queue, job_id)
+    queue.shutdown()
+
+    assert job['status'] == STATUS_DONE
+    assert job['result'] == {'score': 80}
+    assert job['meta'] == {'kind': "ats"}
+    assert job['finished_at'] >= job['started_at'] >= job['created_at']
+
+
+def test_errors_and_exceptions_fail_the_job(store):
+    queue = JobQueue(store, max_workers=1)
+
+    def boom():
+        raise RuntimeError("backend exploded")
+
+    returned = queue.submit(lambda: (None, "⚠️ API quota exceeded."))
+    raised = queue.submit(boom)
+
+    assert _wait_for(queue, returned)['error'] == "⚠️ API quota exceeded."
+    failed = _wait_for(queue, raised)
+    queue.shutdown()
+    assert failed['status'] == STATUS_FAILED
+    assert "backend exploded" in failed['error']
+
+
+def test_jobs_are_listed_per_owner_newest_first(store):
+    queue = JobQueue(store, max_workers=1)
+    first = queue.submit(lambda: ("a", None), owner="alice", label="first")
+    queue.submit(lambda: ("b", None), owner="bob", label="other")
+    second = queue.submit(lambda: ("c", None), owner="alice", label="second")
+    queue.shutdown()
+
+    assert [job['id'] for job in queue.list_jobs("alice")] == [second, first]
+
+
+def test_job_ids_only_resolve_to_their_owners_jobs(store):
+    queue = JobQueue(store, max_workers=1)
+    mine = queue.submit(lambda: ("my report", None), owner="alice")
+    theirs = queue.submit(lambda: ("their report", None), owner="bob")
+    queue.shutdown()
+
+    assert [job['id'] for job in queue.get_owned([theirs, "unknown", mine], "alice")] == [mine]
+    assert queue.get_owned([mine], None) == []
+
+
+def test_jobs_left_by_a_dead_process_are_failed_on_start(tmp_path):
+    # Only the SQLite store outlives the process that created its jobs
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    store.create({'id': "orphan", 'owner': "alice", 'label': "", 'status': STATUS_RUNNING, 'meta': {},
+                  'pid': os.getpid() + 1, 'lease': "gone", 'created_at': time.time() - 3600,
+                  'heartbeat_at': time.time() - 3600})
+
+    queue = JobQueue(store, max_workers=1)
+    queue.shutdown()
+
+    job = queue.get("orphan")
+    assert (job['status'], job['error']) == (STATUS_FAILED, INTERRUPTED_ERROR)
+
+
+def test_jobs_of_another_live_process_survive_a_new_queue(tmp_path):
+    # Several server processes share one job database
+    path = str(tmp_path / "jobs.sqlite3")
+    release = threading.Event()
+    other = JobQueue(SqliteJobStore(path), max_workers=1, heartbeat_seconds=0.05)
+    job_id = other.submit(lambda: release.wait(5) and ("report", None), owner="alice")
+    time.sleep(0.3)  # Several heartbeat intervals: the job is kept alive by its lease, not its age
+
+    queue = JobQueue(SqliteJobStore(path), max_workers=1, heartbeat_seconds=0.05)
+    time.sleep(0.3)
+    assert queue.get(job_id)['status'] in (STATUS_QUEUED, STATUS_RUNNING)
+
+    release.set()
+    other.shutdown()
+    queue.shutdown()
+    assert (queue.get(job_id)['status'], queue.get(job_id)['result']) == (STATUS_DONE, "report")
+
+
+def test_jobs_whose_heartbeat_stops_are_failed_by_a_running_queue(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.sqlite3"))
+    queue = JobQueue(store, max_workers=1, heartbeat_seconds=0.05)
+    store.create({'id': "orphan", 'owner': "alice", 'label': "", 'status': STATUS_QUEUED, 'meta': {},
+                  'pid': os.getpid(), 'lease': "crashed", 'created_at': time.time(),
+                  'heartbeat_at': time.time()})
+
+    deadline = time.time() + 5
+    while queue.get("orphan")['status'] != STATUS_FAILED and time.time() < deadline:
+        time.sleep(0.05)
+    queue.shutdown()
+
+    assert queue.get("orphan")['error'] == INTERRUPTED_ERROR
+
+
+def test_databases_without_lease_columns_are_migrated(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, owner TEXT, label TEXT, status TEXT NOT NULL, meta TEXT, "
+                 "result TEXT, error TEXT, pid INTEGER, created_at REAL NOT NULL, started_at REAL, finished_at REAL)")
+    conn.commit()
+    conn.close()
+
+    queue = JobQueue(SqliteJobStore(path), max_workers=1)
+    job_id = queue.submit(lambda: ("report", None), owner="alice")
+    queue.shutdown()
+
+    assert queue.get(job_id)['lease'] == queue.lease
+
+
+def test_old_finished_jobs_are_purged(store):
+    store.create({'id': "old", 'owner': "alice", 'label': "", 'status': STATUS_DONE, 'meta': {},
+                  'pid': os.getpid(), 'created_at': time.time() - 3600})
+
+    queue = JobQueue(store, max_workers=1, retention_seconds=60)
+    queue.shutdown()
+
+    assert queue.get("old") is None
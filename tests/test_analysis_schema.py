@@ -0,0 +1,91 @@
+"""
+Tests for structured analysis parsing and rendering
+"""
+
+import json
+
+import pytest
+
+from analysis_schema import (
+    STRUCTURED_ANALYSES, AtsAnalysis, KeywordGap, ScreeningResult, analysis_to_json, parse_analysis,
+)
+from llm_backend import LocalBackend
+
+ATS_RESPONSE = {
+    'score': 72,
+    'matched_keywords': ["Python", " Django "],
+    'missing_keywords': [{'keyword': "Kubernetes", 'priority': "HIGH"}],
+    'formatting_rating': "good",
+    'formatting_issues': [],
+    'suggestions': ["Add a skills section"],
+    'recommendation': "yes",
+    'summary': "Strong backend match.",
+}
+
+
+def test_ats_response_is_validated_and_normalized():
+    result, error = parse_analysis('ats', json.dumps(ATS_RESPONSE))
+
+    assert error is None
+    assert result.matched_keywords == ["Python", "Django"]
+    assert result.missing_keywords == [KeywordGap("Kubernetes", "high")]
+    assert (result.formatting_rating, result.recommendation) == ("Good", "Yes")
+
+
+def test_code_fence_is_tolerated():
+    result, error = parse_analysis('screening', '```json\n{"score": 40, "recommendation": "No", "reasoning": "x"}\n```')
+
+    assert error is None
+    assert result == ScreeningResult(40, "No", "x")
+
+
+@pytest.mark.parametrize("score, expected", [("85", 85), (85.0, 85), (140, 100), (-5, 0)])
+def test_scores_are_coerced_and_clamped(score, expected):
+    result, _ = parse_analysis('screening', json.dumps({'score': score, 'recommendation': "Maybe", 'reasoning': ""}))
+
+    assert result.score == expected
+
+
+@pytest.mark.parametrize("output", [
+    "not json",
+    "[1, 2]",
+    json.dumps({'score': True, 'recommendation': "Yes", 'reasoning': ""}),
+    json.dumps({'score': 50, 'recommendation': "Definitely", 'reasoning': ""}),
+    json.dumps({'score': 50, 'recommendation': "Yes"}),
+])
+def test_invalid_responses_return_an_error(output):
+    result, error = parse_analysis('screening', output)
+
+    assert result is None
+    assert error.startswith("⚠️ Gemini returned an invalid structured response")
+
+
+def test_json_round_trip():
+    result, _ = parse_analysis('ats', json.dumps(ATS_RESPONSE))
+
+    again, error = parse_analysis('ats', analysis_to_json(result))
+
+    assert error is None and again == result
+
+
+def test_markdown_keeps_report_headings():
+    result = AtsAnalysis.from_dict(ATS_RESPONSE)
+
+    markdown = result.to_markdown()
+
+    assert markdown.startswith("## ATS Score: 72/100")
+    assert "- Kubernetes (high)" in markdown
+    assert "1. Add a skills section" in markdown
+
+
+@pytest.mark.parametrize("kind", sorted(STRUCTURED_ANALYSES))
+def test_local_backend_output_matches_each_schema(kind):
+    schema, result_type = STRUCTURED_ANALYSES[kind]
+    response = LocalBackend().get_model("models/local").generate_content(
+        f"{kind} prompt", generation_config={'response_mime_type': 'application/json', 'response_schema': schema},
+    )
+
+    result, error = parse_analysis(kind, response.text)
+
+    assert error is None
+    assert isinstance(result, result_type)
@@ -0,0 +1,64 @@
+"""
+Tests for the offline keyword-match ATS scorer
+"""
+
+from ats_scorer import extract_job_keywords, extract_terms, format_score_report, normalize_token, score_resume
+
+JOB_DESC = """
+Senior Python Developer
+We are looking for a developer with strong Python, Django and PostgreSQL skills.
+Experience with Docker and Kubernetes is required. Machine learning experience is a plus.
+"""
+
+
+def test_plurals_are_normalized():
+    assert normalize_token("developers") == "developer"
+    assert normalize_token("aws") == "aws"
+    assert normalize_token("business") == "business"
+
+
+def test_bigrams_stop_at_punctuation_and_stopwords():
+    counts, surface = extract_terms("Machine Learning, Python and Django")
+
+    assert counts["machine learning"] == 1
+    assert "learning python" not in counts
+    assert "python django" not in counts
+    assert surface["machine learning"] == "machine learning"
+
+
+def test_known_skills_outweigh_generic_words():
+    weights = dict(extract_job_keywords(JOB_DESC))
+
+    assert "we" not in weights and "experience" not in weights
+    assert weights["python"] > weights["senior"]
+    # A known skill phrase is kept even once; an incidental word pair is not
+    assert "machine learning" in weights
+    assert "senior python" not in weights
+
+
+def test_matching_resume_scores_higher():
+    strong = score_resume(JOB_DESC, "Senior Python developer: Django, PostgreSQL, Docker, Kubernetes, machine learning.")
+    weak = score_resume(JOB_DESC, "Marketing coordinator with social media and event planning background.")
+
+    assert strong['score'] > 80 > 20 > weak['score']
+    assert "python" in strong['matched_keywords']
+    assert {'keyword': "python", 'priority': "high"} in weak['missing_keywords']
+
+
+def test_scoring_is_deterministic():
+    resume = "Python and Docker engineer"
+
+    assert score_resume(JOB_DESC, resume) == score_resume(JOB_DESC, resume)
+
+
+def test_empty_job_description_scores_zero():
+    assert score_resume("", "Python developer") == {'score': 0, 'matched_keywords': [], 'missing_keywords': []}
+
+
+def test_report_lists_keywords():
+    report = format_score_report({'score': 50, 'matched_keywords': ["python"],
+                                  'missing_keywords': [{'keyword': "docker", 'priority': "high"}]})
+
+    assert report.startswith("## ATS Score: 50/100")
+    assert "- python" in report
+    assert "- docker (high)" in report
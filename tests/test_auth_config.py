@@ -0,0 +1,79 @@
+"""
+Tests for lazy credential bootstrap and sign-up
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import auth_config
+
+
+@pytest.fixture
+def yaml_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_config, "CREDENTIALS_FILE", str(tmp_path / "config.yaml"))
+    monkeypatch.setattr(auth_config, "CREDENTIAL_BACKEND", "yaml")
+    monkeypatch.setattr(auth_config, "_yaml_store", None)
+    monkeypatch.setattr(auth_config, "_credential_store", None)
+    monkeypatch.setattr(auth_config, "_config_initialized", False)
+    return tmp_path
+
+
+@pytest.fixture
+def count_defaults(monkeypatch):
+    calls = []
+    original = auth_config.create_default_config
+
+    def create_default_config():
+        calls.append(1)
+        time.sleep(0.05)  # Widen the window for a second bootstrap to slip in
+        return original()
+
+    monkeypatch.setattr(auth_config, "create_default_config", create_default_config)
+    return calls
+
+
+def test_import_has_no_side_effects(tmp_path):
+    subprocess.run([sys.executable, "-c", "import auth_config"], cwd=tmp_path, check=True,
+                   env={**os.environ, "PYTHONPATH": os.path.dirname(auth_config.__file__)})
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_bootstrap_creates_the_config_once(yaml_backend, count_defaults):
+    auth_config.ensure_config_initialized()
+    written = os.stat(yaml_backend / "config.yaml").st_mtime_ns
+    auth_config.ensure_config_initialized()
+
+    assert len(count_defaults) == 1
+    assert os.stat(yaml_backend / "config.yaml").st_mtime_ns == written
+    assert auth_config.get_user("admin") is not None
+
+
+def test_concurrent_bootstrap_runs_once(yaml_backend, count_defaults):
+    threads = [threading.Thread(target=auth_config.ensure_config_initialized) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(count_defaults) == 1
+    assert auth_config._config_initialized
+    assert set(auth_config.list_users()) == {"admin", "demo", "john_doe"}
+
+
+def test_sign_up_is_usable_immediately_without_sleeping(yaml_backend, monkeypatch):
+    auth_config.ensure_config_initialized()
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+
+    ok, _ = auth_config.add_user("alice", "Alice", "alice@example.com", "correct-horse")
+
+    assert ok and sleeps == []
+    stored, user = auth_config.get_user("Alice")
+    assert stored == "alice"
+    assert auth_config.verify_password("correct-horse", user['password'])
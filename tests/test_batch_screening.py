@@ -0,0 +1,135 @@
+"""
+Tests for batch screening file collection and scheduling
+"""
+
+import io
+import threading
+import time
+import zipfile
+
+import batch_screening
+from analysis_schema import ScreeningResult
+from batch_screening import batch_results_key, collect_batch_files, count_batch_files, screen_resumes
+
+
+class FakeUpload:
+    """Minimal stand-in for a Streamlit UploadedFile."""
+
+    def __init__(self, name: str, data: bytes, file_id: str | None = None):
+        self.name = name
+        self._data = data
+        self.file_id = file_id or name
+
+    def getvalue(self) -> bytes:
+        return self._data
+
+
+def make_zip(members: dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_collects_pdfs_and_zip_members():
+    archive = make_zip({"a.pdf": b"%PDF-a", "docs/b.pdf": b"%PDF-b", "notes.txt": b"x", "__MACOSX/c.pdf": b"x"})
+
+    documents, warnings = collect_batch_files([FakeUpload("one.pdf", b"%PDF-1"), FakeUpload("all.zip", archive)])
+
+    assert documents == [("one.pdf", b"%PDF-1"), ("a.pdf", b"%PDF-a"), ("b.pdf", b"%PDF-b")]
+    assert warnings == []
+
+
+def test_stops_at_max_files_while_iterating(monkeypatch):
+    monkeypatch.setattr(batch_screening, "MAX_BATCH_FILES", 2)
+    archive = make_zip({f"{i}.pdf": b"%PDF" for i in range(5)})
+    read = []
+    original = batch_screening._read_member
+    monkeypatch.setattr(batch_screening, "_read_member", lambda archive, info: read.append(info.filename) or original(archive, info))
+
+    documents, warnings = collect_batch_files([FakeUpload("all.zip", archive)])
+
+    assert [name for name, _ in documents] == ["0.pdf", "1.pdf"]
+    assert read == ["0.pdf", "1.pdf"]
+    assert len(warnings) == 1
+
+
+def test_oversized_member_is_skipped_without_decompressing(monkeypatch):
+    monkeypatch.setattr(batch_screening, "MAX_FILE_BYTES", 1000)
+    # Highly compressible: tiny in the archive, large once inflated
+    archive = make_zip({"bomb.pdf": b"\0" * 100_000, "ok.pdf": b"%PDF-ok"})
+
+    documents, warnings = collect_batch_files([FakeUpload("all.zip", archive)])
+
+    assert documents == [("ok.pdf", b"%PDF-ok")]
+    assert "bomb.pdf" in warnings[0]
+
+
+def test_total_uncompressed_bytes_are_capped(monkeypatch):
+    monkeypatch.setattr(batch_screening, "MAX_TOTAL_BYTES", 250)
+    archive = make_zip({f"{i}.pdf": bytes(100) for i in range(5)})
+
+    documents, warnings = collect_batch_files([FakeUpload("all.zip", archive)])
+
+    assert len(documents) == 2
+    assert len(warnings) == 1
+
+
+def test_corrupt_zip_is_reported():
+    documents, warnings = collect_batch_files([FakeUpload("broken.zip", b"not a zip")])
+
+    assert documents == []
+    assert "broken.zip" in warnings[0]
+
+
+def test_ready_count_matches_collection_without_decompressing(monkeypatch):
+    monkeypatch.setattr(batch_screening, "MAX_FILE_BYTES", 1000)
+    monkeypatch.setattr(batch_screening, "MAX_BATCH_FILES", 3)
+    archive = make_zip({"bomb.pdf": b"\0" * 100_000, **{f"{i}.pdf": b"%PDF" for i in range(5)}})
+    uploads = [FakeUpload("one.pdf", b"%PDF-1"), FakeUpload("all.zip", archive)]
+    read = []
+    original = batch_screening._read_member
+    monkeypatch.setattr(batch_screening, "_read_member", lambda archive, info: read.append(info.filename) or original(archive, info))
+
+    ready, warnings = count_batch_files(uploads)
+
+    assert read == []
+    assert (ready, warnings) == (3, collect_batch_files(uploads)[1])
+    assert len(read) == 2
+
+
+def test_results_key_tracks_job_description_and_files():
+    files = [FakeUpload("a.pdf", b"", "id-1"), FakeUpload("b.pdf", b"", "id-2")]
+
+    key = batch_results_key("Python developer", files)
+
+    assert key == batch_results_key("Python developer", list(files))
+    assert key != batch_results_key("Java developer", files)
+    assert key != batch_results_key("Python developer", files[:1])
+
+
+def test_closing_the_generator_cancels_queued_screenings(monkeypatch):
+    resume = "Python developer with Django, AWS and PostgreSQL experience. " * 5
+    extractions = [(0, (resume, None)), (1, (resume, None)), (2, (None, "⚠️ Error reading PDF"))]
+    monkeypatch.setattr(batch_screening, "extract_texts_from_pdfs", lambda documents: iter(extractions))
+    release = threading.Event()
+    screened = []
+
+    def fake_analyze(job_desc, text, prompt_text, kind):
+        screened.append(text)
+        release.wait(5)
+        return ScreeningResult(score=80, recommendation="Interview", reasoning="Strong match"), None
+
+    monkeypatch.setattr(batch_screening, "analyze_resume_structured", fake_analyze)
+    documents = [("a.pdf", b"a"), ("b.pdf", b"b"), ("c.pdf", b"c")]
+
+    rows = screen_resumes("Python developer", documents, max_concurrency=1)
+    assert next(rows)["Resume"] == "c.pdf"  # The first screening is running, the second is queued
+    started = time.monotonic()
+    rows.close()
+    assert time.monotonic() - started < 1  # Does not wait for the running call
+
+    release.set()
+    time.sleep(0.5)  # Long enough for a queued call to start if it had not been cancelled
+    assert len(screened) == 1
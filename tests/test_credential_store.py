@@ -0,0 +1,242 @@
+"""
+Tests for the YAML and SQLite credential stores
+"""
+
+import os
+
+import pytest
+import yaml
+
+import auth_config
+import credential_store
+from credential_store import SqliteCredentialStore, YamlCredentialStore
+
+
+def default_config() -> dict:
+    return {
+        'credentials': {'usernames': {'admin': {'name': 'Admin', 'email': 'admin@example.com', 'password': 'hash-a'}}},
+        'cookie': {'expiry_days': 30, 'key': 'test', 'name': 'test'},
+        'preauthorized': {'emails': ['admin@example.com']},
+    }
+
+
+def record(email: str, password: str = "hash") -> dict:
+    return {'name': email.split("@")[0], 'email': email, 'password': password}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    return str(tmp_path / "config.yaml")
+
+
+@pytest.fixture
+def yaml_store(config_path):
+    return YamlCredentialStore(config_path, default_config)
+
+
+def read_yaml(path: str) -> dict:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def test_yaml_store_creates_default_config(yaml_store, config_path):
+    assert yaml_store.load()['credentials']['usernames']['admin']['email'] == "admin@example.com"
+    assert read_yaml(config_path)['cookie']['key'] == "test"
+
+
+def test_yaml_lookup_is_case_insensitive(yaml_store):
+    stored, user = yaml_store.get_user("ADMIN")
+    assert stored == "admin"
+    assert user['password'] == "hash-a"
+    assert yaml_store.get_user("nobody") is None
+
+
+def test_yaml_sign_up_is_journaled_and_visible_to_other_instances(yaml_store, config_path):
+    assert yaml_store.add_user("alice", record("alice@example.com"))
+    assert not yaml_store.add_user("ALICE", record("other@example.com"))
+
+    # The YAML file is not rewritten for a sign-up
+    assert "alice" not in read_yaml(config_path)['credentials']['usernames']
+    other = YamlCredentialStore(config_path, default_config)
+    assert other.get_user("alice")[1]['email'] == "alice@example.com"
+    assert "alice@example.com" in other.preauthorized_emails()
+
+
+def test_yaml_journal_is_compacted(yaml_store, config_path, monkeypatch):
+    monkeypatch.setattr(credential_store, "JOURNAL_COMPACT_THRESHOLD", 2)
+    yaml_store.add_user("alice", record("alice@example.com"))
+    yaml_store.add_user("bob", record("bob@example.com"))
+
+    assert {"alice", "bob"} <= set(read_yaml(config_path)['credentials']['usernames'])
+    assert not os.path.exists(config_path + ".journal")
+
+
+def test_yaml_remove_and_replace_users(yaml_store):
+    yaml_store.add_user("alice", record("alice@example.com"))
+
+    assert yaml_store.remove_user("Alice")
+    assert not yaml_store.remove_user("alice")
+    assert set(yaml_store.list_users()) == {"admin"}
+
+    yaml_store.replace_users({'carol': record("carol@example.com")}, ["carol@example.com"])
+    assert set(yaml_store.list_users()) == {"carol"}
+    assert yaml_store.preauthorized_emails() == ["carol@example.com"]
+
+
+def test_yaml_update_password(yaml_store):
+    assert yaml_store.update_password("admin", "new-hash")
+    assert yaml_store.get_user("admin")[1]['password'] == "new-hash"
+    assert not yaml_store.update_password("nobody", "x")
+
+
+def test_sqlite_store_is_seeded_once(tmp_path, yaml_store):
+    path = str(tmp_path / "users.sqlite3")
+    store = SqliteCredentialStore(path, seed_loader=yaml_store.load)
+    assert set(store.list_users()) == {"admin"}
+    assert store.preauthorized_emails() == ["admin@example.com"]
+
+    # Later YAML edits are not imported again: the database is the source of truth
+    yaml_store.add_user("alice", record("alice@example.com"))
+    reopened = SqliteCredentialStore(path, seed_loader=yaml_store.load)
+    assert reopened.get_user("alice") is None
+
+
+def test_sqlite_sign_up_preauthorizes_email(tmp_path):
+    store = SqliteCredentialStore(str(tmp_path / "users.sqlite3"))
+
+    assert store.add_user("Alice", record("alice@example.com"))
+    assert not store.add_user("alice", record("other@example.com"))
+
+    assert store.get_user("ALICE")[0] == "Alice"
+    assert store.preauthorized_emails() == ["alice@example.com"]
+
+
+def test_sqlite_remove_replace_and_update(tmp_path):
+    store = SqliteCredentialStore(str(tmp_path / "users.sqlite3"))
+    store.add_user("alice", record("alice@example.com"))
+
+    assert store.update_password("ALICE", "new-hash")
+    assert store.get_user("alice")[1]['password'] == "new-hash"
+    assert store.remove_user("alice")
+    assert store.list_users() == {}
+
+    store.replace_users({'bob': record("bob@example.com")}, ["bob@example.com", "team@example.com"])
+    assert set(store.list_users()) == {"bob"}
+    assert store.preauthorized_emails() == ["bob@example.com", "team@example.com"]
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth_config, "CREDENTIALS_FILE", str(tmp_path / "config.yaml"))
+    monkeypatch.setattr(auth_config, "CREDENTIALS_DB_FILE", str(tmp_path / "users.sqlite3"))
+    monkeypatch.setattr(auth_config, "CREDENTIAL_BACKEND", "sqlite")
+    monkeypatch.setattr(auth_config, "_yaml_store", None)
+    monkeypatch.setattr(auth_config, "_credential_store", None)
+    with open(tmp_path / "config.yaml", "w") as f:
+        yaml.dump(default_config(), f)
+    return tmp_path
+
+
+def test_setup_helpers_write_to_the_active_backend(sqlite_backend):
+    ok, _ = auth_config.add_user("alice", "Alice", "alice@example.com", "correct-horse")
+    assert ok
+    assert auth_config.set_password("ALICE", "battery-staple")[0]
+    assert auth_config.verify_password("battery-staple", auth_config.get_user("alice")[1]['password'])
+
+    config = auth_config.get_config()
+    assert set(config['credentials']['usernames']) == {"admin", "alice"}
+    assert "alice@example.com" in config['preauthorized']['emails']
+    # config.yaml is only the seed and is left untouched
+    assert set(read_yaml(str(sqlite_backend / "config.yaml"))['credentials']['usernames']) == {"admin"}
+
+    assert auth_config.remove_user("alice")
+    assert set(auth_config.list_users()) == {"admin"}
+
+
+def test_save_config_with_sqlite_backend(sqlite_backend):
+    config = auth_config.get_config()
+    config['credentials']['usernames']['bob'] = record("bob@example.com")
+    config['cookie']['expiry_days'] = 7
+
+    auth_config.save_config(config)
+
+    assert auth_config.get_user("bob") is not None
+    assert read_yaml(str(sqlite_backend / "config.yaml"))['cookie']['expiry_days'] == 7
+
+
+def test_yaml_load_returns_private_copies(yaml_store):
+    config = yaml_store.load()
+    config['credentials']['usernames']['admin']['password'] = "tampered"
+    config['credentials']['usernames']['mallory'] = record("mallory@example.com")
+
+    assert yaml_store.get_user("admin")[1]['password'] == "hash-a"
+    assert yaml_store.get_user("mallory") is None
+
+
+def test_stale_snapshot_keeps_users_journaled_after_it(yaml_store, config_path):
+    config, version = yaml_store.snapshot()
+    # Another process signs up while this snapshot is being edited
+    YamlCredentialStore(config_path, default_config).add_user("alice", record("alice@example.com"))
+
+    config['cookie']['expiry_days'] = 7
+    yaml_store.save(config, version)
+
+    saved = read_yaml(config_path)
+    assert "alice" in saved['credentials']['usernames']
+    assert saved['preauthorized']['emails'].count("alice@example.com") == 1
+    assert saved['cookie']['expiry_days'] == 7
+
+
+def test_journaled_users_are_not_duplicated_by_case(yaml_store, config_path):
+    yaml_store.add_user("alice", record("alice@example.com"))
+    config, version = yaml_store.snapshot()
+    config['credentials']['usernames']['Alice'] = config['credentials']['usernames'].pop('alice')
+
+    yaml_store.save(config, version)
+    yaml_store.save(yaml_store.load())
+
+    assert [name for name in read_yaml(config_path)['credentials']['usernames'] if name.casefold() == "alice"] == ["Alice"]
+
+
+def test_snapshot_older_than_a_rewrite_is_rejected(yaml_store, config_path):
+    config, version = yaml_store.snapshot()
+    other = YamlCredentialStore(config_path, default_config)
+    other.update_password("admin", "rotated")
+
+    del config['credentials']['usernames']['admin']
+    with pytest.raises(credential_store.CredentialConflictError):
+        yaml_store.save(config, version)
+    assert yaml_store.get_user("admin")[1]['password'] == "rotated"
+
+
+def test_concurrent_sign_ups_survive_a_transaction(yaml_store, config_path):
+    with yaml_store.transaction() as config:
+        config['cookie']['expiry_days'] = 1
+    for index in range(3):
+        YamlCredentialStore(config_path, default_config).add_user(f"user{index}", record(f"user{index}@example.com"))
+    with yaml_store.transaction() as config:
+        config['cookie']['expiry_days'] = 2
+
+    assert {"user0", "user1", "user2"} <= set(read_yaml(config_path)['credentials']['usernames'])
+
+
+def test_missing_user_does_not_rewrite_the_file(yaml_store, config_path):
+    yaml_store.add_user("alice", record("alice@example.com"))
+    before = os.stat(config_path).st_mtime_ns
+
+    assert not yaml_store.update_password("nobody", "hash")
+    assert not yaml_store.remove_user("nobody")
+
+    assert os.stat(config_path).st_mtime_ns == before
+    assert os.path.exists(config_path + ".journal")
+
+
+def test_save_without_version_keeps_deletions(yaml_store, config_path):
+    yaml_store.add_user("alice", record("alice@example.com"))
+    config = yaml_store.load()
+    del config['credentials']['usernames']['alice']
+
+    yaml_store.save(config)
+
+    assert "alice" not in read_yaml(config_path)['credentials']['usernames']
+    assert YamlCredentialStore(config_path, default_config).get_user("alice") is None
@@ -0,0 +1,142 @@
+"""
+Tests for the extracted PDF text cache
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+import pdf_extractor
+from extraction_cache import ExtractionCache, hash_pdf_bytes
+from pdf_extractor import SCANNED_PDF_ERROR, TIMEOUT_ERROR, extract_text_from_pdf
+
+
+class FakeEngine:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def extract_document(self, pdf_bytes):
+        self.calls += 1
+        return (*self.result, None)
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = ExtractionCache(cache_dir=None)
+    monkeypatch.setattr(pdf_extractor, "get_extraction_cache", lambda: cache)
+    return cache
+
+
+def test_hit_after_set():
+    cache = ExtractionCache(cache_dir=None)
+    key = hash_pdf_bytes(b"%PDF-1.4 resume")
+
+    assert cache.get(key) is None
+    cache.set(key, ("resume text", None))
+
+    assert cache.get(key) == ("resume text", None)
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_entry_count_is_bounded():
+    cache = ExtractionCache(max_items=2, cache_dir=None)
+    for key in ("a", "b", "c"):
+        cache.set(key, (key, None))
+
+    assert cache.get("a") is None
+    assert cache.stats()['entries'] == 2
+
+
+def test_memory_budget_evicts_least_recently_used():
+    text = "x" * 10_000
+    cache = ExtractionCache(cache_dir=None, max_bytes=2 * sys.getsizeof(text) + 100)
+    cache.set("a", (text + "a", None))
+    cache.set("b", (text + "b", None))
+    cache.get("a")
+    cache.set("c", (text + "c", None))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_replacing_an_entry_does_not_double_count():
+    cache = ExtractionCache(cache_dir=None)
+    cache.set("a", ("first", None))
+    size = cache.stats()['bytes']
+
+    cache.set("a", ("first", None))
+
+    assert cache.stats()['bytes'] == size
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    ExtractionCache(cache_dir=str(tmp_path)).set("key", (None, "⚠️ Error reading PDF"))
+
+    assert ExtractionCache(cache_dir=str(tmp_path)).get("key") == (None, "⚠️ Error reading PDF")
+
+
+def test_concurrent_disk_writes_of_one_key_leave_a_valid_entry(tmp_path):
+    cache = ExtractionCache(cache_dir=str(tmp_path))
+    writers = [threading.Thread(target=cache.set, args=("k", (f"text {i}" * 1000, None))) for i in range(8)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert ExtractionCache(cache_dir=str(tmp_path)).get("k")[0].startswith("text ")
+    assert [path.name for path in tmp_path.iterdir()] == ["k.json"]
+
+
+def test_failed_disk_write_removes_its_temp_file(tmp_path, monkeypatch):
+    cache = ExtractionCache(cache_dir=str(tmp_path))
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache.set("k", ("text", None))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_repeat_upload_is_not_parsed_again(monkeypatch, fresh_cache):
+    engine = FakeEngine(("resume text", None))
+    monkeypatch.setattr(pdf_extractor, "get_extraction_engine", lambda: engine)
+
+    assert extract_text_from_pdf(b"%PDF-1.4 resume") == ("resume text", None)
+    assert extract_text_from_pdf(b"%PDF-1.4 resume") == ("resume text", None)
+    assert engine.calls == 1
+
+
+def test_timeouts_are_not_cached(monkeypatch, fresh_cache):
+    engine = FakeEngine((None, TIMEOUT_ERROR))
+    monkeypatch.setattr(pdf_extractor, "get_extraction_engine", lambda: engine)
+
+    extract_text_from_pdf(b"%PDF-1.4 slow")
+    extract_text_from_pdf(b"%PDF-1.4 slow")
+
+    assert engine.calls == 2
+
+
+def test_transient_errors_are_not_cached(monkeypatch, fresh_cache):
+    engine = FakeEngine((None, "⚠️ Error reading PDF: A process in the process pool was terminated abruptly"))
+    monkeypatch.setattr(pdf_extractor, "get_extraction_engine", lambda: engine)
+
+    extract_text_from_pdf(b"%PDF-1.4 victim")
+    extract_text_from_pdf(b"%PDF-1.4 victim")
+
+    assert engine.calls == 2
+
+
+def test_scanned_pdf_error_is_cached(monkeypatch, fresh_cache):
+    engine = FakeEngine((None, SCANNED_PDF_ERROR))
+    monkeypatch.setattr(pdf_extractor, "get_extraction_engine", lambda: engine)
+
+    extract_text_from_pdf(b"%PDF-1.4 scanned")
+    extract_text_from_pdf(b"%PDF-1.4 scanned")
+
+    assert engine.calls == 1
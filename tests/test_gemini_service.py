@@ -0,0 +1,185 @@
+"""
+Tests for streaming analyses, their coalescing and concurrent analyses
+"""
+
+import threading
+import time
+
+import pytest
+
+import gemini_service
+from analysis_cache import AnalysisCache
+from single_flight import SingleFlight
+
+JOB = "Backend engineer: Python, Django, PostgreSQL"
+RESUME = "EXPERIENCE\nBuilt Django services on PostgreSQL for five years.\n\nSKILLS\nPython, Django, SQL"
+PROMPT = "Review this resume as an HR manager."
+
+
+class Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+@pytest.fixture
+def service(monkeypatch):
+    cache = AnalysisCache(":memory:")
+    inflight = SingleFlight("test")
+    monkeypatch.setattr(gemini_service, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(gemini_service, "_inflight", inflight)
+    return cache, inflight
+
+
+def fake_responses(monkeypatch, *responses):
+    """Serve each generate_analysis call the next response: chunk texts, events to wait on and exceptions to raise."""
+    calls = []
+
+    def generate(*args, **kwargs):
+        response = responses[len(calls)]
+        calls.append(kwargs)
+
+        def chunks():
+            for item in response:
+                if isinstance(item, threading.Event):
+                    item.wait(5)
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield Chunk(item)
+        return chunks()
+
+    monkeypatch.setattr(gemini_service, "generate_analysis", generate)
+    return calls
+
+
+def start_waiter(inflight):
+    stream = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(chunks=list(stream)))
+    thread.start()
+    while inflight.stats()['coalesced'] < 1:
+        time.sleep(0.01)
+    return stream, thread, result
+
+
+def test_stream_yields_chunks_and_caches_the_full_text(monkeypatch, service):
+    cache, inflight = service
+    calls = fake_responses(monkeypatch, ["Strong ", "candidate"])
+    stream = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+
+    assert list(stream) == ["Strong ", "candidate"]
+    assert stream.text == "Strong candidate" and stream.error is None
+
+    repeat = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    assert list(repeat) == ["Strong candidate"] and repeat.from_cache
+    assert len(calls) == 1 and cache.stats()['entries'] == 1
+
+
+def test_waiter_receives_the_leaders_full_text(monkeypatch, service):
+    cache, inflight = service
+    release = threading.Event()
+    calls = fake_responses(monkeypatch, ["Strong ", release, "candidate"])
+    leader = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    chunks = iter(leader)
+
+    assert next(chunks) == "Strong "
+    waiter, thread, result = start_waiter(inflight)
+    release.set()
+    assert list(chunks) == ["candidate"]
+    thread.join(5)
+
+    assert result['chunks'] == ["Strong candidate"]
+    assert waiter.coalesced and waiter.text == leader.text == "Strong candidate"
+    assert len(calls) == 1
+    assert inflight.stats()['in_flight'] == 0
+
+
+def test_waiter_takes_over_when_the_leader_abandons(monkeypatch, service):
+    cache, inflight = service
+    calls = fake_responses(monkeypatch, ["Partial ", "never read"], ["Complete report"])
+    leader = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    chunks = iter(leader)
+
+    assert next(chunks) == "Partial "
+    waiter, thread, result = start_waiter(inflight)
+    chunks.close()  # The reader went away mid-stream (e.g. a Streamlit rerun)
+    thread.join(5)
+
+    assert result['chunks'] == ["Complete report"]
+    assert not waiter.coalesced and waiter.error is None
+    assert len(calls) == 2
+    # The partial text was never cached; a new request is served the complete one
+    assert list(gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")) == ["Complete report"]
+    assert inflight.stats()['in_flight'] == 0
+
+
+def test_failure_reaches_the_waiter_and_is_not_cached(monkeypatch, service):
+    cache, inflight = service
+    release = threading.Event()
+    calls = fake_responses(monkeypatch, ["Partial ", release, RuntimeError("connection reset")], ["Recovered"])
+    leader = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    chunks = iter(leader)
+
+    assert next(chunks) == "Partial "
+    waiter, thread, result = start_waiter(inflight)
+    release.set()
+    assert list(chunks) == []
+    thread.join(5)
+
+    assert leader.error and leader.error.startswith("⚠️")
+    assert waiter.error == leader.error and result['chunks'] == []
+    assert cache.stats()['entries'] == 0 and len(calls) == 1
+
+    retry = gemini_service.stream_resume_with_gemini(JOB, RESUME, PROMPT, "hr")
+    assert list(retry) == ["Recovered"] and not retry.from_cache
+
+
+def test_analyze_many_yields_in_completion_order(monkeypatch):
+    delays = {"slow": 0.3, "fast": 0.0}
+    monkeypatch.setattr(gemini_service, "analyze_resume_with_gemini",
+                        lambda job_desc, resume_text, prompt_text: time.sleep(delays[prompt_text]) or (prompt_text, None))
+
+    results = list(gemini_service.analyze_many_with_gemini(JOB, RESUME, {"HR": "slow", "ATS": "fast"}))
+
+    assert results == [("ATS", "fast", None), ("HR", "slow", None)]
+
+
+def test_analyze_many_isolates_failing_sections(monkeypatch):
+    def analyze(job_desc, resume_text, prompt_text):
+        if prompt_text == "raises":
+            raise RuntimeError("compaction failed")
+        if prompt_text == "errors":
+            return None, "⚠️ API quota exceeded."
+        return "report", None
+
+    monkeypatch.setattr(gemini_service, "analyze_resume_with_gemini", analyze)
+
+    results = {name: (output, error) for name, output, error in gemini_service.analyze_many_with_gemini(
+        JOB, RESUME, {"A": "raises", "B": "errors", "C": "works"})}
+
+    assert results["A"][0] is None and "compaction failed" in results["A"][1]
+    assert results["B"] == (None, "⚠️ API quota exceeded.")
+    assert results["C"] == ("report", None)
+
+
+def test_analyze_many_is_bounded_by_the_shared_pool(monkeypatch):
+    lock = threading.Lock()
+    running = {'now': 0, 'max': 0}
+
+    def analyze(job_desc, resume_text, prompt_text):
+        with lock:
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+        time.sleep(0.05)
+        with lock:
+            running['now'] -= 1
+        return prompt_text, None
+
+    monkeypatch.setattr(gemini_service, "analyze_resume_with_gemini", analyze)
+    limit = gemini_service._analysis_pool._max_workers
+    prompts = {f"section {index}": str(index) for index in range(limit * 3)}
+
+    results = list(gemini_service.analyze_many_with_gemini(JOB, RESUME, prompts))
+
+    assert len(results) == len(prompts)
+    assert 1 < running['max'] <= limit
@@ -0,0 +1,87 @@
+"""
+Tests for pdfium extraction, column ordering and the fallback to pdfplumber
+"""
+
+import pytest
+
+import pdf_extractor
+from layout_extractor import extract_pages_pdfium, find_gutter, order_columns, text_quality_ok
+from pdf_extractor import TIER_FAST, TIER_FULL, count_pdf_pages, extract_page_range_tiered
+from synthetic_pdf import make_resume_pdf
+
+
+def _two_column_segments():
+    # (left, bottom, right, top, text): a full-width name line over two columns of ten lines
+    segments = [(50, 760, 560, 780, "Jane Doe")]
+    for row in range(10):
+        top = 740 - row * 14
+        segments.append((50, top - 10, 250, top, f"left {row}"))
+        segments.append((320, top - 10, 560, top, f"right {row}"))
+    return segments
+
+
+def test_gutter_found_between_columns():
+    gutter = find_gutter(_two_column_segments(), 612)
+
+    assert gutter is not None and 250 < gutter < 320
+
+
+def test_no_gutter_on_single_column_page():
+    segments = [(50, 740 - row * 14, 560, 750 - row * 14, f"line {row}") for row in range(12)]
+
+    assert find_gutter(segments, 612) is None
+
+
+def test_columns_read_left_then_right():
+    text = order_columns(_two_column_segments(), 285)
+    lines = text.splitlines()
+
+    assert lines[0] == "Jane Doe"
+    assert lines[1:11] == [f"left {row}" for row in range(10)]
+    assert lines[11:] == [f"right {row}" for row in range(10)]
+
+
+def test_two_column_resume_keeps_sections_together():
+    texts, column_pages = extract_pages_pdfium(make_resume_pdf(1, layout="two_column", seed=1))
+    text = texts[0]
+
+    assert column_pages == 1
+    # The whole left column (ending with PROJECTS) comes before the right one
+    assert text.index("SKILLS") < text.index("PROJECTS") < text.index("SUMMARY") < text.index("EXPERIENCE")
+
+
+@pytest.mark.parametrize("texts, ok", [
+    (["Senior engineer with eight years of Python and SQL experience. " * 3], True),
+    (["too short"], False),
+    (["P y t h o n d e v e l o p e r " * 10], False),
+    (["Seniorengineerwitheightyearsofexperience " * 5], False),
+    (["��� engineer " * 20], False),
+])
+def test_text_quality_checks(texts, ok):
+    assert text_quality_ok(texts, 100) is ok
+
+
+def _pdfium_fails(*args, **kwargs):
+    raise RuntimeError("Failed to load document (PDFium: Data format error)")
+
+
+def test_page_count_falls_back_to_pdfplumber(monkeypatch):
+    pdf_bytes = make_resume_pdf(3, seed=4)
+    monkeypatch.setattr(pdf_extractor, "count_pages_pdfium", _pdfium_fails)
+
+    assert count_pdf_pages(pdf_bytes, mode="auto") == 3
+    assert count_pdf_pages(pdf_bytes, mode=TIER_FULL) == 3
+    with pytest.raises(RuntimeError):
+        count_pdf_pages(pdf_bytes, mode="fast")
+
+
+def test_extraction_falls_back_to_pdfplumber(monkeypatch):
+    pdf_bytes = make_resume_pdf(1, seed=5)
+
+    texts, info = extract_page_range_tiered(pdf_bytes, 0, 1, mode="auto")
+    assert info['tier'] == TIER_FAST
+
+    monkeypatch.setattr(pdf_extractor, "extract_pages_pdfium", _pdfium_fails)
+    texts, info = extract_page_range_tiered(pdf_bytes, 0, 1, mode="auto")
+    assert info['tier'] == TIER_FULL
+    assert "EXPERIENCE" in texts[0]
@@ -0,0 +1,167 @@
+"""
+Tests for backend selection, error mapping and model routing
+"""
+
+import json
+import sys
+import types
+
+import pytest
+
+import gemini_service
+import llm_backend
+import metrics
+from analysis_cache import AnalysisCache
+from llm_backend import GeminiBackend, LLMError, LocalBackend, describe_llm_error, to_llm_error
+from model_router import TIER_FAST, TIER_LARGE, TIER_STANDARD, ModelRouter
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+@pytest.fixture
+def fresh_backend(monkeypatch):
+    monkeypatch.setattr(llm_backend, "_backend", None)
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Stand-in for google.generativeai that records configure() and model construction."""
+    genai = types.SimpleNamespace(configured=[], created=[])
+
+    class GenerativeModel:
+        def __init__(self, model_name, generation_config=None):
+            self.model_name = model_name
+            genai.created.append(model_name)
+
+    genai.GenerativeModel = GenerativeModel
+    genai.configure = lambda **kwargs: genai.configured.append(kwargs['api_key'])
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    return genai
+
+
+def test_unknown_backend_is_a_configuration_error(monkeypatch, fresh_backend):
+    monkeypatch.setattr(llm_backend, "LLM_BACKEND", "gemnii")
+
+    with pytest.raises(ValueError, match="gemnii"):
+        llm_backend.get_llm_backend()
+    assert llm_backend._backend is None
+
+
+def test_known_backend_is_selected(monkeypatch, fresh_backend):
+    monkeypatch.setattr(llm_backend, "LLM_BACKEND", "local")
+
+    assert isinstance(llm_backend.get_llm_backend(), LocalBackend)
+
+
+@pytest.mark.parametrize("error, kind", [
+    (ApiError("429 Resource has been exhausted"), "quota"),
+    (ApiError("API key not valid", code=400), "auth"),
+    (ApiError("models/x is not found", code=404), "not_found"),
+    (ApiError("backend error", code=503), "unavailable"),
+    (TimeoutError("read timed out"), "timeout"),
+    (ApiError("something odd"), "unknown"),
+])
+def test_errors_are_classified(error, kind):
+    normalized = to_llm_error(error)
+
+    assert normalized.kind == kind
+    assert normalized.__cause__ is error
+    assert describe_llm_error(error, "models/x").startswith("⚠️")
+
+
+def test_local_backend_answers_schema_requests_with_json():
+    schema = {'type': 'object', 'properties': {'score': {'type': 'integer'}}, 'required': ['score']}
+    model = LocalBackend().get_model("models/local")
+
+    response = model.generate_content("prompt", generation_config={'response_mime_type': 'application/json',
+                                                                   'response_schema': schema})
+
+    assert isinstance(json.loads(response.text)['score'], int)
+
+
+def test_unavailable_routed_model_falls_back_and_is_counted(monkeypatch):
+    calls = []
+
+    def generate(model_name, *args, **kwargs):
+        calls.append(model_name)
+        if model_name != gemini_service.GEMINI_MODEL_NAME:
+            raise LLMError("model not found", "not_found", 404)
+        return "response"
+
+    monkeypatch.setattr(gemini_service, "_generate_with_model", generate)
+    before = metrics.MODEL_FALLBACKS.value(model="models/retired", fallback=gemini_service.GEMINI_MODEL_NAME)
+
+    assert gemini_service.generate_analysis("prompt", "job", "resume", "models/retired") == "response"
+    assert calls == ["models/retired", gemini_service.GEMINI_MODEL_NAME]
+    assert metrics.MODEL_FALLBACKS.value(model="models/retired", fallback=gemini_service.GEMINI_MODEL_NAME) == before + 1
+
+
+def test_router_tiers():
+    router = ModelRouter(enabled=True, fast_max_tokens=100, large_min_tokens=1000,
+                         models={TIER_FAST: "fast", TIER_STANDARD: "standard", TIER_LARGE: "large"})
+
+    assert router.route("prompt", 50, "ats") == (TIER_FAST, "fast")
+    assert router.route("prompt", 500, "ats") == (TIER_STANDARD, "standard")
+    assert router.route("prompt", 50, "hr") == (TIER_LARGE, "large")
+    assert router.route("prompt", 5000, "screening") == (TIER_LARGE, "large")
+    assert router.stats() == {TIER_FAST: 0, TIER_STANDARD: 0, TIER_LARGE: 0}
+    assert ModelRouter(enabled=False).choose_tier("hr", 50_000) == TIER_STANDARD
+
+
+def test_routing_is_off_by_default_and_large_tier_has_its_own_model():
+    router = ModelRouter()
+
+    assert not router.enabled
+    assert router.route("prompt", 50_000, "hr") == (TIER_STANDARD, gemini_service.GEMINI_MODEL_NAME)
+    assert router.models[TIER_LARGE] != router.models[TIER_STANDARD]
+
+
+def test_collapsed_large_tier_is_reported(capsys):
+    ModelRouter(enabled=True, models={TIER_FAST: "fast", TIER_STANDARD: "standard", TIER_LARGE: "standard"})
+
+    assert "GEMINI_LARGE_MODEL_NAME" in capsys.readouterr().out
+
+
+def test_only_requests_sent_to_a_model_are_counted(monkeypatch):
+    router = ModelRouter(enabled=True, models={TIER_FAST: "fast", TIER_STANDARD: "standard", TIER_LARGE: "large"})
+    monkeypatch.setattr(gemini_service, "get_model_router", lambda: router)
+    cache = AnalysisCache(":memory:")
+    monkeypatch.setattr(gemini_service, "get_analysis_cache", lambda: cache)
+    monkeypatch.setattr(llm_backend, "_backend", LocalBackend())
+
+    for _ in range(3):
+        output, error = gemini_service.analyze_resume_with_gemini("Python developer", "Python, Django", "prompt", "ats")
+        assert output and error is None
+
+    assert router.stats() == {TIER_FAST: 1, TIER_STANDARD: 0, TIER_LARGE: 0}
+
+
+def test_gemini_models_are_created_once_per_name(fake_genai):
+    backend = GeminiBackend()
+    backend.configure("key-1")
+
+    flash = backend.get_model("models/gemini-2.5-flash")
+    lite = backend.get_model("models/gemini-2.5-flash-lite")
+
+    assert backend.get_model("models/gemini-2.5-flash") is flash
+    assert lite is not flash and lite.model_name == "models/gemini-2.5-flash-lite"
+    assert fake_genai.created == ["models/gemini-2.5-flash", "models/gemini-2.5-flash-lite"]
+
+
+def test_new_api_key_drops_models_bound_to_the_old_one(fake_genai):
+    backend = GeminiBackend()
+    backend.configure("key-1")
+    old = backend.get_model("models/gemini-2.5-flash")
+
+    assert not backend.configure("key-1")
+    assert backend.get_model("models/gemini-2.5-flash") is old
+    assert backend.configure("key-2")
+    assert backend.get_model("models/gemini-2.5-flash") is not old
+    assert fake_genai.configured == ["key-1", "key-2"]
@@ -0,0 +1,111 @@
+"""
+Tests for stage timing, JSON logging and Prometheus exposition
+"""
+
+import json
+
+import pytest
+
+import metrics
+from metrics import Counter, Gauge, Histogram, classify_error, render_prometheus, span, stage_summary
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+@pytest.fixture
+def json_log(monkeypatch, tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(metrics, "METRICS_JSON_LOG", str(path))
+    return lambda: [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_counter_series_are_labelled():
+    counter = Counter("test_requests_total", "Requests")
+    counter.inc(cache="analysis", result="hit")
+    counter.inc(2, cache="analysis", result="miss")
+
+    assert counter.value(cache="analysis", result="miss") == 2
+    assert 'test_requests_total{cache="analysis",result="hit"} 1' in counter.expose()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Durations", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    lines = histogram.expose()
+
+    assert 'test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{le="1"} 2' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_seconds_sum 5.55" in lines
+
+
+def test_gauge_function_is_read_at_exposition():
+    depth = [3]
+    gauge = Gauge("test_depth", "Depth", function=lambda: depth[0])
+    depth[0] = 7
+
+    assert gauge.expose()[-1] == "test_depth 7"
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ApiError("quota", code=429), "429"),
+    (TimeoutError(), "timeout"),
+    (KeyError("x"), "KeyError"),
+    ("⚠️ Timed out while reading PDF.", "timeout"),
+    ("⚠️ API Error: 503 unavailable", "503"),
+])
+def test_errors_reduce_to_low_cardinality_classes(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_span_logs_fields_and_failures(json_log):
+    with span("test_stage", model="m") as stage:
+        stage.set(pages=2)
+    with pytest.raises(ApiError):
+        with span("test_stage"):
+            raise ApiError("overloaded", code=503)
+
+    ok, failed = json_log()
+
+    assert (ok['stage'], ok['outcome'], ok['model'], ok['pages']) == ("test_stage", "ok", "m", 2)
+    assert (failed['outcome'], failed['error_class']) == ("error", "503")
+    assert metrics.STAGE_ERRORS.value(stage="test_stage", error_class="503") >= 1
+    assert stage_summary()['test_stage']['count'] >= 2
+
+
+def test_handled_failure_is_recorded_without_raising(json_log):
+    with span("test_handled") as stage:
+        stage.fail("⚠️ Timed out while reading PDF.")
+
+    assert json_log()[0]['error_class'] == "timeout"
+
+
+def test_model_fallback_is_logged(json_log):
+    metrics.record_model_fallback("models/retired", "models/default")
+
+    record = json_log()[0]
+    assert (record['event'], record['model'], record['fallback']) == ("model_fallback", "models/retired", "models/default")
+
+
+def test_percentiles_use_nearest_rank(monkeypatch):
+    monkeypatch.setattr(metrics, "_recent", {})
+    for value in range(1, 101):
+        metrics.observe_stage("test_percentiles", value / 100)
+
+    summary = stage_summary()['test_percentiles']
+
+    assert (summary['p50'], summary['p95'], summary['p99']) == (0.5, 0.95, 0.99)
+
+
+def test_prometheus_exposition_lists_registered_metrics():
+    text = render_prometheus()
+
+    assert "# TYPE careerlens_stage_duration_seconds histogram" in text
+    assert "# TYPE careerlens_gemini_model_fallbacks_total counter" in text
+    assert text.endswith("\n")
@@ -0,0 +1,80 @@
+"""
+Tests for the bounded bcrypt hasher
+"""
+
+import re
+import threading
+import time
+
+import metrics
+import password_hasher
+from password_hasher import PasswordHasher, get_hash_rounds
+
+
+def wait_count() -> int:
+    match = re.search(r"^careerlens_bcrypt_wait_seconds_count (\d+)$", metrics.render_prometheus(), re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+
+def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    hashed = hasher.hash("correct-horse")
+
+    assert get_hash_rounds(hashed) == 4
+    assert hasher.verify("correct-horse", hashed)
+    assert not hasher.verify("wrong", hashed)
+
+
+def test_malformed_hash_does_not_verify():
+    hasher = PasswordHasher(rounds=4, max_workers=1)
+
+    assert not hasher.verify("anything", "")
+    assert not hasher.verify("anything", "not-a-hash")
+
+
+def test_hash_many_keeps_order():
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    passwords = ["first-pass", "second-pass", "third-pass"]
+
+    hashes = hasher.hash_many(passwords)
+
+    assert [hasher.verify(password, hashed) for password, hashed in zip(passwords, hashes)] == [True] * 3
+
+
+def test_needs_rehash_when_cost_differs():
+    assert PasswordHasher(rounds=5, max_workers=1).needs_rehash(PasswordHasher(rounds=4, max_workers=1).hash("pw"))
+    assert get_hash_rounds("$2b$12$abc") == 12
+    assert get_hash_rounds("plain") is None
+
+
+def test_queue_depth_and_wait_time_are_exported():
+    hasher = PasswordHasher(rounds=4, max_workers=1)
+    before = wait_count()
+
+    hasher.hash_many(["a", "b", "c"])
+
+    assert wait_count() == before + 3
+    assert metrics.BCRYPT_QUEUE_DEPTH.value() == 0
+    assert hasher.stats()['operations'] == 3
+    assert "careerlens_bcrypt_queue_depth 0" in metrics.render_prometheus()
+
+
+def test_queue_depth_gauge_reports_only_the_shared_hasher(monkeypatch):
+    release = threading.Event()
+    other = PasswordHasher(rounds=4, max_workers=1)
+    running = other._submit(release.wait, 5)
+    queued = other._submit(lambda: None)
+    shared = PasswordHasher(rounds=4, max_workers=1)
+    monkeypatch.setattr(password_hasher, "_hasher_instance", shared)
+
+    try:
+        while other.stats()['queue_depth'] != 1:  # The first task has reached the worker
+            time.sleep(0.01)
+        assert metrics.BCRYPT_QUEUE_DEPTH.value() == 0
+        monkeypatch.setattr(password_hasher, "_hasher_instance", other)
+        assert metrics.BCRYPT_QUEUE_DEPTH.value() == 1
+    finally:
+        release.set()
+        running.result(5)
+        queued.result(5)
+    assert metrics.BCRYPT_QUEUE_DEPTH.value() == 0
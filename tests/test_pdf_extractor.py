@@ -0,0 +1,131 @@
+"""
+Tests for the PDF extraction engine
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import pdf_extractor
+from pdf_extractor import TIER_FAST, TIMEOUT_ERROR, PdfExtractionEngine
+from synthetic_pdf import make_resume_pdf
+
+
+def _hang(pdf_bytes, start, end):
+    # Stands in for a parser stuck on a pathological document
+    time.sleep(60)
+
+
+def _hang_counting(pdf_bytes):
+    # A malformed file can stall the parser before any page is read
+    time.sleep(60)
+
+
+def _one_page(pdf_bytes):
+    return 1
+
+
+def _hang_or_wait_for_retry(pdf_bytes, start, end):
+    # b"hang" never finishes; any other document is a marker path that runs
+    # until its pool is torn down the first time and completes on the retry
+    if pdf_bytes == b"hang":
+        time.sleep(60)
+    marker = pdf_bytes.decode()
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        time.sleep(60)
+    return ["healthy resume"], {'tier': TIER_FAST, 'pages': 1, 'column_pages': 0}
+
+
+@pytest.fixture
+def engine():
+    engine = PdfExtractionEngine(max_workers=1, timeout_seconds=20)
+    yield engine
+    engine.shutdown()
+
+
+def test_short_document_is_extracted_on_the_pool(engine):
+    text, error = engine.extract_text(make_resume_pdf(1, seed=1))
+
+    assert error is None
+    assert "EXPERIENCE" in text
+    assert engine._pool is not None
+
+
+def test_hanging_short_document_times_out(engine, monkeypatch):
+    engine.extract_text(make_resume_pdf(1, seed=3))  # Start the worker outside the measured window
+    monkeypatch.setattr(pdf_extractor, "extract_page_range_tiered", _hang)
+    pdf_bytes = make_resume_pdf(1, seed=2)
+    engine.timeout_seconds = 1
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        engine.extract_pages(pdf_bytes)
+    assert time.monotonic() - started < 10
+    assert engine._pool is None
+
+    assert engine.extract_text(pdf_bytes) == (None, TIMEOUT_ERROR)
+
+
+def test_hanging_page_count_times_out(engine, monkeypatch):
+    engine.extract_text(make_resume_pdf(1, seed=5))  # Start the worker outside the measured window
+    monkeypatch.setattr(pdf_extractor, "count_pdf_pages", _hang_counting)
+    engine.timeout_seconds = 1
+
+    started = time.monotonic()
+    result = engine.extract_text(make_resume_pdf(1, seed=6))
+
+    assert result == (None, TIMEOUT_ERROR)
+    assert time.monotonic() - started < 10
+
+
+def test_pool_recovers_after_timeout(engine, monkeypatch):
+    pdf_bytes = make_resume_pdf(1, seed=4)
+    with monkeypatch.context() as patch:
+        patch.setattr(pdf_extractor, "extract_page_range_tiered", _hang)
+        engine.timeout_seconds = 1
+        with pytest.raises(TimeoutError):
+            engine.extract_pages(pdf_bytes)
+
+    engine.timeout_seconds = 20
+    text, error = engine.extract_text(pdf_bytes)
+    assert error is None and text
+
+
+def test_timeout_of_one_document_does_not_fail_another(monkeypatch, tmp_path):
+    engine = PdfExtractionEngine(max_workers=2, timeout_seconds=5)
+    monkeypatch.setattr(pdf_extractor, "count_pdf_pages", _one_page)
+    monkeypatch.setattr(pdf_extractor, "extract_page_range_tiered", _hang_or_wait_for_retry)
+    marker = str(tmp_path / "first-attempt")
+    outcomes = {}
+
+    def run(name, pdf_bytes):
+        try:
+            outcomes[name] = engine.extract_pages(pdf_bytes)
+        except Exception as e:
+            outcomes[name] = e
+
+    try:
+        hanging = threading.Thread(target=run, args=("hang", b"hang"))
+        hanging.start()
+        time.sleep(1)  # The healthy document's own deadline falls after the hanging one's
+        healthy = threading.Thread(target=run, args=("healthy", marker.encode()))
+        healthy.start()
+        hanging.join(30)
+        healthy.join(30)
+    finally:
+        engine.shutdown()
+
+    assert isinstance(outcomes["hang"], TimeoutError)
+    assert os.path.exists(marker)
+    assert outcomes["healthy"] == (["healthy resume"], {'tier': TIER_FAST, 'pages': 1, 'column_pages': 0})
+
+
+def test_long_text_is_left_for_the_compactor():
+    # Compaction (RESUME_TOKEN_BUDGET) decides what is sent, so extraction keeps more than 30k characters
+    text, error = pdf_extractor.clean_extracted_text(["Built Django services. " * 2000])
+
+    assert error is None
+    assert len(text) > 30000 and "truncated" not in text
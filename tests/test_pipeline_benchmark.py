@@ -0,0 +1,55 @@
+"""
+Smoke test for the pipeline benchmark entry point and its regression report
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Run as a script only: importing it would rewrite os.environ for the rest of the test session
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "pipeline_benchmark.py")
+
+
+def run_benchmark(*args: str) -> subprocess.CompletedProcess:
+    # The script isolates its caches and selects the local backend itself
+    return subprocess.run(
+        [sys.executable, SCRIPT, "--quick", "--requests", "2", "--concurrency", "2",
+         "--latency", "0", "--jitter", "0", "--users", "10", *args],
+        capture_output=True, text=True, timeout=300,
+    )
+
+
+def test_quick_run_writes_a_complete_report(tmp_path):
+    output = tmp_path / "run.json"
+
+    result = run_benchmark("--output", str(output))
+
+    assert result.returncode == 0, result.stderr
+    report = json.loads(output.read_text())
+    assert {'meta', 'extraction', 'analysis', 'auth', 'stages', 'memory'} <= set(report)
+    assert report['extraction']['failures'] == 0
+    assert report['analysis']['errors'] == 0 and report['analysis']['model_calls'] == 2
+    assert report['auth']['users']['10']['sign_up']['count'] >= 1
+
+    compared = run_benchmark("--phases", "analysis", "--output", str(tmp_path / "again.json"),
+                             "--compare", str(output), "--tolerance", "1000")
+    assert compared.returncode == 0, compared.stderr
+    assert "No regressions" in compared.stderr
+
+
+def test_compare_exits_non_zero_on_a_regression(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    # An impossibly fast baseline: every timing of the new run is a regression
+    baseline.write_text(json.dumps({'analysis': {'end_to_end': {'p95_seconds': 1e-9},
+                                                 'throughput_per_second': 1e9,
+                                                 'simulated_latency_seconds': 1e-9}}))
+
+    result = run_benchmark("--phases", "analysis", "--output", str(tmp_path / "run.json"),
+                           "--compare", str(baseline))
+
+    assert result.returncode == 1
+    regressions = [line for line in result.stderr.splitlines() if line.startswith("❌ Regression")]
+    assert [line.split(":")[1].strip() for line in regressions] == [
+        "analysis.end_to_end.p95_seconds", "analysis.throughput_per_second",
+    ]
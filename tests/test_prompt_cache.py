@@ -0,0 +1,107 @@
+"""
+Tests for the prompt prefix cache lifecycle
+"""
+
+import threading
+import time
+
+import prompt_cache
+from prompt_cache import LocalPrefixCache, make_prefix_key
+from prompts import build_full_prompt, build_resume_part
+
+
+class EchoModel:
+    def generate_content(self, contents, **kwargs):
+        return contents
+
+
+class FailingCache(LocalPrefixCache):
+    def _create(self, model_name, base_model, prefix):
+        raise RuntimeError("cached content is not supported")
+
+
+def test_prefix_key_separates_parts():
+    assert make_prefix_key("m", "ab", "c") != make_prefix_key("m", "a", "bc")
+    assert make_prefix_key("m", "p", "j") == make_prefix_key("m", "p", "j")
+
+
+def test_one_off_prefix_is_not_cached():
+    cache = LocalPrefixCache()
+
+    assert cache.get_model("model", EchoModel(), "prompt", "job") is None
+    assert cache.stats()['created'] == 0
+    assert cache.stats()['deferred'] == 1
+
+
+def test_repeated_prefix_is_created_once_and_reused():
+    cache = LocalPrefixCache()
+    base_model = EchoModel()
+
+    assert cache.get_model("model", base_model, "prompt", "job") is None
+    model = cache.get_model("model", base_model, "prompt", "job")
+    assert cache.get_model("model", base_model, "prompt", "job") is model
+
+    # The prefixed model sends the same text as an uncached request
+    assert model.generate_content(build_resume_part("resume")) == build_full_prompt("prompt", "job", "resume")
+    stats = cache.stats()
+    assert (stats['created'], stats['hits'], stats['entries']) == (1, 1, 1)
+
+
+def test_short_prefix_is_skipped():
+    cache = LocalPrefixCache(min_tokens=10_000, min_uses=1)
+
+    assert cache.get_model("model", EchoModel(), "prompt", "job") is None
+    assert cache.stats()['skipped'] == 1
+
+
+def test_failed_create_backs_off():
+    cache = FailingCache(min_uses=1)
+
+    assert cache.get_model("model", EchoModel(), "prompt", "job") is None
+    assert cache.get_model("model", EchoModel(), "prompt", "job") is None
+    assert cache.stats()['failures'] == 1
+
+
+def test_concurrent_requests_share_one_create():
+    cache = LocalPrefixCache(min_uses=1)
+    base_model = EchoModel()
+    models = []
+
+    threads = [
+        threading.Thread(target=lambda: models.append(cache.get_model("model", base_model, "prompt", "job")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(model) for model in models}) == 1
+    assert cache.stats()['created'] == 1
+    assert cache._key_locks == {}
+
+
+def test_expired_entries_and_bookkeeping_are_swept(monkeypatch):
+    cache = LocalPrefixCache(ttl_seconds=120, min_uses=1)
+    cache.get_model("model", EchoModel(), "prompt", "old job")
+    cache._failures["failed"] = time.time() + 10
+    cache._sightings["seen once"] = (1, time.time() + 10)
+
+    later = time.time() + prompt_cache.SWEEP_INTERVAL_SECONDS + 300
+    monkeypatch.setattr(prompt_cache.time, "time", lambda: later)
+    cache.get_model("model", EchoModel(), "prompt", "new job")
+
+    assert set(cache._entries) == {make_prefix_key("model", "prompt", "new job")}
+    assert cache._failures == {}
+    assert cache._sightings == {}
+    assert cache._key_locks == {}
+
+
+def test_invalidate_forgets_prefix():
+    cache = LocalPrefixCache(min_uses=1)
+    first = cache.get_model("model", EchoModel(), "prompt", "job")
+
+    cache.invalidate("model", "prompt", "job")
+
+    assert cache.get_model("model", EchoModel(), "prompt", "job") is not first
+    assert cache.stats()['created'] == 2
@@ -0,0 +1,128 @@
+"""
+Tests for the adaptive rate limiter and retry scheduler
+"""
+
+import threading
+import time
+
+import pytest
+
+import metrics
+from rate_limiter import AdaptiveRateLimiter, call_with_retry, get_retry_after, get_status_code
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class Interrupted(BaseException):
+    """Stands in for Streamlit's StopException raised into a waiting script thread."""
+
+
+def test_status_code_from_attribute_or_message():
+    assert get_status_code(ApiError("boom", code=503)) == 503
+    assert get_status_code(ApiError("429 Resource has been exhausted")) == 429
+    assert get_status_code(ApiError("invalid argument")) is None
+
+
+def test_retry_after_from_message():
+    assert get_retry_after(ApiError("429 quota exceeded. Please retry in 12.5s.")) == 12.5
+    assert get_retry_after(ApiError("retry_delay { seconds: 7 }")) == 7
+    assert get_retry_after(ApiError("no hint")) is None
+
+
+def test_burst_is_served_without_waiting():
+    limiter = AdaptiveRateLimiter(requests_per_minute=60, burst=3)
+
+    waits = [limiter.acquire() for _ in range(3)]
+
+    assert max(waits) < 0.05
+    assert limiter.stats()['acquired'] == 3
+
+
+def test_waiters_are_served_in_arrival_order():
+    limiter = AdaptiveRateLimiter(requests_per_minute=1200, burst=1)
+    limiter.acquire()
+    order = []
+
+    def worker(index):
+        limiter.acquire()
+        order.append(index)
+
+    threads = []
+    for index in range(5):
+        thread = threading.Thread(target=worker, args=(index,))
+        thread.start()
+        threads.append(thread)
+        # Let each thread enqueue before the next one arrives
+        while limiter.stats()['queue_depth'] < index + 1 and thread.is_alive():
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_interrupted_waiter_leaves_the_queue():
+    limiter = AdaptiveRateLimiter(requests_per_minute=6000, burst=1)
+    limiter.acquire()
+    original_wait = limiter._condition.wait
+
+    def interrupted_wait(timeout=None):
+        raise Interrupted()
+
+    limiter._condition.wait = interrupted_wait
+    with pytest.raises(Interrupted):
+        limiter.acquire()
+    limiter._condition.wait = original_wait
+
+    assert limiter.stats()['queue_depth'] == 0
+    done = threading.Event()
+    threading.Thread(target=lambda: (limiter.acquire(), done.set()), daemon=True).start()
+    assert done.wait(timeout=5), "a later caller deadlocked behind the interrupted ticket"
+
+
+def test_throttle_halves_rate_and_success_recovers_it():
+    limiter = AdaptiveRateLimiter(requests_per_minute=60)
+
+    limiter.record_throttle()
+    assert limiter.stats()['requests_per_minute'] == pytest.approx(30)
+
+    limiter.record_success()
+    assert limiter.stats()['requests_per_minute'] == pytest.approx(33)
+    assert limiter.stats()['throttled'] == 1
+
+
+def test_call_with_retry_retries_retryable_errors():
+    limiter = AdaptiveRateLimiter(requests_per_minute=6000, burst=5)
+    attempts = []
+    retried = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ApiError("503 unavailable")
+        return "ok"
+
+    assert call_with_retry(flaky, limiter, base_delay=0, on_retry=retried.append) == "ok"
+    assert len(attempts) == 3
+    assert retried == [503, 503]
+
+
+def test_call_with_retry_raises_client_errors_immediately():
+    limiter = AdaptiveRateLimiter(requests_per_minute=6000)
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise ApiError("400 invalid argument", code=400)
+
+    with pytest.raises(ApiError):
+        call_with_retry(bad_request, limiter, base_delay=0)
+    assert len(attempts) == 1
+
+
+def test_queue_depth_is_exported_as_gauge():
+    assert "careerlens_gemini_queue_depth 0" in metrics.render_prometheus()
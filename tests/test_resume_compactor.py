@@ -0,0 +1,111 @@
+"""
+Tests for token-budgeted resume compaction
+"""
+
+from resume_compactor import (
+    TRIMMED_NOTE, CompactionStats, compact_resume, estimate_tokens, match_section_heading, normalize_whitespace,
+    split_sections, strip_page_furniture,
+)
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 0100
+
+SUMMARY
+Backend engineer focused on Python services.
+
+WORK EXPERIENCE
+Senior Engineer, Initech (2019 - 2023)
+- Built Django APIs on PostgreSQL
+- Ran Docker and Kubernetes deployments
+
+Skills:
+Python, Django, PostgreSQL, Docker, Kubernetes
+
+Hobbies & Interests
+Chess, hiking
+
+References
+Available on request
+"""
+
+
+def test_whitespace_is_normalized():
+    assert normalize_whitespace("  a\xa0\t b  \r\n\r\n\r\n\nc ") == "a b\n\nc"
+
+
+def test_headings_are_recognized():
+    assert match_section_heading("WORK EXPERIENCE") == "experience"
+    assert match_section_heading("Skills:") == "skills"
+    assert match_section_heading("Hobbies & Interests") == "interests"
+    assert match_section_heading("Built Django APIs") is None
+
+
+def test_sections_split_at_headings():
+    sections = split_sections(normalize_whitespace(RESUME))
+
+    assert [section['name'] for section in sections] == [
+        'header', 'summary', 'experience', 'skills', 'interests', 'references',
+    ]
+    assert sections[0]['text'].startswith("Jane Doe")
+
+
+def test_repeated_headers_and_page_numbers_are_stripped():
+    bodies = [["Python", "Django", "Docker"], ["Kubernetes", "Terraform", "AWS"], ["SQL", "Spark", "Kafka"]]
+    pages = ["Jane Doe - Resume\n" + "\n".join(body) + f"\nPage {i} of 3" for i, body in enumerate(bodies, 1)]
+
+    cleaned = strip_page_furniture(pages)
+
+    assert cleaned == ["\n".join(body) for body in bodies]
+
+
+def test_single_page_keeps_its_header():
+    assert strip_page_furniture(["Jane Doe\ncontent\n2"]) == ["Jane Doe\ncontent"]
+
+
+def test_unlimited_budget_drops_only_references():
+    result = compact_resume(RESUME, token_budget=0)
+
+    assert result['dropped_sections'] == ['references']
+    assert "Available on request" not in result['text']
+    assert "Chess" in result['text']
+
+
+def test_tight_budget_keeps_relevant_sections_in_order():
+    result = compact_resume(RESUME, "Python Django PostgreSQL engineer", token_budget=60)
+
+    assert result['tokens'] <= 60
+    assert 'interests' in result['dropped_sections']
+    assert result['sections'] == sorted(result['sections'], key=['header', 'summary', 'experience', 'skills'].index)
+    assert 'experience' in result['sections'] and 'skills' in result['sections']
+    assert result['tokens_saved'] == result['original_tokens'] - result['tokens']
+
+
+def test_oversized_section_is_trimmed_at_a_line_boundary():
+    resume = "WORK EXPERIENCE\n" + "\n".join(f"- Delivered project {i} on time and under budget" for i in range(100))
+
+    result = compact_resume(resume, token_budget=200)
+
+    assert result['trimmed_sections'] == ['experience']
+    assert result['text'].endswith(TRIMMED_NOTE)
+    assert estimate_tokens(result['text']) <= 200
+
+
+def test_stats_accumulate():
+    stats = CompactionStats()
+    stats.record({'original_tokens': 100, 'tokens': 60})
+    stats.record({'original_tokens': 100, 'tokens': 100})
+
+    assert stats.stats() == {'requests': 2, 'original_tokens': 200, 'sent_tokens': 160,
+                             'tokens_saved': 40, 'saved_ratio': 0.2}
+
+
+def test_oversized_first_line_is_cut_instead_of_dropped():
+    # One long paragraph with no line breaks, as some PDFs extract
+    resume = " ".join(f"Delivered Django project {i} on time." for i in range(200))
+
+    result = compact_resume(resume, "Django developer", token_budget=200)
+
+    assert result['trimmed_sections'] == ['header']
+    assert result['text'].startswith("Delivered Django project 0 on time.")
+    assert result['text'].endswith(TRIMMED_NOTE)
+    assert estimate_tokens(result['text']) <= 200
@@ -0,0 +1,74 @@
+"""
+Tests for vectorized BM25 / TF-IDF resume ranking
+"""
+
+import math
+
+import pytest
+
+from ats_scorer import extract_terms
+from resume_ranker import BM25_B, BM25_K1, bm25_scores, build_term_matrix, rank_resumes
+
+JOB_DESC = "Python developer with Django, PostgreSQL and Docker"
+RESUMES = [
+    "Accountant with payroll and audit background",
+    "Python developer building Django services on PostgreSQL, deployed with Docker",
+    "Java engineer with Spring and Oracle",
+    "Python scripting for data analysis",
+]
+
+
+def _reference_bm25(job_desc, texts):
+    # Straightforward per-document loop to check the sparse implementation against
+    docs = [extract_terms(text)[0] for text in texts]
+    query = extract_terms(job_desc)[0]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(lengths)
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term, query_count in query.items():
+            df = sum(1 for other in docs if term in other)
+            if not df:
+                continue
+            idf = math.log((len(docs) - df + 0.5) / (df + 0.5) + 1.0)
+            tf = doc.get(term, 0)
+            score += query_count * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+        scores.append(score)
+    return scores
+
+
+def test_bm25_matches_reference():
+    matrix, vocabulary = build_term_matrix(RESUMES)
+
+    assert bm25_scores(JOB_DESC, matrix, vocabulary).tolist() == pytest.approx(_reference_bm25(JOB_DESC, RESUMES))
+
+
+@pytest.mark.parametrize("method", ["bm25", "tfidf"])
+def test_most_relevant_resume_ranks_first(method):
+    ranking = rank_resumes(JOB_DESC, RESUMES, method=method)
+
+    assert [index for index, _ in ranking][:2] == [1, 3]
+    assert ranking[-1][1] == 0.0
+    assert sorted(index for index, _ in ranking) == [0, 1, 2, 3]
+
+
+def test_tfidf_scores_are_cosines():
+    scores = [score for _, score in rank_resumes(JOB_DESC, RESUMES + [JOB_DESC], method="tfidf")]
+
+    assert scores[0] == pytest.approx(1.0)
+    assert all(0.0 <= score <= 1.0 + 1e-9 for score in scores)
+
+
+def test_top_k_and_ties_keep_index_order():
+    ranking = rank_resumes("python", ["python", "java", "python", "python"], top_k=2)
+
+    assert [index for index, _ in ranking] == [0, 2]
+
+
+def test_edge_cases():
+    assert rank_resumes(JOB_DESC, []) == []
+    assert rank_resumes(JOB_DESC, RESUMES, top_k=0) == []
+    assert all(score == 0.0 for _, score in rank_resumes("", RESUMES))
+    with pytest.raises(ValueError):
+        rank_resumes(JOB_DESC, RESUMES, method="cosine")
@@ -0,0 +1,79 @@
+"""
+Tests for the shared session payload store
+"""
+
+import sys
+
+from session_store import SessionStore, hash_payload
+
+
+def test_identical_payloads_are_stored_once():
+    store = SessionStore()
+
+    first = store.put("s1", "resume", "same resume")
+    second = store.put("s2", "resume", "same resume")
+
+    assert first == second == hash_payload("same resume")
+    assert store.get(first) == "same resume"
+    stats = store.stats()
+    assert (stats['payloads'], stats['deduplicated'], stats['sessions']) == (1, 1, 2)
+
+
+def test_payload_is_freed_with_its_last_reference():
+    store = SessionStore()
+    digest = store.put("s1", "resume", "resume text")
+    store.put("s2", "resume", "resume text")
+
+    store.release("s1")
+    assert store.get(digest) == "resume text"
+    store.release("s2", "resume")
+
+    assert store.get(digest) is None
+    assert store.stats()['bytes'] == 0
+
+
+def test_replacing_a_slot_drops_the_old_payload():
+    store = SessionStore()
+    old = store.put("s1", "report", "old report")
+
+    store.put("s1", "report", "new report")
+
+    assert store.get(old) is None
+    assert store.stats()['payloads'] == 1
+
+
+def test_budget_evicts_least_recently_used():
+    text = "x" * 10_000
+    store = SessionStore(max_bytes=2 * sys.getsizeof(text) + 100)
+    a = store.put("s1", "resume", text + "a")
+    b = store.put("s2", "resume", text + "b")
+    store.get(a)
+    c = store.put("s3", "resume", text + "c")
+
+    assert store.get(b) is None
+    assert store.get(a) is not None and store.get(c) is not None
+    assert store.stats()['evicted_budget'] == 1
+    assert store.session_stats("s2")['slots'] == 0
+
+
+def test_idle_sessions_are_evicted():
+    store = SessionStore(idle_ttl_seconds=60)
+    digest = store.put("s1", "resume", "resume text")
+    store.put("s2", "resume", "other resume")
+    last_seen = store._sessions["s1"]['last_seen']
+
+    assert store.evict_idle(now=last_seen + 30) == 0
+    assert store.evict_idle(now=last_seen + 61) == 2
+    assert store.get(digest) is None
+    assert store.stats()['sessions'] == 0
+
+
+def test_session_stats_split_shared_payloads():
+    store = SessionStore()
+    digest = store.put("s1", "resume", "shared resume")
+    store.put("s2", "resume", "shared resume")
+    size = store._payloads[digest][1]
+
+    stats = store.session_stats("s1")
+
+    assert stats == {'slots': 1, 'referenced_bytes': size, 'owned_bytes': round(size / 2)}
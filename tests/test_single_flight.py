@@ -0,0 +1,92 @@
+"""
+Tests for coalescing concurrent identical requests
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import FlightAbandoned, SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [executor.submit(flight.do, "key", slow_call) for _ in range(6)]
+        while flight.stats()['coalesced'] < 5:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert results == ["result"] * 6
+    assert len(calls) == 1
+    assert flight.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 5}
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight("test")
+
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()['leaders'] == 2
+
+
+def test_finished_call_is_not_kept():
+    flight = SingleFlight("test")
+    calls = []
+
+    flight.do("key", lambda: calls.append(1))
+    flight.do("key", lambda: calls.append(1))
+
+    assert len(calls) == 2
+
+
+def test_leader_exception_reaches_waiters():
+    flight = SingleFlight("test")
+    future, leader = flight.begin("key")
+    waiter, waiter_leads = flight.begin("key")
+
+    flight.fail("key", future, RuntimeError("quota exceeded"))
+
+    assert leader and not waiter_leads
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        waiter.result(timeout=1)
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_exception_in_do_is_raised_and_cleared():
+    flight = SingleFlight("test")
+
+    def failing_call():
+        raise ValueError("bad response")
+
+    with pytest.raises(ValueError):
+        flight.do("key", failing_call)
+    assert flight.do("key", lambda: "retried") == "retried"
+
+
+def test_abandoned_flight_makes_a_waiter_the_new_leader():
+    flight = SingleFlight("test")
+    future, _ = flight.begin("key")
+    result = []
+
+    waiter = threading.Thread(target=lambda: result.append(flight.do("key", lambda: "from waiter")))
+    waiter.start()
+    while flight.stats()['coalesced'] < 1:
+        time.sleep(0.01)
+    flight.abandon("key", future)
+    waiter.join(5)
+
+    assert result == ["from waiter"]
+    assert isinstance(future.exception(), FlightAbandoned)
+    assert flight.stats() == {'in_flight': 0, 'leaders': 2, 'coalesced': 1}